@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Storage Conversion Script for Market Data Pipeline
+
+Converts existing data files between CSV and Parquet storage, e.g. after
+changing storage_format in config.yaml.
+"""
+
+import sys
+import os
+import argparse
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from data_merger import DataMerger, MergeError, STORAGE_EXTENSIONS
+
+try:
+    from tqdm import tqdm
+    HAS_TQDM = True
+except ImportError:
+    HAS_TQDM = False
+
+
+# Category directories holding one directory per symbol
+CATEGORIES = ('stocks', 'indices')
+
+
+def find_data_files(data_dir: str, extension: str) -> List[str]:
+    """
+    List the data files with the given extension in every symbol directory.
+    
+    Hidden files (such as the Parquet sidecars of load_cached) are skipped.
+    
+    Args:
+        data_dir: Data directory
+        extension: File extension to look for, e.g. '.csv'
+    
+    Returns:
+        Sorted list of file paths
+    """
+    paths = []
+    for category in CATEGORIES:
+        category_dir = os.path.join(data_dir, category)
+        if not os.path.isdir(category_dir):
+            continue
+        with os.scandir(category_dir) as symbol_dirs:
+            for symbol_dir in symbol_dirs:
+                if not symbol_dir.is_dir():
+                    continue
+                with os.scandir(symbol_dir.path) as entries:
+                    paths.extend(
+                        entry.path for entry in entries
+                        if entry.is_file() and entry.name.endswith(extension)
+                        and not entry.name.startswith('.')
+                    )
+    return sorted(paths)
+
+
+def convert_file(
+    source: DataMerger,
+    target: DataMerger,
+    filepath: str,
+    keep_source: bool = True
+) -> Tuple[str, int]:
+    """
+    Convert one data file to the target merger's storage format.
+    
+    The row count of the written file is checked against the source
+    before the source is removed.
+    
+    Args:
+        source: DataMerger for the current format
+        target: DataMerger for the new format
+        filepath: Path to the file to convert
+        keep_source: Keep the original file next to the converted one
+    
+    Returns:
+        Tuple of (converted file path, rows written)
+    
+    Raises:
+        MergeError: If the file cannot be loaded or the row counts differ
+    """
+    df = source.load_existing_data(filepath, fast=True)
+    if df is None or df.empty:
+        raise MergeError(f"No data to convert in {filepath}")
+    
+    target_path = str(Path(filepath).with_suffix(target.file_extension))
+    target.save_data(df, target_path)
+    
+    rows = target.count_rows(target_path)
+    if rows != len(df):
+        raise MergeError(f"Row count mismatch after converting {filepath}: {rows} != {len(df)}")
+    
+    if not keep_source:
+        os.remove(filepath)
+    # The pyarrow read cache of the CSV is not needed any more
+    sidecar = DataMerger.cache_path(filepath)
+    if sidecar.exists():
+        sidecar.unlink()
+    
+    return target_path, rows
+
+
+def convert_storage(
+    data_dir: str,
+    to_format: str,
+    keep_source: bool = True
+) -> Tuple[int, int]:
+    """
+    Convert every data file in the data directory to the given format.
+    
+    Args:
+        data_dir: Data directory
+        to_format: Target storage format, 'csv' or 'parquet'
+        keep_source: Keep the original files
+    
+    Returns:
+        Tuple of (files converted, files failed)
+    """
+    logger = logging.getLogger(__name__)
+    from_format = 'csv' if to_format == 'parquet' else 'parquet'
+    
+    # Backups are pointless here: the source file is only removed once the
+    # converted file has been verified
+    target = DataMerger(backup_enabled=False, storage_format=to_format)
+    source = DataMerger(backup_enabled=False, storage_format=from_format)
+    
+    files = find_data_files(data_dir, STORAGE_EXTENSIONS[from_format])
+    logger.info(f"Converting {len(files)} {from_format} files to {to_format}")
+    
+    iterator = tqdm(files, desc="Converting", unit="file") if HAS_TQDM else files
+    converted = failed = 0
+    for filepath in iterator:
+        try:
+            convert_file(source, target, filepath, keep_source)
+            converted += 1
+        except Exception as e:
+            failed += 1
+            logger.error(f"Failed to convert {filepath}: {str(e)}")
+    
+    logger.info(f"Converted {converted} files ({failed} failed)")
+    return converted, failed
+
+
+def main(argv: Optional[List[str]] = None):
+    """Main entry point."""
+    parser = argparse.ArgumentParser(
+        description="Convert market data files between CSV and Parquet storage"
+    )
+    
+    parser.add_argument(
+        '--to',
+        choices=sorted(STORAGE_EXTENSIONS),
+        default='parquet',
+        help='Storage format to convert to (default: parquet)'
+    )
+    
+    parser.add_argument(
+        '--delete-source',
+        action='store_true',
+        help='Remove each original file once its conversion is verified'
+    )
+    
+    parser.add_argument(
+        '--data-dir',
+        default='./data',
+        help='Data directory (default: ./data)'
+    )
+    
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    
+    try:
+        _, failed = convert_storage(args.data_dir, args.to, keep_source=not args.delete_source)
+    except MergeError as e:
+        print(f"\n\nFatal error: {str(e)}")
+        sys.exit(1)
+    
+    print(f"\nSet 'storage_format: {args.to}' in config/config.yaml to use the converted files.")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
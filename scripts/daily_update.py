@@ -8,11 +8,17 @@ Incrementally updates market data since last download.
 import sys
 import os
 import argparse
+import atexit
 import logging
+import multiprocessing
 import time
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+import pandas as pd
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
@@ -20,7 +26,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 from config_manager import ConfigManager
 from data_fetcher import DataFetcher
 from data_validator import DataValidator
-from data_merger import DataMerger
+from data_merger import DataMerger, PRICE_DTYPES
 from metadata_manager import MetadataManager
 from retry_manager import RetryManager
 
@@ -31,16 +37,191 @@ except ImportError:
     HAS_TQDM = False
 
 
+def merge_validate_save(
+    merger: DataMerger,
+    validator: DataValidator,
+    symbol: str,
+    interval: str,
+    new_df: pd.DataFrame,
+    csv_path: str,
+    existing_rows: Optional[int] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """
+    Merge freshly fetched rows into a data file, validate and save it.
+    
+    Kept free of DailyUpdater state so it can run in a worker process.
+    When the row count of the existing file is known (from metadata) and
+    the new rows all follow its last row, they are appended after reading
+    only the file's first and last rows instead of the whole history.
+    
+    Args:
+        merger: DataMerger used to load/merge/save
+        validator: DataValidator used to validate the merged data
+        symbol: Stock/Index symbol (for logging)
+        interval: Time interval
+        new_df: Newly fetched data
+        csv_path: Path of the data file to update
+        existing_rows: Number of rows already in the file, if known
+        
+    Returns:
+        Tuple of (stats, validation_report) ready for MetadataManager.update_metadata
+    """
+    logger = logging.getLogger(__name__)
+    
+    # Narrow prices as initial_download does, so appended rows are written
+    # without float64 noise
+    new_df = new_df.astype(
+        {col: dtype for col, dtype in PRICE_DTYPES.items() if col in new_df.columns}
+    )
+    
+    # Peek at the file edges when appending is possible, else load it all
+    # (at the same precision, so merging keeps the new rows float32)
+    edges_df = None
+    existing_df = None
+    if merger.supports_append and existing_rows:
+        edges_df = merger.load_edges(csv_path)
+    if edges_df is None:
+        existing_df = merger.load_existing_data(csv_path, dtype=PRICE_DTYPES)
+    
+    known_df = edges_df if edges_df is not None else existing_df
+    has_existing = known_df is not None and not known_df.empty
+    
+    # Validate only the new rows; the history was validated when it was
+    # written. The boundary gap to the last existing row is still checked.
+    new_df, report = validator.validate_dataframe(
+        new_df, interval, auto_fix=True,
+        last_known_timestamp=known_df.index[-1] if has_existing else None
+    )
+    
+    if not report.is_valid:
+        logger.warning(
+            f"Validation issues for {symbol} ({interval}): "
+            f"{len(report.issues)} issues"
+        )
+    
+    if edges_df is not None:
+        # Deduplicate and sort the new rows on their own
+        new_df = merger.merge_data(None, new_df)
+        
+        if merger.can_append(edges_df, new_df):
+            merger.append_data(new_df, csv_path)
+            
+            stats = {
+                'total_rows': existing_rows + len(new_df),
+                'rows_added': len(new_df),
+                'date_range': {
+                    'start': str(edges_df.index[0]),
+                    'end': str(new_df.index[-1])
+                }
+            }
+            return stats, _validation_summary(report)
+        
+        # New rows overlap the history: fall back to a full merge
+        existing_df = merger.load_existing_data(csv_path, dtype=PRICE_DTYPES)
+    
+    # Merge new data with existing (all intervals)
+    validated_df, rows_added = merger.merge_data(existing_df, new_df, return_added=True)
+    
+    # Append just the new tail when nothing earlier changed,
+    # otherwise rewrite the whole file
+    appendable = (
+        merger.supports_append
+        and merger.can_append(existing_df, new_df)
+        and len(validated_df) == len(existing_df) + len(new_df)
+    )
+    if appendable:
+        merger.append_data(validated_df.iloc[len(existing_df):], csv_path)
+    else:
+        merger.save_data(validated_df, csv_path)
+    
+    # merge_data sorts, so the extremes are the first and last rows
+    stats = {
+        'total_rows': len(validated_df),
+        'rows_added': rows_added,
+        'date_range': {
+            'start': str(validated_df.index[0]),
+            'end': str(validated_df.index[-1])
+        }
+    }
+    
+    return stats, _validation_summary(report)
+
+
+def _validation_summary(report) -> Dict[str, Any]:
+    """Condense a ValidationReport into the metadata validation record."""
+    return {
+        'status': 'passed' if report.is_valid else 'issues',
+        'issues_count': len(report.issues)
+    }
+
+
+# Per-process merger/validator for the --processes stage, built once per worker
+_worker_merger: Optional[DataMerger] = None
+_worker_validator: Optional[DataValidator] = None
+
+
+def _init_process_worker(
+    timezone: str,
+    storage_format: str,
+    log_queue: Optional[multiprocessing.Queue] = None
+):
+    """Create the merger and validator used by this worker process."""
+    global _worker_merger, _worker_validator
+    if log_queue is not None:
+        # Hand every record to the parent's listener instead of writing the
+        # log file from each process
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        root = logging.getLogger()
+        root.handlers[:] = [queue_handler]
+        root.setLevel(logging.INFO)
+    _worker_merger = DataMerger(backup_enabled=True, storage_format=storage_format)
+    _worker_validator = DataValidator(timezone=timezone)
+
+
+def _process_stage(
+    symbol: str,
+    interval: str,
+    new_df: pd.DataFrame,
+    csv_path: str,
+    existing_rows: Optional[int] = None
+) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Run merge_validate_save with this worker process's components."""
+    return merge_validate_save(
+        _worker_merger, _worker_validator, symbol, interval, new_df, csv_path,
+        existing_rows
+    )
+
+
 class DailyUpdater:
     """Handles incremental updates of market data."""
     
+    # Characters in symbols that are not safe in directory names
+    _SYM_TRANS = str.maketrans({'^': '_', '/': '_'})
+    
     def __init__(
         self,
         config_dir: str = "./config",
         data_dir: str = "./data",
-        log_dir: str = "./logs"
+        log_dir: str = "./logs",
+        max_workers: Optional[int] = None,
+        processes: Optional[int] = None,
+        use_chart_api: bool = False
     ):
-        """Initialize the DailyUpdater."""
+        """
+        Initialize the DailyUpdater.
+        
+        Args:
+            config_dir: Configuration directory
+            data_dir: Data directory
+            log_dir: Log directory
+            max_workers: Number of concurrent update workers
+                         (default: chunk_size from config.yaml)
+            processes: Number of worker processes for the merge/validate/save
+                       stage (default: None, run it in the update threads)
+            use_chart_api: Fetch from Yahoo's chart API directly instead of
+                           yfinance's Ticker.history
+        """
         # Setup logging
         self._setup_logging(log_dir)
         self.logger = logging.getLogger(__name__)
@@ -53,22 +234,38 @@ class DailyUpdater:
         self.config_manager = ConfigManager(config_dir)
         self.config_manager.load_config()
         
+        # Retries are handled by retry_manager (with jittered backoff) in
+        # update_symbol; a second retry loop inside the fetcher would
+        # multiply attempts and keep a worker asleep on fixed delays
         self.data_fetcher = DataFetcher(
             rate_limit_delay=0.5,
-            max_retries=self.config_manager.get_max_retries(),
-            retry_delay=self.config_manager.get_retry_delay()
+            max_retries=1,
+            retry_delay=self.config_manager.get_retry_delay(),
+            use_chart_api=use_chart_api
         )
         
         self.validator = DataValidator(
             timezone=self.config_manager.get_timezone()
         )
         
-        self.merger = DataMerger(backup_enabled=True)
+        self.merger = DataMerger(
+            backup_enabled=True,
+            storage_format=self.config_manager.get_storage_format()
+        )
         self.metadata_manager = MetadataManager(metadata_dir=f"{data_dir}/metadata")
         self.retry_manager = RetryManager(log_dir=log_dir)
         
         self.data_dir = Path(data_dir)
-        self.start_time = time.time()
+        self.max_workers = max_workers or self.config_manager.get_chunk_size()
+        self.processes = processes
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._set_run_dates()
+        # Plain-string category roots keep Path objects out of the per-update loop
+        self._cat_root = {
+            category: str(self.data_dir / category) for category in ('stocks', 'indices')
+        }
+        self._dir_cache: Dict[Tuple[str, str], str] = {}
+        self.start_time = time.monotonic()
         
         # Statistics
         self.stats = {
@@ -81,20 +278,79 @@ class DailyUpdater:
         }
     
     def _setup_logging(self, log_dir: str):
-        """Setup logging configuration."""
+        """
+        Setup logging configuration.
+        
+        Workers only enqueue records; a background QueueListener does the
+        file and console writes, so update threads never block on log I/O.
+        The queue is a multiprocessing queue so --processes pool workers
+        can log through the same listener.
+        """
         log_path = Path(log_dir)
         log_path.mkdir(parents=True, exist_ok=True)
         
         log_file = log_path / f"daily_update_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        stream_handler = logging.StreamHandler(sys.stdout)
+        stream_handler.setFormatter(formatter)
+        
+        # A process-safe queue, passed on to the pool's workers
+        self._log_queue = multiprocessing.Queue(-1)
+        queue_handler = QueueHandler(self._log_queue)
+        # Leave the full format to the listener's handlers
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+        
+        self._log_listener = QueueListener(
+            self._log_queue, file_handler, stream_handler, respect_handler_level=True
         )
+        self._log_listener.start()
+        # Drain queued records before logging shuts down at exit
+        atexit.register(self._log_listener.stop)
+    
+    def _set_run_dates(self, specific_date: Optional[datetime] = None):
+        """
+        Precompute the date strings used by every fetch-range calculation.
+        
+        Called once per run so the per-(symbol, interval) hot path does not
+        re-read the clock and re-format the same dates.
+        
+        Args:
+            specific_date: Optional specific date being updated this run
+        """
+        now = datetime.now()
+        self._today = now.date()
+        self._today_str = now.strftime('%Y-%m-%d')
+        
+        self._specific_range = None
+        if specific_date:
+            self._specific_range = (
+                specific_date,
+                specific_date.strftime('%Y-%m-%d'),
+                (specific_date + timedelta(days=1)).strftime('%Y-%m-%d')
+            )
+    
+    def _symbol_dir(self, category: str, symbol: str) -> str:
+        """
+        Get the data directory for a symbol, memoized across its intervals.
+        
+        Args:
+            category: 'stocks' or 'indices'
+            symbol: Stock/Index symbol
+            
+        Returns:
+            Path string of the symbol's data directory
+        """
+        key = (category, symbol)
+        symbol_dir = self._dir_cache.get(key)
+        if symbol_dir is None:
+            symbol_dir = f"{self._cat_root[category]}/{symbol.translate(self._SYM_TRANS)}"
+            self._dir_cache[key] = symbol_dir
+        return symbol_dir
     
     def _needs_update(self, symbol: str, interval: str, max_age_hours: int = 24) -> bool:
         """
@@ -125,10 +381,15 @@ class DailyUpdater:
             specific_date: Optional specific date to update
             
         Returns:
-            Tuple of (start_date, end_date, period) - period can be None if using dates
+            Tuple of (start_date, end_date, period) - period can be None if using dates.
+            All three are None when the data is already current and there is
+            nothing to fetch.
         """
         if specific_date:
-            # Fetch specific date
+            # Fetch specific date (formatted once per run in _set_run_dates)
+            if self._specific_range and self._specific_range[0] == specific_date:
+                return self._specific_range[1], self._specific_range[2], None
+            
             start_date = specific_date.strftime('%Y-%m-%d')
             end_date = (specific_date + timedelta(days=1)).strftime('%Y-%m-%d')
             return start_date, end_date, None
@@ -144,9 +405,13 @@ class DailyUpdater:
             else:
                 return None, None, f"{max_period}d"
         
+        # Next fetch date is in the future: data is current, don't hit the API
+        if last_date.date() > self._today:
+            return None, None, None
+        
         # Incremental update from last date to now (all intervals)
         start_date = last_date.strftime('%Y-%m-%d')
-        end_date = datetime.now().strftime('%Y-%m-%d')
+        end_date = self._today_str
         
         return start_date, end_date, None
     
@@ -156,7 +421,8 @@ class DailyUpdater:
         interval: str,
         category: str = 'stocks',
         dry_run: bool = False,
-        specific_date: Optional[datetime] = None
+        specific_date: Optional[datetime] = None,
+        check_needs_update: bool = True
     ) -> Dict[str, Any]:
         """
         Update data for a single symbol and interval.
@@ -167,6 +433,8 @@ class DailyUpdater:
             category: 'stocks' or 'indices'
             dry_run: If True, preview without downloading
             specific_date: Optional specific date to update
+            check_needs_update: Skip recently updated data (callers that
+                                already filtered their work can pass False)
             
         Returns:
             Dictionary with update results
@@ -180,20 +448,25 @@ class DailyUpdater:
         
         try:
             # Check if update is needed (unless specific date requested)
-            if not specific_date and not self._needs_update(symbol, interval):
+            if check_needs_update and not specific_date and not self._needs_update(symbol, interval):
                 self.logger.info(f"Skipping {symbol} ({interval}) - recently updated")
                 result['skipped'] = True
                 return result
             
             # Get symbol directory and CSV path
-            symbol_dir = self.data_dir / category / symbol.replace('^', '_').replace('/', '_')
-            csv_path = symbol_dir / f"{interval}.csv"
+            symbol_dir = self._symbol_dir(category, symbol)
+            csv_path = f"{symbol_dir}/{interval}{self.merger.file_extension}"
             
             # Calculate fetch range
             start_date, end_date, period = self._calculate_fetch_range(
                 symbol, interval, specific_date
             )
             
+            if start_date is None and period is None:
+                self.logger.info(f"Skipping {symbol} ({interval}) - already up to date")
+                result['skipped'] = True
+                return result
+            
             if dry_run:
                 print(f"[DRY RUN] Would fetch {symbol} ({interval}):")
                 if start_date and end_date:
@@ -214,6 +487,7 @@ class DailyUpdater:
                     self.data_fetcher.fetch_data,
                     max_retries=3,
                     initial_delay=2.0,
+                    jitter=True,
                     symbol=symbol,
                     interval=interval,
                     start_date=start_date,
@@ -224,6 +498,7 @@ class DailyUpdater:
                     self.data_fetcher.fetch_data,
                     max_retries=3,
                     initial_delay=2.0,
+                    jitter=True,
                     symbol=symbol,
                     interval=interval,
                     period=period
@@ -235,41 +510,20 @@ class DailyUpdater:
                 result['rows_added'] = 0
                 return result
             
-            # Load existing data
-            existing_df = self.merger.load_existing_data(csv_path)
-            
-            # Merge new data with existing (all intervals)
-            merged_df = self.merger.merge_data(existing_df, new_df)
-            rows_added = len(merged_df) - (len(existing_df) if existing_df is not None else 0)
-            
-            # Validate merged data
-            validated_df, report = self.validator.validate_dataframe(
-                merged_df, interval, auto_fix=True
-            )
+            # Row count on disk as of the last update (metadata is cached)
+            existing_rows = self.metadata_manager.load_metadata(symbol, interval).get('total_rows')
             
-            if not report.is_valid:
-                self.logger.warning(
-                    f"Validation issues for {symbol} ({interval}): "
-                    f"{len(report.issues)} issues"
+            # Merge, validate and save (CPU-bound; optionally in a worker process)
+            if self._process_pool is not None:
+                stats, validation_report = self._process_pool.submit(
+                    _process_stage, symbol, interval, new_df, csv_path, existing_rows
+                ).result()
+            else:
+                stats, validation_report = merge_validate_save(
+                    self.merger, self.validator, symbol, interval, new_df, csv_path,
+                    existing_rows
                 )
-            
-            # Save merged data
-            self.merger.save_data(validated_df, csv_path)
-            
-            # Update metadata
-            stats = {
-                'total_rows': len(validated_df),
-                'rows_added': rows_added,
-                'date_range': {
-                    'start': str(validated_df.index.min()),
-                    'end': str(validated_df.index.max())
-                }
-            }
-            
-            validation_report = {
-                'status': 'passed' if report.is_valid else 'issues',
-                'issues_count': len(report.issues)
-            }
+            rows_added = stats['rows_added']
             
             self.metadata_manager.update_metadata(
                 symbol, interval, stats, validation_report
@@ -281,13 +535,19 @@ class DailyUpdater:
             
             self.logger.info(
                 f"✓ Updated {symbol} ({interval}): +{rows_added} rows, "
-                f"total={len(validated_df)}"
+                f"total={stats['total_rows']}"
             )
             
         except Exception as e:
-            self.logger.error(f"Failed to update {symbol} ({interval}): {str(e)}")
-            result['error'] = str(e)
-            self.retry_manager.log_failure(symbol, interval, str(e))
+            # Lazy %-formatting; tracebacks only when debugging. During an
+            # outage this path runs for every pending (symbol, interval).
+            self.logger.error(
+                "Failed to update %s (%s): %s", symbol, interval, e,
+                exc_info=self.logger.isEnabledFor(logging.DEBUG)
+            )
+            error = str(e)
+            result['error'] = error
+            self.retry_manager.log_failure(symbol, interval, error)
         
         return result
     
@@ -317,13 +577,16 @@ class DailyUpdater:
                 self.logger.error(f"Invalid date format: {specific_date}. Use YYYY-MM-DD")
                 return
         
+        self._set_run_dates(target_date)
+        
         # Get symbols to update
         all_stocks = self.config_manager.get_stock_list()
         all_indices = self.config_manager.get_indices_list()
         
         if symbols:
-            all_stocks = [s for s in all_stocks if s in symbols]
-            all_indices = [s for s in all_indices if s in symbols]
+            symbol_set = set(symbols)
+            all_stocks = [s for s in all_stocks if s in symbol_set]
+            all_indices = [s for s in all_indices if s in symbol_set]
         
         # Get intervals to update
         if intervals is None:
@@ -335,70 +598,129 @@ class DailyUpdater:
         self.logger.info(f"Updating {len(all_stocks)} stocks and {len(all_indices)} indices")
         self.logger.info(f"Intervals: {intervals}")
         self.logger.info(f"Dry run: {dry_run}")
+        self.logger.info(f"Workers: {self.max_workers}")
+        if self.processes:
+            self.logger.info(f"Processes: {self.processes}")
         
         if dry_run:
             print("\n*** DRY RUN MODE - No data will be downloaded ***\n")
         
-        # Process stocks
-        print("\n" + "=" * 80)
-        print("UPDATING STOCKS")
-        print("=" * 80)
-        
-        if HAS_TQDM:
-            stock_iterator = tqdm(all_stocks, desc="Stocks", unit="symbol")
-        else:
-            stock_iterator = all_stocks
+        # Read all metadata once and defer metadata/failure log writes
+        # until the run finishes
+        self.metadata_manager.load_all()
+        self.metadata_manager.begin_batch()
+        self.retry_manager.begin_batch()
+        
+        # Parse/merge/validate is CPU-bound pandas work that the GIL serializes
+        # across update threads; optionally hand it to worker processes
+        if self.processes and not dry_run:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_process_worker,
+                initargs=(
+                    self.config_manager.get_timezone(),
+                    self.config_manager.get_storage_format(),
+                    self._log_queue
+                )
+            )
         
-        for stock in stock_iterator:
-            if HAS_TQDM:
-                stock_iterator.set_description(f"Stocks: {stock}")
+        try:
+            # Process stocks
+            print("\n" + "=" * 80)
+            print("UPDATING STOCKS")
+            print("=" * 80)
             
-            for interval in intervals:
-                result = self.update_symbol(
-                    stock, interval, 'stocks', dry_run, target_date
-                )
-                
-                if result['skipped']:
-                    self.stats['symbols_skipped'] += 1
-                elif result['success']:
-                    self.stats['symbols_updated'] += 1
-                    self.stats['total_rows_added'] += result['rows_added']
-                else:
-                    self.stats['symbols_failed'] += 1
+            self._update_category(all_stocks, intervals, 'stocks', dry_run, target_date)
+            
+            # Process indices
+            print("\n" + "=" * 80)
+            print("UPDATING INDICES")
+            print("=" * 80)
+            
+            self._update_category(all_indices, intervals, 'indices', dry_run, target_date)
+        finally:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+            self.retry_manager.flush()
+            self.metadata_manager.flush()
         
-        # Process indices
-        print("\n" + "=" * 80)
-        print("UPDATING INDICES")
-        print("=" * 80)
+        # Generate summary report
+        self._generate_summary_report(dry_run)
+    
+    def _update_category(
+        self,
+        symbols: List[str],
+        intervals: List[str],
+        category: str,
+        dry_run: bool = False,
+        specific_date: Optional[datetime] = None
+    ):
+        """
+        Update all (symbol, interval) pairs of one category concurrently.
         
-        if HAS_TQDM:
-            index_iterator = tqdm(all_indices, desc="Indices", unit="symbol")
-        else:
-            index_iterator = all_indices
+        Updates are network-bound, so they are dispatched to a thread pool of
+        max_workers threads. The shared DataFetcher rate limit still spaces out
+        request starts; statistics are only touched from the calling thread.
         
-        for index in index_iterator:
-            if HAS_TQDM:
-                index_iterator.set_description(f"Indices: {index}")
+        Args:
+            symbols: Symbols to update
+            intervals: Intervals to update for each symbol
+            category: 'stocks' or 'indices'
+            dry_run: If True, preview without downloading
+            specific_date: Optional specific date to update
+        """
+        tasks = [(symbol, interval) for symbol in symbols for interval in intervals]
+        
+        # Drop recently updated pairs up front (metadata is cached in memory)
+        # so they never occupy a worker
+        if not specific_date:
+            pending = [
+                (symbol, interval) for symbol, interval in tasks
+                if self._needs_update(symbol, interval)
+            ]
+            skipped = len(tasks) - len(pending)
+            if skipped:
+                self.logger.info(f"Skipping {skipped} {category} updates - recently updated")
+                self.stats['symbols_skipped'] += skipped
+            tasks = pending
+        
+        if not tasks:
+            return
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [
+                executor.submit(
+                    self.update_symbol, symbol, interval, category, dry_run, specific_date,
+                    check_needs_update=False
+                )
+                for symbol, interval in tasks
+            ]
             
-            for interval in intervals:
-                result = self.update_symbol(
-                    index, interval, 'indices', dry_run, target_date
+            if HAS_TQDM:
+                completed = tqdm(
+                    as_completed(futures), total=len(futures),
+                    desc=category.capitalize(), unit="update"
                 )
-                
-                if result['skipped']:
-                    self.stats['symbols_skipped'] += 1
-                elif result['success']:
-                    self.stats['symbols_updated'] += 1
-                    self.stats['total_rows_added'] += result['rows_added']
-                else:
-                    self.stats['symbols_failed'] += 1
-        
-        # Generate summary report
-        self._generate_summary_report(dry_run)
+            else:
+                completed = as_completed(futures)
+            
+            for future in completed:
+                self._record_result(future.result())
+    
+    def _record_result(self, result: Dict[str, Any]):
+        """Accumulate a single update_symbol result into the run statistics."""
+        if result['skipped']:
+            self.stats['symbols_skipped'] += 1
+        elif result['success']:
+            self.stats['symbols_updated'] += 1
+            self.stats['total_rows_added'] += result['rows_added']
+        else:
+            self.stats['symbols_failed'] += 1
     
     def _generate_summary_report(self, dry_run: bool = False):
         """Generate and display summary report."""
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = time.monotonic() - self.start_time
         
         print("\n" + "=" * 80)
         print("UPDATE SUMMARY")
@@ -470,6 +792,30 @@ def main():
         help='Preview without downloading'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of concurrent update workers (default: chunk_size from config)'
+    )
+    
+    parser.add_argument(
+        '--processes',
+        type=int,
+        help='Worker processes for merging/validation (default: run in update threads)'
+    )
+    
+    parser.add_argument(
+        '--chart-api',
+        action='store_true',
+        help="Fetch directly from Yahoo's chart API (skips yfinance post-processing)"
+    )
+    
+    parser.add_argument(
+        '--debug',
+        action='store_true',
+        help='Enable debug logging (includes tracebacks for failed updates)'
+    )
+    
     parser.add_argument(
         '--config-dir',
         default='./config',
@@ -494,9 +840,15 @@ def main():
     updater = DailyUpdater(
         config_dir=args.config_dir,
         data_dir=args.data_dir,
-        log_dir=args.log_dir
+        log_dir=args.log_dir,
+        max_workers=args.workers,
+        processes=args.processes,
+        use_chart_api=args.chart_api
     )
     
+    if args.debug:
+        logging.getLogger().setLevel(logging.DEBUG)
+    
     # Run update
     try:
         updater.run(
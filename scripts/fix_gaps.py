@@ -8,8 +8,12 @@ Identifies and fills gaps in historical market data.
 import sys
 import os
 import argparse
+import atexit
 import logging
+import multiprocessing
 import json
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Tuple, Optional
@@ -17,13 +21,15 @@ from typing import List, Dict, Any, Tuple, Optional
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
-from config_manager import ConfigManager
+from config_manager import ConfigManager, VALID_INTERVALS
 from data_fetcher import DataFetcher
-from data_validator import DataValidator
-from data_merger import DataMerger
+from data_validator import DataValidator, NS_PER_DAY
+from data_merger import DataMerger, PRICE_DTYPES
+from log_handlers import TqdmLoggingHandler
 from metadata_manager import MetadataManager
 from retry_manager import RetryManager
 
+import numpy as np
 import pandas as pd
 
 try:
@@ -32,10 +38,276 @@ try:
 except ImportError:
     HAS_TQDM = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+try:
+    from numba import njit
+    HAS_NUMBA = True
+except ImportError:
+    HAS_NUMBA = False
+
+
+# Fields recorded for each gap, in report order
+GAP_FIELDS = (
+    'symbol', 'interval', 'category', 'message', 'details', 'index',
+    'gap_start', 'gap_end', 'is_valid_gap', 'gap_reason', 'fixable'
+)
+
+# Gaps closer together than this are filled with a single download
+COALESCE_TOLERANCE = pd.Timedelta(days=7)
+
+# Gap reasons by the codes _classify_days returns
+GAP_REASONS = np.array(['trading_day', 'weekend', 'market_holiday'])
+
+
+def _classify_days(days: np.ndarray, holiday_days: np.ndarray) -> np.ndarray:
+    """
+    Classify day numbers (days since 1970-01-01) as 0 trading day, 1 weekend
+    or 2 market holiday, binary-searching the sorted holiday day numbers.
+    
+    Compiled with numba when it is installed.
+    """
+    out = np.empty(days.size, dtype=np.uint8)
+    for i in range(days.size):
+        day = days[i]
+        if (day + 3) % 7 >= 5:  # 1970-01-01 was a Thursday (weekday 3)
+            out[i] = 1
+        else:
+            j = np.searchsorted(holiday_days, day)
+            out[i] = 2 if j < holiday_days.size and holiday_days[j] == day else 0
+    return out
+
+
+if HAS_NUMBA:
+    # Not cached on disk: the cache records the importing module's name, so
+    # one written under "scripts.fix_gaps" (the tests) fails to load when
+    # the script runs as __main__
+    _classify_days = njit(_classify_days)
+
+
+def is_fetchable(interval: str, gap_end) -> bool:
+    """
+    Check whether Yahoo still serves data up to gap_end at this interval.
+    
+    Intraday bars are only kept for a limited number of days
+    (DataFetcher.INTERVAL_LIMITS); older gaps cannot be filled.
+    
+    Args:
+        interval: Time interval
+        gap_end: Timestamp (or date string) where the gap ends
+        
+    Returns:
+        True if a download covering the gap can return data
+    """
+    max_days = DataFetcher.INTERVAL_LIMITS.get(interval)
+    if max_days is None:
+        return True
+    
+    gap_end = pd.Timestamp(gap_end)
+    cutoff = pd.Timestamp.now(tz=gap_end.tz) - pd.Timedelta(days=max_days)
+    return gap_end >= cutoff
+
+
+def _is_valid_gap(gap_date: datetime, holidays) -> Tuple[bool, str]:
+    """
+    Check if a gap is valid (holiday, weekend).
+    
+    Args:
+        gap_date: Date to check
+        holidays: Set of market holiday dates
+        
+    Returns:
+        Tuple of (is_valid, reason)
+    """
+    # Check if weekend
+    if gap_date.weekday() >= 5:  # Saturday=5, Sunday=6
+        return True, "weekend"
+    
+    # Check if market holiday
+    if gap_date.date() in holidays:
+        return True, "market_holiday"
+    
+    return False, "trading_day"
+
+
+def classify_gap_dates(
+    gap_dates: pd.DatetimeIndex,
+    holiday_index: pd.DatetimeIndex
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Classify many gap dates as weekend, market holiday or trading day at once.
+    
+    Vectorized counterpart of _is_valid_gap.
+    
+    Args:
+        gap_dates: Dates of the gaps (tz-aware dates are compared on local time)
+        holiday_index: Normalized, tz-naive index of market holidays
+        
+    Returns:
+        Tuple of (is_valid, reason) arrays aligned with gap_dates
+    """
+    if gap_dates.tz is not None:
+        gap_dates = gap_dates.tz_localize(None)
+    
+    if HAS_NUMBA:
+        days = gap_dates.as_unit('ns').asi8 // NS_PER_DAY
+        holiday_days = np.sort(holiday_index.as_unit('ns').asi8 // NS_PER_DAY)
+        codes = _classify_days(days, holiday_days)
+        return codes > 0, GAP_REASONS[codes]
+    
+    is_weekend = gap_dates.weekday >= 5  # Saturday=5, Sunday=6
+    is_holiday = gap_dates.normalize().isin(holiday_index)
+    
+    reasons = np.where(
+        is_weekend, "weekend", np.where(is_holiday, "market_holiday", "trading_day")
+    )
+    return is_weekend | is_holiday, reasons
+
+
+def find_gaps(
+    merger: DataMerger,
+    validator: DataValidator,
+    holiday_index: pd.DatetimeIndex,
+    symbol: str,
+    interval: str,
+    category: str,
+    csv_path: Path
+) -> List[Dict[str, Any]]:
+    """
+    Identify gaps in the data file of a symbol/interval.
+    
+    Kept free of GapFixer state so it can run in a worker process.
+    
+    Args:
+        merger: DataMerger used to load the file
+        validator: DataValidator used to find gaps
+        holiday_index: Normalized, tz-naive index of market holidays
+        symbol: Stock/Index symbol
+        interval: Time interval
+        category: 'stocks' or 'indices'
+        csv_path: Path of the data file
+        
+    Returns:
+        List of gap information dictionaries
+    """
+    logger = logging.getLogger(__name__)
+    csv_path = Path(csv_path)
+    
+    if not csv_path.exists():
+        logger.warning(f"File not found: {csv_path}")
+        return []
+    
+    try:
+        df = merger.load_cached(csv_path, fast=True)
+        
+        if df is None or df.empty:
+            return []
+        
+        gap_issues = validator.check_gaps(df, interval)
+        
+        # The gap lies between rows index-1 and index; fetch all bounds at once
+        positions = [gap.get('index') for gap in gap_issues]
+        bounded = [position is not None and position > 0 for position in positions]
+        lookup = np.array(
+            [position for position, has_bounds in zip(positions, bounded) if has_bounds],
+            dtype=np.intp
+        )
+        starts = iter(df.index[lookup - 1])
+        ends = iter(df.index[lookup])
+        
+        gaps = []
+        for gap, position, has_bounds in zip(gap_issues, positions, bounded):
+            # Extract gap information
+            gaps.append({
+                'symbol': symbol,
+                'interval': interval,
+                'category': category,
+                'message': gap['message'],
+                'details': gap.get('details', ''),
+                'index': position,
+                'gap_start': next(starts) if has_bounds else None,
+                'gap_end': next(ends) if has_bounds else None,
+                'is_valid_gap': False,
+                'gap_reason': None,
+                'fixable': True
+            })
+        
+        # For daily data, check which gaps are valid, all in one pass
+        dated = [gap for gap in gaps if gap['index'] is not None]
+        if interval == '1d' and dated:
+            gap_dates = df.index[[gap['index'] for gap in dated]]
+            is_valid, reasons = classify_gap_dates(gap_dates, holiday_index)
+            for gap_info, valid, reason in zip(dated, is_valid.tolist(), reasons.tolist()):
+                gap_info['is_valid_gap'] = valid
+                gap_info['gap_reason'] = reason
+                
+                if valid:
+                    gap_info['fixable'] = False
+        
+        # Gaps older than the interval's history limit cannot be re-downloaded
+        for gap_info in gaps:
+            if (gap_info['fixable'] and gap_info['gap_end'] is not None
+                    and not is_fetchable(interval, gap_info['gap_end'])):
+                gap_info['fixable'] = False
+                gap_info['gap_reason'] = 'beyond_history_limit'
+        
+        return gaps
+        
+    except Exception as e:
+        logger.error(f"Error identifying gaps for {symbol} ({interval}): {str(e)}")
+        return []
+
+
+# Per-process merger/validator for the gap-analysis pool, built once per worker
+_worker_merger: Optional[DataMerger] = None
+_worker_validator: Optional[DataValidator] = None
+_worker_holiday_index: Optional[pd.DatetimeIndex] = None
+
+
+def _init_process_worker(
+    timezone: str,
+    storage_format: str,
+    holiday_index: pd.DatetimeIndex,
+    log_queue: Optional[multiprocessing.Queue] = None
+):
+    """Create the merger and validator used by this worker process."""
+    global _worker_merger, _worker_validator, _worker_holiday_index
+    if log_queue is not None:
+        # Hand every record to the parent's listener instead of writing the
+        # log file and the progress bar's stdout from each process
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        root = logging.getLogger()
+        root.handlers[:] = [queue_handler]
+        root.setLevel(logging.INFO)
+    _worker_merger = DataMerger(backup_enabled=False, storage_format=storage_format)
+    _worker_validator = DataValidator(timezone=timezone)
+    _worker_holiday_index = holiday_index
+
+
+def _identify_gaps_worker(
+    symbol: str,
+    interval: str,
+    category: str,
+    csv_path: str
+) -> List[Dict[str, Any]]:
+    """Run find_gaps with this worker process's components."""
+    return find_gaps(
+        _worker_merger, _worker_validator, _worker_holiday_index,
+        symbol, interval, category, csv_path
+    )
+
 
 class GapFixer:
     """Identifies and fixes gaps in market data."""
     
+    # Characters in symbols that are not safe in directory names
+    _SYM_TRANS = str.maketrans({'^': '_', '/': '_'})
+    
     # NSE Market Holidays for 2024-2026 (sample - should be updated)
     MARKET_HOLIDAYS = [
         '2024-01-26',  # Republic Day
@@ -62,9 +334,21 @@ class GapFixer:
         self,
         config_dir: str = "./config",
         data_dir: str = "./data",
-        log_dir: str = "./logs"
+        log_dir: str = "./logs",
+        processes: Optional[int] = None,
+        fill_workers: int = 8
     ):
-        """Initialize the GapFixer."""
+        """
+        Initialize the GapFixer.
+        
+        Args:
+            config_dir: Configuration directory
+            data_dir: Data directory
+            log_dir: Log directory
+            processes: Worker processes for gap identification
+                       (default: CPU count; 0 analyzes in this process)
+            fill_workers: Concurrent downloads when filling gaps
+        """
         # Setup logging
         self._setup_logging(log_dir)
         self.logger = logging.getLogger(__name__)
@@ -83,18 +367,33 @@ class GapFixer:
             retry_delay=self.config_manager.get_retry_delay()
         )
         
-        self.validator = DataValidator(
-            timezone=self.config_manager.get_timezone()
-        )
+        # Settings read once instead of per task
+        self._timezone = self.config_manager.get_timezone()
+        self._intervals = self.config_manager.get_intervals()
         
-        self.merger = DataMerger(backup_enabled=True)
+        self.validator = DataValidator(timezone=self._timezone)
+        
+        self.merger = DataMerger(
+            backup_enabled=True,
+            storage_format=self.config_manager.get_storage_format()
+        )
         self.metadata_manager = MetadataManager(metadata_dir=f"{data_dir}/metadata")
         self.retry_manager = RetryManager(log_dir=log_dir)
         
+        # yfinance period used to re-download the full history, per interval
+        self._full_periods = {}
+        for interval in set(self._intervals) | VALID_INTERVALS:
+            max_period = self.data_fetcher.get_max_period(interval)
+            self._full_periods[interval] = f"{max_period}d" if max_period else "max"
+        
         self.data_dir = Path(data_dir)
+        self._path_cache: Dict[Tuple[str, str, str], Path] = {}
+        self.processes = os.cpu_count() if processes is None else processes
+        self.fill_workers = max(1, fill_workers)
         
         # Parse holidays
         self.holidays = set(pd.to_datetime(self.MARKET_HOLIDAYS).date)
+        self._holiday_index = pd.DatetimeIndex(self.MARKET_HOLIDAYS).normalize()
         
         # Results
         self.results = {
@@ -102,25 +401,52 @@ class GapFixer:
             'valid_gaps': 0,  # Holidays, weekends
             'fixable_gaps': 0,
             'gaps_fixed': 0,
-            'gaps_unfixable': 0,
-            'gap_details': []
+            'gaps_unfixable': 0
         }
+        
+        # Gap details stored column-wise; rows are only built for the report
+        self._gap_cols: Dict[str, List[Any]] = {field: [] for field in GAP_FIELDS}
+        
+        # Fixable gap spans per (symbol, interval, category), filled after analysis
+        # (None for a gap without known bounds)
+        self._to_fill: Dict[Tuple[str, str, str], List[Optional[Tuple]]] = {}
     
     def _setup_logging(self, log_dir: str):
-        """Setup logging configuration."""
+        """
+        Setup logging configuration.
+        
+        This process and the gap-analysis workers only enqueue records; a
+        single QueueListener here does the file and console writes, so the
+        workers neither contend for the log file nor print over the
+        progress bar.
+        """
         log_path = Path(log_dir)
         log_path.mkdir(parents=True, exist_ok=True)
         
         log_file = log_path / f"gap_fixing_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        stream_handler = (
+            TqdmLoggingHandler(sys.stdout) if HAS_TQDM else logging.StreamHandler(sys.stdout)
         )
+        stream_handler.setFormatter(formatter)
+        
+        # A process-safe queue, passed on to the pool's workers
+        self._log_queue = multiprocessing.Queue(-1)
+        queue_handler = QueueHandler(self._log_queue)
+        # Leave the full format to the listener's handlers
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+        
+        self._log_listener = QueueListener(
+            self._log_queue, file_handler, stream_handler, respect_handler_level=True
+        )
+        self._log_listener.start()
+        # Drain queued records before logging shuts down at exit
+        atexit.register(self._log_listener.stop)
     
     def _is_valid_gap(self, gap_date: datetime) -> Tuple[bool, str]:
         """
@@ -132,15 +458,17 @@ class GapFixer:
         Returns:
             Tuple of (is_valid, reason)
         """
-        # Check if weekend
-        if gap_date.weekday() >= 5:  # Saturday=5, Sunday=6
-            return True, "weekend"
-        
-        # Check if market holiday
-        if gap_date.date() in self.holidays:
-            return True, "market_holiday"
-        
-        return False, "trading_day"
+        return _is_valid_gap(gap_date, self.holidays)
+    
+    def _csv_path(self, symbol: str, interval: str, category: str) -> Path:
+        """Get the data file path of a symbol/interval, memoized for the run."""
+        key = (category, symbol, interval)
+        csv_path = self._path_cache.get(key)
+        if csv_path is None:
+            symbol_dir = self.data_dir / category / symbol.translate(self._SYM_TRANS)
+            csv_path = symbol_dir / f"{interval}{self.merger.file_extension}"
+            self._path_cache[key] = csv_path
+        return csv_path
     
     def identify_gaps(
         self,
@@ -159,57 +487,10 @@ class GapFixer:
         Returns:
             List of gap information dictionaries
         """
-        symbol_dir = self.data_dir / category / symbol.replace('^', '_').replace('/', '_')
-        csv_path = symbol_dir / f"{interval}.csv"
-        
-        if not csv_path.exists():
-            self.logger.warning(f"File not found: {csv_path}")
-            return []
-        
-        try:
-            df = self.merger.load_existing_data(csv_path)
-            
-            if df is None or df.empty:
-                return []
-            
-            # Use validator to find gaps
-            gap_issues = self.validator.check_gaps(df, interval)
-            
-            gaps = []
-            for gap in gap_issues:
-                # Extract gap information
-                gap_info = {
-                    'symbol': symbol,
-                    'interval': interval,
-                    'category': category,
-                    'message': gap['message'],
-                    'details': gap.get('details', ''),
-                    'index': gap.get('index'),
-                    'is_valid_gap': False,
-                    'gap_reason': None,
-                    'fixable': True
-                }
-                
-                # For daily data, check if gap is valid
-                if interval == '1d' and gap_info['index'] is not None:
-                    try:
-                        gap_date = df.index[gap_info['index']]
-                        is_valid, reason = self._is_valid_gap(gap_date)
-                        gap_info['is_valid_gap'] = is_valid
-                        gap_info['gap_reason'] = reason
-                        
-                        if is_valid:
-                            gap_info['fixable'] = False
-                    except:
-                        pass
-                
-                gaps.append(gap_info)
-            
-            return gaps
-            
-        except Exception as e:
-            self.logger.error(f"Error identifying gaps for {symbol} ({interval}): {str(e)}")
-            return []
+        return find_gaps(
+            self.merger, self.validator, self._holiday_index,
+            symbol, interval, category, self._csv_path(symbol, interval, category)
+        )
     
     def fill_gap(
         self,
@@ -232,12 +513,19 @@ class GapFixer:
         Returns:
             True if gap was filled successfully
         """
-        symbol_dir = self.data_dir / category / symbol.replace('^', '_').replace('/', '_')
-        csv_path = symbol_dir / f"{interval}.csv"
+        csv_path = self._csv_path(symbol, interval, category)
+        
+        if gap_end and not is_fetchable(interval, gap_end):
+            self.logger.warning(
+                f"Gap for {symbol} ({interval}) ending {gap_end} is beyond the "
+                f"{self.data_fetcher.get_max_period(interval)}-day history limit"
+            )
+            return False
         
         try:
-            # Load existing data
-            existing_df = self.merger.load_existing_data(csv_path)
+            # Load existing data at the precision prices are saved with, so
+            # merging keeps the filled rows float32
+            existing_df = self.merger.load_cached(csv_path, dtype=PRICE_DTYPES)
             
             # Determine fetch parameters
             if gap_start and gap_end:
@@ -250,8 +538,10 @@ class GapFixer:
                 )
             else:
                 # Fetch all data and merge
-                max_period = self.data_fetcher.get_max_period(interval)
-                period = f"{max_period}d" if max_period else "max"
+                period = self._full_periods.get(interval)
+                if period is None:
+                    max_period = self.data_fetcher.get_max_period(interval)
+                    period = f"{max_period}d" if max_period else "max"
                 
                 self.logger.info(f"Fetching all data for {symbol} ({interval}) with period={period}")
                 new_df = self.data_fetcher.fetch_data(
@@ -264,8 +554,15 @@ class GapFixer:
                 self.logger.warning(f"No data returned for {symbol} ({interval})")
                 return False
             
+            # Narrow prices as initial_download and daily_update do
+            new_df = new_df.astype(
+                {col: dtype for col, dtype in PRICE_DTYPES.items() if col in new_df.columns}
+            )
+            
             # Merge with existing data
-            merged_df = self.merger.merge_data(existing_df, new_df)
+            merged_df, rows_added = self.merger.merge_data(
+                existing_df, new_df, return_added=True
+            )
             
             # Validate
             validated_df, report = self.validator.validate_dataframe(
@@ -278,7 +575,7 @@ class GapFixer:
             # Update metadata
             stats = {
                 'total_rows': len(validated_df),
-                'rows_added': len(validated_df) - (len(existing_df) if existing_df is not None else 0),
+                'rows_added': rows_added,
                 'date_range': {
                     'start': str(validated_df.index.min()),
                     'end': str(validated_df.index.max())
@@ -316,90 +613,207 @@ class GapFixer:
         all_indices = self.config_manager.get_indices_list()
         
         if symbols:
-            all_stocks = [s for s in all_stocks if s in symbols]
-            all_indices = [s for s in all_indices if s in symbols]
+            wanted = set(symbols)
+            all_stocks = [s for s in all_stocks if s in wanted]
+            all_indices = [s for s in all_indices if s in wanted]
         
         # Get intervals
         if intervals is None:
-            intervals = self.config_manager.get_intervals()
+            intervals = self._intervals
         
         self.logger.info(f"Analyzing {len(all_stocks)} stocks and {len(all_indices)} indices")
         self.logger.info(f"Auto-fix: {auto_fix}, Dry-run: {dry_run}")
         
-        # Analyze stocks
-        print("\n" + "=" * 80)
-        print("ANALYZING STOCKS FOR GAPS")
-        print("=" * 80)
-        
-        if HAS_TQDM:
-            stock_iterator = tqdm(all_stocks, desc="Stocks", unit="symbol")
-        else:
-            stock_iterator = all_stocks
+        # Analyze stocks and indices as one task list
+        self.logger.info("=" * 80)
+        self.logger.info("ANALYZING STOCKS AND INDICES FOR GAPS")
+        self.logger.info("=" * 80)
         
-        for stock in stock_iterator:
-            for interval in intervals:
-                gaps = self.identify_gaps(stock, interval, 'stocks')
-                
-                if gaps:
-                    self.results['total_gaps_found'] += len(gaps)
-                    
-                    for gap in gaps:
-                        self.results['gap_details'].append(gap)
-                        
-                        if gap['is_valid_gap']:
-                            self.results['valid_gaps'] += 1
-                        elif gap['fixable']:
-                            self.results['fixable_gaps'] += 1
-                            
-                            if auto_fix and not dry_run:
-                                if self.fill_gap(stock, interval, 'stocks'):
-                                    self.results['gaps_fixed'] += 1
-                                else:
-                                    self.results['gaps_unfixable'] += 1
-                        else:
-                            self.results['gaps_unfixable'] += 1
-        
-        # Analyze indices
-        print("\n" + "=" * 80)
-        print("ANALYZING INDICES FOR GAPS")
-        print("=" * 80)
-        
-        if HAS_TQDM:
-            index_iterator = tqdm(all_indices, desc="Indices", unit="symbol")
-        else:
-            index_iterator = all_indices
+        tasks = [
+            (symbol, interval, category)
+            for category, category_symbols in (('stocks', all_stocks), ('indices', all_indices))
+            for symbol in category_symbols
+            for interval in intervals
+        ]
+        self._analyze(tasks)
         
-        for index in index_iterator:
-            for interval in intervals:
-                gaps = self.identify_gaps(index, interval, 'indices')
-                
-                if gaps:
-                    self.results['total_gaps_found'] += len(gaps)
-                    
-                    for gap in gaps:
-                        self.results['gap_details'].append(gap)
-                        
-                        if gap['is_valid_gap']:
-                            self.results['valid_gaps'] += 1
-                        elif gap['fixable']:
-                            self.results['fixable_gaps'] += 1
-                            
-                            if auto_fix and not dry_run:
-                                if self.fill_gap(index, interval, 'indices'):
-                                    self.results['gaps_fixed'] += 1
-                                else:
-                                    self.results['gaps_unfixable'] += 1
-                        else:
-                            self.results['gaps_unfixable'] += 1
+        # Fill fixable gaps once every file has been analyzed
+        if auto_fix and not dry_run and self._to_fill:
+            self._fill_gaps()
         
         # Generate report
         self._generate_report(auto_fix, dry_run)
     
+    def _analyze(self, tasks: List[Tuple[str, str, str]]):
+        """
+        Identify gaps for the given (symbol, interval, category) tasks.
+        
+        Gap identification (file parsing and gap detection) is spread over
+        one pool of worker processes for the whole run, in chunks to keep
+        inter-process traffic low; results are aggregated in this process.
+        
+        Args:
+            tasks: (symbol, interval, category) triples to analyze
+        """
+        if self.processes and tasks:
+            executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_process_worker,
+                initargs=(
+                    self._timezone,
+                    self.merger.storage_format,
+                    self._holiday_index,
+                    self._log_queue
+                )
+            )
+            with executor:
+                symbols, intervals, categories = zip(*tasks)
+                paths = [str(self._csv_path(*task)) for task in tasks]
+                results = executor.map(
+                    _identify_gaps_worker, symbols, intervals, categories, paths,
+                    chunksize=max(1, len(tasks) // (self.processes * 4))
+                )
+                if HAS_TQDM:
+                    results = tqdm(results, total=len(tasks), desc="Analyzing", unit="file")
+                for task, gaps in zip(tasks, results):
+                    self._record_gaps(*task, gaps)
+        else:
+            if HAS_TQDM:
+                tasks = tqdm(tasks, desc="Analyzing", unit="file")
+            for task in tasks:
+                self._record_gaps(*task, self.identify_gaps(*task))
+    
+    def _record_gaps(
+        self,
+        symbol: str,
+        interval: str,
+        category: str,
+        gaps: List[Dict[str, Any]]
+    ):
+        """Add the gaps of one symbol/interval to the results, queueing fixable ones."""
+        if not gaps:
+            return
+        
+        self.results['total_gaps_found'] += len(gaps)
+        
+        for field, column in self._gap_cols.items():
+            column.extend(gap[field] for gap in gaps)
+        
+        for gap in gaps:
+            if gap['is_valid_gap']:
+                self.results['valid_gaps'] += 1
+            elif gap['fixable']:
+                self.results['fixable_gaps'] += 1
+                span = (gap['gap_start'], gap['gap_end']) if gap['gap_start'] is not None else None
+                self._to_fill.setdefault((symbol, interval, category), []).append(span)
+            else:
+                self.results['gaps_unfixable'] += 1
+    
+    def _fill_gaps(self):
+        """
+        Fill all queued gaps, downloading several files concurrently.
+        
+        Each (symbol, interval) is handled by a single thread, so no two
+        threads ever write the same file. DataFetcher spaces the requests out
+        by its rate limit across threads.
+        """
+        self.logger.info("=" * 80)
+        self.logger.info("FILLING GAPS")
+        self.logger.info("=" * 80)
+        
+        # Write each file's metadata and the failure log once, after all fills
+        self.metadata_manager.begin_batch()
+        self.retry_manager.begin_batch()
+        try:
+            with ThreadPoolExecutor(max_workers=self.fill_workers) as executor:
+                futures = [
+                    executor.submit(self._fill_file, symbol, interval, category, spans)
+                    for (symbol, interval, category), spans in self._to_fill.items()
+                ]
+                completed = as_completed(futures)
+                if HAS_TQDM:
+                    completed = tqdm(completed, total=len(futures), desc="Filling", unit="file")
+                for future in completed:
+                    fixed, unfixable = future.result()
+                    self.results['gaps_fixed'] += fixed
+                    self.results['gaps_unfixable'] += unfixable
+        finally:
+            self.retry_manager.flush()
+            self.metadata_manager.flush()
+    
+    def _fill_file(
+        self,
+        symbol: str,
+        interval: str,
+        category: str,
+        spans: List[Optional[Tuple]]
+    ) -> Tuple[int, int]:
+        """
+        Fill the gaps of one symbol/interval, one download per coalesced span.
+        
+        If any gap has no known bounds the full history is re-downloaded
+        once instead, which covers every gap of the file.
+        
+        Args:
+            symbol: Stock/Index symbol
+            interval: Time interval
+            category: 'stocks' or 'indices'
+            spans: (gap_start, gap_end) timestamps per gap, or None if unknown
+            
+        Returns:
+            Tuple of (gaps fixed, gaps unfixable)
+        """
+        if None in spans:
+            if self.fill_gap(symbol, interval, category):
+                return len(spans), 0
+            return 0, len(spans)
+        
+        fixed = unfixable = 0
+        for gap_start, gap_end, count in self._coalesce_gaps(spans):
+            # yfinance treats end as exclusive, so extend it by a day
+            if self.fill_gap(
+                symbol, interval, category,
+                gap_start=gap_start.strftime('%Y-%m-%d'),
+                gap_end=(gap_end + timedelta(days=1)).strftime('%Y-%m-%d')
+            ):
+                fixed += count
+            else:
+                unfixable += count
+        return fixed, unfixable
+    
+    @staticmethod
+    def _coalesce_gaps(
+        spans: List[Tuple],
+        tolerance: pd.Timedelta = COALESCE_TOLERANCE
+    ) -> List[Tuple]:
+        """
+        Merge gap spans that overlap or lie within tolerance of each other.
+        
+        Args:
+            spans: (gap_start, gap_end) timestamps per gap
+            tolerance: Largest distance between spans that are still merged
+            
+        Returns:
+            List of (gap_start, gap_end, gap_count) for the merged spans
+        """
+        merged = []
+        for gap_start, gap_end in sorted(spans):
+            if merged and gap_start - merged[-1][1] < tolerance:
+                start, end, count = merged[-1]
+                merged[-1] = (start, max(end, gap_end), count + 1)
+            else:
+                merged.append((gap_start, gap_end, 1))
+        return merged
+    
+    def _gap_records(self) -> List[Dict[str, Any]]:
+        """Rebuild the per-gap dictionaries from the column store."""
+        return [dict(zip(GAP_FIELDS, row)) for row in zip(*self._gap_cols.values())]
+    
     def _generate_report(self, auto_fix: bool = False, dry_run: bool = False):
         """Generate gap analysis report."""
-        print("\n" + "=" * 80)
-        print("GAP ANALYSIS REPORT")
-        print("=" * 80)
+        self.logger.info("=" * 80)
+        self.logger.info("GAP ANALYSIS REPORT")
+        self.logger.info("=" * 80)
         
         summary = [
             f"Mode: {'AUTO-FIX' if auto_fix else 'ANALYSIS ONLY'} {'(DRY RUN)' if dry_run else ''}",
@@ -411,41 +825,50 @@ class GapFixer:
         ]
         
         for line in summary:
-            print(line)
             self.logger.info(line)
         
         # Gap details by type
-        if self.results['gap_details']:
-            print("\nGap Summary by Symbol (showing first 20):")
+        if self._gap_cols['symbol']:
+            self.logger.info("Gap Summary by Symbol (showing first 20):")
             
-            # Group by symbol
-            gaps_by_symbol = {}
-            for gap in self.results['gap_details']:
-                symbol = gap['symbol']
-                if symbol not in gaps_by_symbol:
-                    gaps_by_symbol[symbol] = []
-                gaps_by_symbol[symbol].append(gap)
+            # Group by symbol, in order of first appearance
+            valid = np.array(self._gap_cols['is_valid_gap'], dtype=bool)
+            fixable = np.array(self._gap_cols['fixable'], dtype=bool) & ~valid
+            gap_df = pd.DataFrame({
+                'symbol': self._gap_cols['symbol'], 'fixable': fixable, 'valid': valid
+            })
+            by_symbol = gap_df.groupby('symbol', sort=False).agg(
+                total=('symbol', 'size'), fixable=('fixable', 'sum'), valid=('valid', 'sum')
+            )
             
-            for idx, (symbol, gaps) in enumerate(list(gaps_by_symbol.items())[:20]):
-                fixable = sum(1 for g in gaps if g['fixable'] and not g['is_valid_gap'])
-                valid = sum(1 for g in gaps if g['is_valid_gap'])
-                print(f"  {symbol}: {len(gaps)} gaps ({fixable} fixable, {valid} valid)")
+            for row in by_symbol.head(20).itertuples():
+                self.logger.info(
+                    f"  {row.Index}: {row.total} gaps ({row.fixable} fixable, {row.valid} valid)"
+                )
             
-            if len(gaps_by_symbol) > 20:
-                print(f"  ... and {len(gaps_by_symbol) - 20} more symbols")
+            if len(by_symbol) > 20:
+                self.logger.info(f"  ... and {len(by_symbol) - 20} more symbols")
         
         # Save detailed report
+        report = dict(self.results, gap_details=self._gap_records())
         report_path = self.data_dir.parent / "logs" / f"gap_analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False, default=str)
+        if HAS_ORJSON:
+            report_path.write_bytes(orjson.dumps(
+                report,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS,
+                default=str
+            ))
+        else:
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False, default=str)
         
-        print(f"\nDetailed report saved to: {report_path}")
+        self.logger.info(f"Detailed report saved to: {report_path}")
         
         # Generate fix script if needed
         if not auto_fix and self.results['fixable_gaps'] > 0:
             self._generate_fix_script()
         
-        print("=" * 80)
+        self.logger.info("=" * 80)
         self.logger.info("GAP ANALYSIS COMPLETED")
     
     def _generate_fix_script(self):
@@ -453,26 +876,32 @@ class GapFixer:
         script_path = self.data_dir.parent / "logs" / "fix_gaps_script.sh"
         
         # Get unique symbol/interval combinations that need fixing
-        to_fix = set()
-        for gap in self.results['gap_details']:
-            if gap['fixable'] and not gap['is_valid_gap']:
-                to_fix.add((gap['symbol'], gap['interval']))
+        gap_df = pd.DataFrame({
+            field: self._gap_cols[field]
+            for field in ('symbol', 'interval', 'fixable', 'is_valid_gap')
+        })
+        needs_fix = gap_df['fixable'] & ~gap_df['is_valid_gap']
+        to_fix = (
+            gap_df.loc[needs_fix, ['symbol', 'interval']]
+            .drop_duplicates()
+            .sort_values(['symbol', 'interval'])
+        )
+        
+        lines = ["#!/bin/bash\n", "# Auto-generated script to fix gaps\n\n"]
+        lines.extend(
+            f"# Fix gaps for {symbol} ({interval})\n"
+            f"python scripts/fix_gaps.py --symbols {symbol} "
+            f"--intervals {interval} --auto-fix\n\n"
+            for symbol, interval in to_fix.itertuples(index=False)
+        )
         
         with open(script_path, 'w', encoding='utf-8') as f:
-            f.write("#!/bin/bash\n")
-            f.write("# Auto-generated script to fix gaps\n\n")
-            
-            for symbol, interval in sorted(to_fix):
-                f.write(f"# Fix gaps for {symbol} ({interval})\n")
-                f.write(
-                    f"python scripts/fix_gaps.py --symbols {symbol} "
-                    f"--intervals {interval} --auto-fix\n\n"
-                )
+            f.writelines(lines)
         
         if os.name != 'nt':
             os.chmod(script_path, 0o755)
         
-        print(f"Fix script saved to: {script_path}")
+        self.logger.info(f"Fix script saved to: {script_path}")
 
 
 def main():
@@ -505,6 +934,19 @@ def main():
         help='Preview without fixing'
     )
     
+    parser.add_argument(
+        '--processes',
+        type=int,
+        help='Worker processes for gap identification (default: CPU count, 0 for none)'
+    )
+    
+    parser.add_argument(
+        '--fill-workers',
+        type=int,
+        default=8,
+        help='Concurrent downloads when filling gaps (default: 8)'
+    )
+    
     parser.add_argument(
         '--config-dir',
         default='./config',
@@ -529,7 +971,9 @@ def main():
     fixer = GapFixer(
         config_dir=args.config_dir,
         data_dir=args.data_dir,
-        log_dir=args.log_dir
+        log_dir=args.log_dir,
+        processes=args.processes,
+        fill_workers=args.fill_workers
     )
     
     # Run gap fixing
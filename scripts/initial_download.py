@@ -9,20 +9,24 @@ import sys
 import os
 import argparse
 import logging
+import threading
 import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+import pandas as pd
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from config_manager import ConfigManager
-from data_fetcher import DataFetcher
+from data_fetcher import DataFetcher, PermanentFetchError, RateLimiter
 from data_validator import DataValidator
-from data_merger import DataMerger
+from data_merger import DataMerger, PRICE_DTYPES
 from metadata_manager import MetadataManager
-from retry_manager import RetryManager
+from retry_manager import CircuitBreaker, RetryManager
 
 try:
     from tqdm import tqdm
@@ -32,16 +36,114 @@ except ImportError:
     print("Warning: tqdm not installed. Install with: pip install tqdm")
 
 
+def validate_and_save(
+    merger: DataMerger,
+    validator: DataValidator,
+    symbol: str,
+    interval: str,
+    df: pd.DataFrame,
+    csv_path: str
+) -> Tuple[Dict[str, Any], Dict[str, Any], int]:
+    """
+    Validate a freshly downloaded history and write it to its data file.
+    
+    Kept free of InitialDownloader state so it can run in a worker process.
+    
+    Args:
+        merger: DataMerger used to save
+        validator: DataValidator used to validate/auto-fix
+        symbol: Stock/Index symbol (for logging)
+        interval: Time interval
+        df: Downloaded data
+        csv_path: Path of the data file to write
+        
+    Returns:
+        Tuple of (stats, validation_report, bytes_written); the first two are
+        ready for MetadataManager.update_metadata
+    """
+    logger = logging.getLogger(__name__)
+    
+    validated_df, report = validator.validate_dataframe(df, interval, auto_fix=True)
+    
+    if not report.is_valid:
+        logger.warning(
+            f"Data validation issues for {symbol} ({interval}): "
+            f"{len(report.issues)} issues"
+        )
+    
+    bytes_written = merger.save_data(validated_df, csv_path)
+    
+    stats = {
+        'total_rows': len(validated_df),
+        'rows_added': len(validated_df),
+        'date_range': {
+            'start': str(validated_df.index.min()),
+            'end': str(validated_df.index.max())
+        }
+    }
+    
+    validation_report = {
+        'status': 'passed' if report.is_valid else 'issues',
+        'issues_count': len(report.issues)
+    }
+    
+    return stats, validation_report, bytes_written
+
+
+# Per-process merger/validator for the --processes stage, built once per worker
+_worker_merger: Optional[DataMerger] = None
+_worker_validator: Optional[DataValidator] = None
+
+
+def _init_process_worker(timezone: str, storage_format: str):
+    """Create the merger and validator used by this worker process."""
+    global _worker_merger, _worker_validator
+    _worker_merger = DataMerger(backup_enabled=True, storage_format=storage_format)
+    _worker_validator = DataValidator(timezone=timezone)
+
+
+def _process_stage(
+    symbol: str,
+    interval: str,
+    df: pd.DataFrame,
+    csv_path: str
+) -> Tuple[Dict[str, Any], Dict[str, Any], int]:
+    """Run validate_and_save with this worker process's components."""
+    return validate_and_save(
+        _worker_merger, _worker_validator, symbol, interval, df, csv_path
+    )
+
+
 class InitialDownloader:
     """Handles initial download of market data for all symbols and intervals."""
     
+    # Characters in symbols that are not safe in directory names
+    _SYM_TRANS = str.maketrans({'^': '_', '/': '_'})
+    
     def __init__(
         self,
         config_dir: str = "./config",
         data_dir: str = "./data",
-        log_dir: str = "./logs"
+        log_dir: str = "./logs",
+        max_workers: Optional[int] = None,
+        processes: Optional[int] = None,
+        use_chart_api: bool = False
     ):
-        """Initialize the InitialDownloader."""
+        """
+        Initialize the InitialDownloader.
+        
+        Args:
+            config_dir: Configuration directory
+            data_dir: Data directory
+            log_dir: Log directory
+            max_workers: Number of symbols downloaded concurrently
+                         (default: chunk_size from config.yaml)
+            processes: Number of worker processes for the validate/save
+                       stage (default: None, run it in the download threads)
+            use_chart_api: Fetch from Yahoo's chart API directly over
+                           per-thread keep-alive sessions instead of
+                           yfinance's Ticker.history
+        """
         # Setup logging first
         self._setup_logging(log_dir)
         self.logger = logging.getLogger(__name__)
@@ -54,24 +156,59 @@ class InitialDownloader:
         self.config_manager = ConfigManager(config_dir)
         self.config_manager.load_config()
         
+        self.max_workers = max_workers or self.config_manager.get_chunk_size()
+        
+        # One token bucket for every download thread; bursts up to one
+        # request per worker, then settles at the configured delay
+        self.rate_limiter = RateLimiter.from_delay(
+            self.config_manager.get_config('rate_limit_delay', 0.5),
+            burst=self.config_manager.get_config('rate_limit_burst', self.max_workers)
+        )
+        # Retries are handled by retry_manager (with jittered backoff and the
+        # circuit breaker) in download_interval; a second retry loop inside
+        # the fetcher would multiply attempts and sleep on fixed delays
         self.data_fetcher = DataFetcher(
-            rate_limit_delay=0.5,
-            max_retries=self.config_manager.get_max_retries(),
-            retry_delay=self.config_manager.get_retry_delay()
+            max_retries=1,
+            retry_delay=self.config_manager.get_retry_delay(),
+            use_chart_api=use_chart_api,
+            rate_limiter=self.rate_limiter
         )
         
         self.validator = DataValidator(
             timezone=self.config_manager.get_timezone()
         )
         
-        self.merger = DataMerger(backup_enabled=True)
+        self.merger = DataMerger(
+            backup_enabled=True,
+            storage_format=self.config_manager.get_storage_format()
+        )
         self.metadata_manager = MetadataManager(metadata_dir=f"{data_dir}/metadata")
         self.retry_manager = RetryManager(log_dir=log_dir)
         
+        # Yahoo is the only host; stop hammering it while it keeps failing
+        self.circuit_breaker = CircuitBreaker(
+            failure_threshold=self.config_manager.get_config('circuit_breaker_threshold', 10),
+            cooldown=self.config_manager.get_config('circuit_breaker_cooldown', 60.0)
+        )
+        
+        # yfinance period covering the full available history, per interval
+        self._periods = {}
+        for interval in self.data_fetcher.INTERVAL_LIMITS:
+            max_period = self.data_fetcher.get_max_period(interval)
+            self._periods[interval] = f"{max_period}d" if max_period else "max"
+        
         self.data_dir = Path(data_dir)
-        self.start_time = time.time()
+        self._cat_root = {
+            category: str(self.data_dir / category) for category in ('stocks', 'indices')
+        }
+        self._dir_cache: Dict[Tuple[str, str], str] = {}
+        self._file_sizes: Dict[Tuple[str, str], Dict[str, int]] = {}
+        self.processes = processes
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self.start_time = time.monotonic()
         
-        # Statistics
+        # Statistics (row/size totals are updated from download threads)
+        self._stats_lock = threading.Lock()
         self.stats = {
             'total_symbols': 0,
             'successful_downloads': 0,
@@ -96,6 +233,48 @@ class InitialDownloader:
             ]
         )
     
+    def _symbol_dir(self, category: str, symbol: str) -> str:
+        """
+        Get (and create on first use) the data directory for a symbol.
+        
+        On first use the directory is also listed once with os.scandir, so
+        the existence/size of every interval file is known without a
+        stat() per file (see _file_size).
+        
+        Args:
+            category: 'stocks' or 'indices'
+            symbol: Stock/Index symbol
+            
+        Returns:
+            Path string of the symbol's data directory
+        """
+        key = (category, symbol)
+        symbol_dir = self._dir_cache.get(key)
+        if symbol_dir is None:
+            symbol_dir = f"{self._cat_root[category]}/{symbol.translate(self._SYM_TRANS)}"
+            os.makedirs(symbol_dir, exist_ok=True)
+            with os.scandir(symbol_dir) as entries:
+                self._file_sizes[key] = {
+                    entry.name: entry.stat().st_size for entry in entries if entry.is_file()
+                }
+            self._dir_cache[key] = symbol_dir
+        return symbol_dir
+    
+    def _file_size(self, category: str, symbol: str, filename: str) -> int:
+        """
+        Size of a symbol's data file when its directory was first listed.
+        
+        Args:
+            category: 'stocks' or 'indices'
+            symbol: Stock/Index symbol
+            filename: File name within the symbol directory
+            
+        Returns:
+            Size in bytes (0 if the file did not exist)
+        """
+        self._symbol_dir(category, symbol)
+        return self._file_sizes[(category, symbol)].get(filename, 0)
+    
     def download_symbol(
         self,
         symbol: str,
@@ -115,99 +294,125 @@ class InitialDownloader:
         Returns:
             Dictionary mapping interval to success status
         """
-        results = {}
-        
-        # Create symbol directory
-        symbol_dir = self.data_dir / category / symbol.replace('^', '_').replace('/', '_')
-        symbol_dir.mkdir(parents=True, exist_ok=True)
+        failures: List[Tuple[str, str, str]] = []
+        results = {
+            interval: self.download_interval(symbol, interval, category, force, failures)
+            for interval in intervals
+        }
+        self.retry_manager.log_failure_batch(failures)
+        return results
+    
+    def download_interval(
+        self,
+        symbol: str,
+        interval: str,
+        category: str = 'stocks',
+        force: bool = False,
+        failures: Optional[List[Tuple[str, str, str]]] = None
+    ) -> bool:
+        """
+        Download, validate and save the data of one symbol/interval.
         
-        for interval in intervals:
-            try:
-                csv_path = symbol_dir / f"{interval}.csv"
-                
-                # Check if file exists and skip if not forcing
-                if not force and csv_path.exists():
-                    existing_data = self.merger.load_existing_data(csv_path)
-                    if existing_data is not None and not existing_data.empty:
-                        self.logger.info(f"Skipping {symbol} ({interval}) - already exists")
-                        results[interval] = True
-                        continue
-                
-                # Determine period based on interval limits
-                max_period = self.data_fetcher.get_max_period(interval)
-                if max_period is None:
-                    period = "max"
-                else:
-                    period = f"{max_period}d"
-                
-                self.logger.info(f"Downloading {symbol} ({interval}) with period={period}")
-                
-                # Download data with retry
-                df = self.retry_manager.retry_with_backoff(
-                    self.data_fetcher.fetch_data,
-                    max_retries=3,
-                    initial_delay=2.0,
-                    symbol=symbol,
-                    interval=interval,
-                    period=period
-                )
-                
-                if df is None or df.empty:
-                    self.logger.warning(f"No data returned for {symbol} ({interval})")
-                    results[interval] = False
-                    self.retry_manager.log_failure(symbol, interval, "No data returned")
-                    continue
-                
-                # Validate data
-                validated_df, report = self.validator.validate_dataframe(
-                    df, interval, auto_fix=True
-                )
-                
-                if not report.is_valid:
-                    self.logger.warning(
-                        f"Data validation issues for {symbol} ({interval}): "
-                        f"{len(report.issues)} issues"
-                    )
-                
-                # Save data
-                self.merger.save_data(validated_df, csv_path)
-                
-                # Update metadata
-                stats = {
-                    'total_rows': len(validated_df),
-                    'rows_added': len(validated_df),
-                    'date_range': {
-                        'start': str(validated_df.index.min()),
-                        'end': str(validated_df.index.max())
-                    }
-                }
-                
-                validation_report = {
-                    'status': 'passed' if report.is_valid else 'issues',
-                    'issues_count': len(report.issues)
-                }
-                
-                self.metadata_manager.update_metadata(
-                    symbol, interval, stats, validation_report
+        Args:
+            symbol: Stock/Index symbol
+            interval: Interval to download
+            category: 'stocks' or 'indices'
+            force: Whether to overwrite existing data
+            failures: If given, failures are appended here as
+                      (symbol, interval, error) for the caller to log in one
+                      batch instead of being logged immediately
+            
+        Returns:
+            True if the data is on disk (downloaded or already present)
+        """
+        try:
+            filename = f"{interval}{self.merger.file_extension}"
+            csv_path = f"{self._symbol_dir(category, symbol)}/{filename}"
+            
+            # Skip files that already hold data unless forcing; only
+            # non-empty files from the directory listing need a look inside
+            if (
+                not force
+                and self._file_size(category, symbol, filename)
+                and self.merger.has_data(csv_path)
+            ):
+                self.logger.info(f"Skipping {symbol} ({interval}) - already exists")
+                return True
+            
+            # Longest period the interval allows ("max" when unlimited)
+            period = self._periods.get(interval, "max")
+            
+            self.logger.info(f"Downloading {symbol} ({interval}) with period={period}")
+            
+            # Download data with retry. Dead tickers fail at once without
+            # counting against the breaker; while the breaker is open the
+            # download waits instead of failing
+            df = self.retry_manager.retry_with_backoff(
+                self.data_fetcher.fetch_data,
+                max_retries=max(1, self.config_manager.get_max_retries()),
+                initial_delay=2.0,
+                jitter=True,
+                circuit_breaker=self.circuit_breaker,
+                wait_if_open=True,
+                give_up_on=(PermanentFetchError,),
+                symbol=symbol,
+                interval=interval,
+                period=period
+            )
+            
+            if df is None or df.empty:
+                self.logger.warning(f"No data returned for {symbol} ({interval})")
+                self._record_failure(failures, symbol, interval, "No data returned")
+                return False
+            
+            # Narrow prices before validating (and before pickling to a worker)
+            df = df.astype({col: dtype for col, dtype in PRICE_DTYPES.items() if col in df.columns})
+            
+            # Validate and save (CPU-bound; optionally in a worker process)
+            if self._process_pool is not None:
+                stats, validation_report, bytes_written = self._process_pool.submit(
+                    _process_stage, symbol, interval, df, csv_path
+                ).result()
+            else:
+                stats, validation_report, bytes_written = validate_and_save(
+                    self.merger, self.validator, symbol, interval, df, csv_path
                 )
-                
-                # Update statistics
-                self.stats['total_rows'] += len(validated_df)
-                file_size = csv_path.stat().st_size / (1024 * 1024)  # MB
+            
+            # Update metadata
+            self.metadata_manager.update_metadata(
+                symbol, interval, stats, validation_report
+            )
+            
+            # Update statistics
+            total_rows = stats['total_rows']
+            file_size = bytes_written / (1024 * 1024)  # MB
+            with self._stats_lock:
+                self.stats['total_rows'] += total_rows
                 self.stats['total_size_mb'] += file_size
-                
-                results[interval] = True
-                self.logger.info(
-                    f"✓ {symbol} ({interval}): {len(validated_df)} rows, "
-                    f"{file_size:.2f} MB"
-                )
-                
-            except Exception as e:
-                self.logger.error(f"Failed to download {symbol} ({interval}): {str(e)}")
-                results[interval] = False
-                self.retry_manager.log_failure(symbol, interval, str(e))
-        
-        return results
+            
+            self.logger.info(
+                f"✓ {symbol} ({interval}): {total_rows} rows, "
+                f"{file_size:.2f} MB"
+            )
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to download {symbol} ({interval}): {str(e)}")
+            self._record_failure(failures, symbol, interval, str(e))
+            return False
+    
+    def _record_failure(
+        self,
+        failures: Optional[List[Tuple[str, str, str]]],
+        symbol: str,
+        interval: str,
+        error: str
+    ):
+        """Buffer a failure in failures, or log it right away if there is no buffer."""
+        if failures is None:
+            self.retry_manager.log_failure(symbol, interval, error)
+        else:
+            failures.append((symbol, interval, error))
     
     def run(
         self,
@@ -229,8 +434,9 @@ class InitialDownloader:
         
         if symbols:
             # Filter to specified symbols
-            all_stocks = [s for s in all_stocks if s in symbols]
-            all_indices = [s for s in all_indices if s in symbols]
+            symbol_set = set(symbols)
+            all_stocks = [s for s in all_stocks if s in symbol_set]
+            all_indices = [s for s in all_indices if s in symbol_set]
         
         # Get intervals to download
         if intervals is None:
@@ -244,60 +450,120 @@ class InitialDownloader:
         self.logger.info(f"Intervals: {intervals}")
         self.logger.info(f"Force overwrite: {force}")
         
-        # Process stocks
+        self.logger.info(f"Workers: {self.max_workers}")
+        if self.processes:
+            self.logger.info(f"Processes: {self.processes}")
+        
+        # Process stocks and indices through one pool, so indices do not
+        # wait for the slowest stock
         print("\n" + "=" * 80)
-        print("DOWNLOADING STOCKS")
+        print("DOWNLOADING STOCKS AND INDICES")
         print("=" * 80)
         
-        if HAS_TQDM:
-            stock_iterator = tqdm(all_stocks, desc="Stocks", unit="symbol")
-        else:
-            stock_iterator = all_stocks
+        tasks = [(stock, 'stocks') for stock in all_stocks]
+        tasks += [(index, 'indices') for index in all_indices]
         
-        for stock in stock_iterator:
-            if HAS_TQDM:
-                stock_iterator.set_description(f"Stocks: {stock}")
-            else:
-                print(f"Processing stock: {stock}")
-            
-            results = self.download_symbol(stock, intervals, 'stocks', force)
-            
-            success_count = sum(1 for v in results.values() if v)
-            if success_count == len(intervals):
-                self.stats['successful_downloads'] += 1
-            else:
-                self.stats['failed_downloads'] += 1
-        
-        # Process indices
-        print("\n" + "=" * 80)
-        print("DOWNLOADING INDICES")
-        print("=" * 80)
+        # Read all metadata once and defer metadata/failure log writes
+        # until the run finishes
+        self.metadata_manager.load_all()
+        self.metadata_manager.begin_batch()
+        self.retry_manager.begin_batch()
         
-        if HAS_TQDM:
-            index_iterator = tqdm(all_indices, desc="Indices", unit="symbol")
-        else:
-            index_iterator = all_indices
+        # Validation is CPU-bound pandas work that the GIL serializes across
+        # download threads; optionally hand it to worker processes
+        if self.processes:
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_process_worker,
+                initargs=(
+                    self.config_manager.get_timezone(),
+                    self.config_manager.get_storage_format()
+                )
+            )
         
-        for index in index_iterator:
-            if HAS_TQDM:
-                index_iterator.set_description(f"Indices: {index}")
-            else:
-                print(f"Processing index: {index}")
-            
-            results = self.download_symbol(index, intervals, 'indices', force)
-            
-            success_count = sum(1 for v in results.values() if v)
-            if success_count == len(intervals):
-                self.stats['successful_downloads'] += 1
-            else:
-                self.stats['failed_downloads'] += 1
+        try:
+            self._download_all(tasks, intervals, force)
+        finally:
+            if self._process_pool is not None:
+                self._process_pool.shutdown()
+                self._process_pool = None
+            self.retry_manager.flush()
+            self.metadata_manager.flush()
         
         # Generate summary report
         self._generate_summary_report()
     
+    def _download_all(
+        self,
+        tasks: List[Tuple[str, str]],
+        intervals: List[str],
+        force: bool
+    ):
+        """
+        Download all (symbol, category) tasks concurrently.
+        
+        Downloads are network-bound, so every (symbol, interval) pair is
+        dispatched to a single thread pool of max_workers threads for the
+        whole run; a symbol's intervals download in parallel rather than
+        one after another. The shared DataFetcher rate limit still spaces
+        out request starts; per-symbol outcomes are tallied in the calling
+        thread once all of a symbol's intervals are done.
+        
+        Args:
+            tasks: (symbol, category) pairs to download
+            intervals: Intervals to download for each symbol
+            force: Whether to overwrite existing data
+        """
+        if not tasks or not intervals:
+            return
+        
+        # Intervals still outstanding / succeeded per (symbol, category), and
+        # the failures to log once all of a symbol's intervals are done
+        remaining = dict.fromkeys(tasks, len(intervals))
+        succeeded = dict.fromkeys(tasks, 0)
+        failures = {task: [] for task in tasks}
+        
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(
+                    self.download_interval, symbol, interval, category, force,
+                    failures[(symbol, category)]
+                ): (symbol, category)
+                for symbol, category in tasks
+                for interval in intervals
+            }
+            
+            completed = as_completed(futures)
+            if HAS_TQDM:
+                completed = tqdm(
+                    completed, total=len(futures), desc="Downloads", unit="file",
+                    mininterval=0.5
+                )
+            
+            for future in completed:
+                task = futures[future]
+                succeeded[task] += bool(future.result())
+                remaining[task] -= 1
+                if remaining[task]:
+                    continue
+                symbol, category = task
+                self.retry_manager.log_failure_batch(failures.pop(task))
+                
+                # All intervals of this symbol are done; the postfix is
+                # picked up by tqdm's next rate-limited redraw
+                if HAS_TQDM:
+                    completed.set_postfix_str(f"{category}: {symbol}", refresh=False)
+                else:
+                    print(f"Processed {symbol} ({category})")
+                
+                if succeeded[task] == len(intervals):
+                    self.stats['successful_downloads'] += 1
+                else:
+                    self.stats['failed_downloads'] += 1
+    
     def _generate_summary_report(self):
         """Generate and display summary report."""
-        elapsed_time = time.time() - self.start_time
+        elapsed_time = time.monotonic() - self.start_time
         
         print("\n" + "=" * 80)
         print("DOWNLOAD SUMMARY")
@@ -363,6 +629,24 @@ def main():
         help='Overwrite existing data'
     )
     
+    parser.add_argument(
+        '--workers',
+        type=int,
+        help='Number of symbols downloaded concurrently (default: chunk_size from config)'
+    )
+    
+    parser.add_argument(
+        '--processes',
+        type=int,
+        help='Worker processes for validation/saving (default: run in download threads)'
+    )
+    
+    parser.add_argument(
+        '--chart-api',
+        action='store_true',
+        help="Fetch directly from Yahoo's chart API (skips yfinance post-processing)"
+    )
+    
     parser.add_argument(
         '--config-dir',
         default='./config',
@@ -387,7 +671,10 @@ def main():
     downloader = InitialDownloader(
         config_dir=args.config_dir,
         data_dir=args.data_dir,
-        log_dir=args.log_dir
+        log_dir=args.log_dir,
+        max_workers=args.workers,
+        processes=args.processes,
+        use_chart_api=args.chart_api
     )
     
     # Run download
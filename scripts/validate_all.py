@@ -8,18 +8,26 @@ Validates all existing data files and generates comprehensive reports.
 import sys
 import os
 import argparse
+import atexit
 import logging
+import multiprocessing
 import json
+from collections import Counter
+from dataclasses import asdict, dataclass
+from logging.handlers import QueueHandler, QueueListener
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 
 # Add src to path
 sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 
 from config_manager import ConfigManager
 from data_validator import DataValidator, ValidationReport
-from data_merger import DataMerger
+from data_merger import DataMerger, OHLCV_FLOAT32
+from log_handlers import TqdmLoggingHandler
 from metadata_manager import MetadataManager
 
 try:
@@ -28,17 +36,368 @@ try:
 except ImportError:
     HAS_TQDM = False
 
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+
+# Threads listing symbol directories; the scans are syscall latency, not CPU
+SCAN_THREADS = 32
+
+# Results of unchanged files from earlier runs, kept in the data directory
+VALIDATION_CACHE_FILE = '.validation_cache.json'
+
+
+@dataclass
+class RedownloadItem:
+    """A file that has to be downloaded again, with the first few reasons why."""
+    # Declared by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = ('symbol', 'interval', 'category', 'reason')
+    
+    symbol: str
+    interval: str
+    category: str
+    reason: Tuple[str, ...]
+
+
+def _new_result(filepath: Path, symbol: str, interval: str) -> Dict[str, Any]:
+    """Create an empty validation result for a file."""
+    return {
+        'filepath': str(filepath),
+        'symbol': symbol,
+        'interval': interval,
+        'exists': False,
+        'valid': False,
+        'issues': [],
+        'stats': {},
+        'needs_redownload': False
+    }
+
+
+def missing_file_result(filepath: Path, symbol: str, interval: str) -> Dict[str, Any]:
+    """Validation result for a file that does not exist."""
+    result = _new_result(filepath, symbol, interval)
+    result['issues'].append({
+        'severity': 'error',
+        'category': 'missing',
+        'message': 'File does not exist'
+    })
+    result['needs_redownload'] = True
+    return result
+
+
+def scan_stats(directory: str) -> Dict[str, Tuple[int, int]]:
+    """
+    List the file sizes and modification times of a directory with one os.scandir pass.
+    
+    Args:
+        directory: Directory to list
+        
+    Returns:
+        Mapping of file name to (size in bytes, st_mtime_ns)
+        (empty if the directory is missing)
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return {
+                entry.name: (st.st_size, st.st_mtime_ns)
+                for entry in entries if entry.is_file()
+                for st in (entry.stat(),)
+            }
+    except FileNotFoundError:
+        return {}
+
+
+def date_range(index) -> Tuple[str, str]:
+    """
+    Get the first and last timestamps of a DatetimeIndex as strings.
+    
+    Data files are written in time order, so the ends of a sorted index are
+    read directly; min/max scans are only needed for an unsorted one.
+    """
+    if index.is_monotonic_increasing:
+        return str(index[0]), str(index[-1])
+    return str(index.min()), str(index.max())
+
+
+def load_result_cache(cache_path: Path) -> Dict[str, Dict[str, Any]]:
+    """
+    Load cached validation results, dropping entries whose file no longer exists.
+    
+    Args:
+        cache_path: Path to the cache file
+        
+    Returns:
+        Mapping of file path to {'key': [...], 'result': {...}}
+    """
+    try:
+        with open(cache_path, 'rb') as f:
+            data = f.read()
+        cache = orjson.loads(data) if HAS_ORJSON else json.loads(data)
+    except (FileNotFoundError, ValueError):
+        return {}
+    return {path: entry for path, entry in cache.items() if os.path.exists(path)}
+
+
+def validate_file(
+    merger: DataMerger,
+    validator: DataValidator,
+    metadata_manager: MetadataManager,
+    filepath: Path,
+    symbol: str,
+    interval: str,
+    fix: bool = False,
+    file_size: Optional[int] = None,
+    check_metadata: bool = True
+) -> Dict[str, Any]:
+    """
+    Validate a single data file.
+    
+    Kept free of DataValidationSuite state so it can run in a worker process.
+    
+    Args:
+        merger: DataMerger used to load (and, when fixing, save) the file
+        validator: DataValidator used to validate/auto-fix
+        metadata_manager: MetadataManager used for the consistency check
+        filepath: Path to CSV file
+        symbol: Stock/Index symbol
+        interval: Time interval
+        fix: Whether to fix issues automatically
+        file_size: Size in bytes if already known (e.g. from a directory
+                   listing); otherwise the file is stat-ed here
+        check_metadata: Compare the data with its recorded metadata; can be
+                        skipped when the metadata was written after the file
+        
+    Returns:
+        Dictionary with validation results
+    """
+    logger = logging.getLogger(__name__)
+    filepath = Path(filepath)
+    
+    # Check file exists (one stat call, unless the size is already known)
+    if file_size is None:
+        try:
+            file_size = os.stat(filepath).st_size
+        except FileNotFoundError:
+            return missing_file_result(filepath, symbol, interval)
+    
+    result = _new_result(filepath, symbol, interval)
+    result['exists'] = True
+    
+    # Check file size
+    if file_size == 0:
+        result['issues'].append({
+            'severity': 'error',
+            'category': 'corrupted',
+            'message': 'File is empty'
+        })
+        result['needs_redownload'] = True
+        return result
+    
+    result['stats']['file_size_mb'] = file_size / (1024 * 1024)
+    
+    try:
+        # Load data (pyarrow's multithreaded CSV reader when installed);
+        # float32 unless the fixed frame will be saved back
+        df = merger.load_existing_data(
+            filepath, fast=True, dtype=None if fix else OHLCV_FLOAT32
+        )
+        
+        if df is None or df.empty:
+            result['issues'].append({
+                'severity': 'error',
+                'category': 'corrupted',
+                'message': 'Cannot load data or data is empty'
+            })
+            result['needs_redownload'] = True
+            return result
+        
+        start, end = date_range(df.index)
+        result['stats']['row_count'] = len(df)
+        result['stats']['date_range'] = {
+            'start': start,
+            'end': end
+        }
+        
+        # Validate data
+        validated_df, report = validator.validate_dataframe(
+            df, interval, auto_fix=fix
+        )
+        
+        # Process validation report
+        result['valid'] = report.is_valid
+        
+        for issue in report.issues:
+            result['issues'].append({
+                'severity': issue['severity'],
+                'category': issue['category'],
+                'message': issue['message'],
+                'details': issue.get('details')
+            })
+        
+        # Check metadata consistency
+        if check_metadata:
+            metadata_issues = check_metadata_consistency(
+                metadata_manager, symbol, interval, df
+            )
+            result['issues'].extend(metadata_issues)
+        
+        # If fixed, save the corrected data
+        if fix and not report.is_valid:
+            logger.info(f"Saving fixed data for {symbol} ({interval})")
+            merger.save_data(validated_df, filepath)
+        
+        # Determine if redownload is needed
+        critical_issues = [i for i in result['issues'] if i['severity'] in ['error', 'critical']]
+        if len(critical_issues) > 5:  # Threshold for redownload
+            result['needs_redownload'] = True
+        
+    except Exception as e:
+        result['issues'].append({
+            'severity': 'critical',
+            'category': 'error',
+            'message': f'Unexpected error: {str(e)}'
+        })
+        result['needs_redownload'] = True
+        logger.error(f"Error validating {filepath}: {str(e)}")
+    
+    return result
+
+
+def check_metadata_consistency(
+    metadata_manager: MetadataManager,
+    symbol: str,
+    interval: str,
+    df
+) -> List[Dict[str, Any]]:
+    """
+    Check if metadata is consistent with actual data.
+    
+    Args:
+        metadata_manager: MetadataManager holding the recorded metadata
+        symbol: Stock/Index symbol
+        interval: Time interval
+        df: DataFrame with actual data
+        
+    Returns:
+        List of metadata-related issues
+    """
+    issues = []
+    
+    try:
+        metadata = metadata_manager.load_metadata(symbol, interval)
+        
+        # Check row count
+        actual_rows = len(df)
+        metadata_rows = metadata.get('total_rows', 0)
+        
+        if actual_rows != metadata_rows:
+            issues.append({
+                'severity': 'warning',
+                'category': 'metadata',
+                'message': f'Row count mismatch: actual={actual_rows}, metadata={metadata_rows}'
+            })
+        
+        # Check date range
+        actual_start, actual_end = date_range(df.index)
+        
+        metadata_start = metadata.get('date_range', {}).get('start')
+        metadata_end = metadata.get('date_range', {}).get('end')
+        
+        if metadata_start and actual_start != metadata_start:
+            issues.append({
+                'severity': 'warning',
+                'category': 'metadata',
+                'message': f'Start date mismatch: actual={actual_start}, metadata={metadata_start}'
+            })
+        
+        if metadata_end and actual_end != metadata_end:
+            issues.append({
+                'severity': 'warning',
+                'category': 'metadata',
+                'message': f'End date mismatch: actual={actual_end}, metadata={metadata_end}'
+            })
+        
+    except Exception as e:
+        issues.append({
+            'severity': 'warning',
+            'category': 'metadata',
+            'message': f'Metadata check failed: {str(e)}'
+        })
+    
+    return issues
+
+
+# Per-process components for the --processes pool, built once per worker
+_worker_merger: Optional[DataMerger] = None
+_worker_validator: Optional[DataValidator] = None
+_worker_metadata: Optional[MetadataManager] = None
+
+
+def _init_process_worker(
+    timezone: str,
+    storage_format: str,
+    metadata_dir: str,
+    log_queue: Optional[multiprocessing.Queue] = None
+):
+    """Create the merger, validator and metadata manager used by this worker process."""
+    global _worker_merger, _worker_validator, _worker_metadata
+    if log_queue is not None:
+        # Hand every record to the parent's listener instead of writing the
+        # log file from each process
+        queue_handler = QueueHandler(log_queue)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        root = logging.getLogger()
+        root.handlers[:] = [queue_handler]
+        root.setLevel(logging.INFO)
+    _worker_merger = DataMerger(backup_enabled=True, storage_format=storage_format)
+    _worker_validator = DataValidator(timezone=timezone)
+    _worker_metadata = MetadataManager(metadata_dir=metadata_dir)
+
+
+def _validate_file_worker(
+    filepath: str,
+    symbol: str,
+    interval: str,
+    fix: bool,
+    file_size: Optional[int] = None,
+    check_metadata: bool = True
+) -> Dict[str, Any]:
+    """Run validate_file with this worker process's components."""
+    return validate_file(
+        _worker_merger, _worker_validator, _worker_metadata,
+        filepath, symbol, interval, fix, file_size, check_metadata
+    )
+
 
 class DataValidationSuite:
     """Comprehensive validation suite for market data files."""
     
+    # Characters in symbols that are not safe in directory names
+    _SYM_TRANS = str.maketrans({'^': '_', '/': '_'})
+    
     def __init__(
         self,
         config_dir: str = "./config",
         data_dir: str = "./data",
-        log_dir: str = "./logs"
+        log_dir: str = "./logs",
+        processes: Optional[int] = None,
+        use_cache: bool = True
     ):
-        """Initialize the validation suite."""
+        """
+        Initialize the validation suite.
+        
+        Args:
+            config_dir: Configuration directory
+            data_dir: Data directory
+            log_dir: Log directory
+            processes: Worker processes for file validation
+                       (default: CPU count; 0 validates in this process)
+            use_cache: Reuse the results of files (and their metadata) that
+                       are unchanged since the last run; never used with fix
+        """
         # Setup logging
         self._setup_logging(log_dir)
         self.logger = logging.getLogger(__name__)
@@ -55,10 +414,21 @@ class DataValidationSuite:
             timezone=self.config_manager.get_timezone()
         )
         
-        self.merger = DataMerger(backup_enabled=True)
+        self.merger = DataMerger(
+            backup_enabled=True,
+            storage_format=self.config_manager.get_storage_format()
+        )
         self.metadata_manager = MetadataManager(metadata_dir=f"{data_dir}/metadata")
         
         self.data_dir = Path(data_dir)
+        # Plain-string category roots; directory names are built once per symbol
+        self._cat_root = {
+            category: str(self.data_dir / category) for category in ('stocks', 'indices')
+        }
+        self.processes = os.cpu_count() if processes is None else processes
+        self.use_cache = use_cache
+        self.cache_path = self.data_dir / VALIDATION_CACHE_FILE
+        self._result_cache: Dict[str, Dict[str, Any]] = {}
         
         # Validation results
         self.results = {
@@ -68,32 +438,54 @@ class DataValidationSuite:
             'missing_files': 0,
             'corrupted_files': 0,
             'files_needing_redownload': [],
-            'issues_by_type': {},
+            'issues_by_type': Counter(),
             'detailed_results': []
         }
     
     def _setup_logging(self, log_dir: str):
-        """Setup logging configuration."""
+        """
+        Setup logging configuration.
+        
+        This process and the validation workers only enqueue records; a
+        single QueueListener here does the file and console writes, so the
+        workers never contend for the log file.
+        """
         log_path = Path(log_dir)
         log_path.mkdir(parents=True, exist_ok=True)
         
         log_file = log_path / f"validation_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
         
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(log_file, encoding='utf-8'),
-                logging.StreamHandler(sys.stdout)
-            ]
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(formatter)
+        stream_handler = (
+            TqdmLoggingHandler(sys.stdout) if HAS_TQDM else logging.StreamHandler(sys.stdout)
+        )
+        stream_handler.setFormatter(formatter)
+        
+        # A process-safe queue, passed on to the pool's workers
+        self._log_queue = multiprocessing.Queue(-1)
+        queue_handler = QueueHandler(self._log_queue)
+        # Leave the full format to the listener's handlers
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        
+        logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+        
+        self._log_listener = QueueListener(
+            self._log_queue, file_handler, stream_handler, respect_handler_level=True
         )
+        self._log_listener.start()
+        # Drain queued records before logging shuts down at exit
+        atexit.register(self._log_listener.stop)
     
     def validate_file(
         self,
         filepath: Path,
         symbol: str,
         interval: str,
-        fix: bool = False
+        fix: bool = False,
+        file_size: Optional[int] = None,
+        check_metadata: bool = True
     ) -> Dict[str, Any]:
         """
         Validate a single data file.
@@ -103,107 +495,16 @@ class DataValidationSuite:
             symbol: Stock/Index symbol
             interval: Time interval
             fix: Whether to fix issues automatically
+            file_size: Size in bytes if already known (stat-ed otherwise)
+            check_metadata: Compare the data with its recorded metadata
             
         Returns:
             Dictionary with validation results
         """
-        result = {
-            'filepath': str(filepath),
-            'symbol': symbol,
-            'interval': interval,
-            'exists': False,
-            'valid': False,
-            'issues': [],
-            'stats': {},
-            'needs_redownload': False
-        }
-        
-        # Check file exists
-        if not filepath.exists():
-            result['issues'].append({
-                'severity': 'error',
-                'category': 'missing',
-                'message': 'File does not exist'
-            })
-            result['needs_redownload'] = True
-            return result
-        
-        result['exists'] = True
-        
-        # Check file size
-        file_size = filepath.stat().st_size
-        if file_size == 0:
-            result['issues'].append({
-                'severity': 'error',
-                'category': 'corrupted',
-                'message': 'File is empty'
-            })
-            result['needs_redownload'] = True
-            return result
-        
-        result['stats']['file_size_mb'] = file_size / (1024 * 1024)
-        
-        try:
-            # Load data
-            df = self.merger.load_existing_data(filepath)
-            
-            if df is None or df.empty:
-                result['issues'].append({
-                    'severity': 'error',
-                    'category': 'corrupted',
-                    'message': 'Cannot load data or data is empty'
-                })
-                result['needs_redownload'] = True
-                return result
-            
-            result['stats']['row_count'] = len(df)
-            result['stats']['date_range'] = {
-                'start': str(df.index.min()),
-                'end': str(df.index.max())
-            }
-            
-            # Validate data
-            validated_df, report = self.validator.validate_dataframe(
-                df, interval, auto_fix=fix
-            )
-            
-            # Process validation report
-            result['valid'] = report.is_valid
-            
-            for issue in report.issues:
-                result['issues'].append({
-                    'severity': issue['severity'],
-                    'category': issue['category'],
-                    'message': issue['message'],
-                    'details': issue.get('details')
-                })
-            
-            # Check metadata consistency
-            metadata_issues = self._check_metadata_consistency(
-                symbol, interval, df
-            )
-            result['issues'].extend(metadata_issues)
-            
-            # If fixed, save the corrected data
-            if fix and not report.is_valid:
-                self.logger.info(f"Saving fixed data for {symbol} ({interval})")
-                self.merger.save_data(validated_df, filepath)
-            
-            # Determine if redownload is needed
-            critical_issues = [i for i in result['issues'] if i['severity'] in ['error', 'critical']]
-            if len(critical_issues) > 5:  # Threshold for redownload
-                result['needs_redownload'] = True
-            
-        except Exception as e:
-            result['issues'].append({
-                'severity': 'critical',
-                'category': 'error',
-                'message': f'Unexpected error: {str(e)}'
-            })
-            result['needs_redownload'] = True
-            self.logger.error(f"Error validating {filepath}: {str(e)}")
-        
-        return result
+        return validate_file(
+            self.merger, self.validator, self.metadata_manager,
+            filepath, symbol, interval, fix, file_size, check_metadata
+        )
     
     def _check_metadata_consistency(
         self,
@@ -211,88 +512,43 @@ class DataValidationSuite:
         interval: str,
         df
     ) -> List[Dict[str, Any]]:
-        """
-        Check if metadata is consistent with actual data.
-        
-        Args:
-            symbol: Stock/Index symbol
-            interval: Time interval
-            df: DataFrame with actual data
-            
-        Returns:
-            List of metadata-related issues
-        """
-        issues = []
-        
-        try:
-            metadata = self.metadata_manager.load_metadata(symbol, interval)
-            
-            # Check row count
-            actual_rows = len(df)
-            metadata_rows = metadata.get('total_rows', 0)
-            
-            if actual_rows != metadata_rows:
-                issues.append({
-                    'severity': 'warning',
-                    'category': 'metadata',
-                    'message': f'Row count mismatch: actual={actual_rows}, metadata={metadata_rows}'
-                })
-            
-            # Check date range
-            actual_start = str(df.index.min())
-            actual_end = str(df.index.max())
-            
-            metadata_start = metadata.get('date_range', {}).get('start')
-            metadata_end = metadata.get('date_range', {}).get('end')
-            
-            if metadata_start and actual_start != metadata_start:
-                issues.append({
-                    'severity': 'warning',
-                    'category': 'metadata',
-                    'message': f'Start date mismatch: actual={actual_start}, metadata={metadata_start}'
-                })
-            
-            if metadata_end and actual_end != metadata_end:
-                issues.append({
-                    'severity': 'warning',
-                    'category': 'metadata',
-                    'message': f'End date mismatch: actual={actual_end}, metadata={metadata_end}'
-                })
-            
-        except Exception as e:
-            issues.append({
-                'severity': 'warning',
-                'category': 'metadata',
-                'message': f'Metadata check failed: {str(e)}'
-            })
-        
-        return issues
+        """Check if metadata is consistent with actual data."""
+        return check_metadata_consistency(self.metadata_manager, symbol, interval, df)
+    
+    def symbol_dir(self, symbol: str, category: str) -> str:
+        """Get the data directory of a symbol."""
+        return f"{self._cat_root[category]}/{symbol.translate(self._SYM_TRANS)}"
     
-    def check_missing_intervals(self, symbol: str, category: str) -> List[str]:
+    def check_missing_intervals(
+        self,
+        symbol: str,
+        category: str,
+        symbol_dir: Optional[str] = None,
+        listing: Optional[Dict[str, Any]] = None
+    ) -> List[str]:
         """
         Check for missing interval files for a symbol.
         
+        The symbol directory is listed once (os.scandir) rather than
+        checking each interval file's existence separately.
+        
         Args:
             symbol: Stock/Index symbol
             category: 'stocks' or 'indices'
+            symbol_dir: The symbol's directory if already resolved
+            listing: The directory's scan_stats listing if already taken
             
         Returns:
             List of missing intervals
         """
-        expected_intervals = self.config_manager.get_intervals()
-        symbol_dir = self.data_dir / category / symbol.replace('^', '_').replace('/', '_')
-        
-        missing = []
+        if listing is None:
+            listing = scan_stats(symbol_dir or self.symbol_dir(symbol, category))
         
-        if not symbol_dir.exists():
-            return expected_intervals  # All missing
-        
-        for interval in expected_intervals:
-            csv_path = symbol_dir / f"{interval}.csv"
-            if not csv_path.exists():
-                missing.append(interval)
-        
-        return missing
+        extension = self.merger.file_extension
+        return [
+            interval for interval in self.config_manager.get_intervals()
+            if f"{interval}{extension}" not in listing
+        ]
     
     def run(self, fix: bool = False, symbols: List[str] = None):
         """
@@ -314,108 +570,206 @@ class DataValidationSuite:
         
         self.logger.info(f"Validating {len(all_stocks)} stocks and {len(all_indices)} indices")
         self.logger.info(f"Fix mode: {fix}")
+        if self.processes:
+            self.logger.info(f"Processes: {self.processes}")
+        
+        # Fixing rewrites files, so its results are neither read nor stored
+        cache_enabled = self.use_cache and not fix
+        if cache_enabled:
+            self._result_cache = load_result_cache(self.cache_path)
+        
+        # Files are independent, so parsing and validation are spread over
+        # one pool of worker processes for the whole run
+        executor = None
+        if self.processes:
+            executor = ProcessPoolExecutor(
+                max_workers=self.processes,
+                initializer=_init_process_worker,
+                initargs=(
+                    self.config_manager.get_timezone(),
+                    self.merger.storage_format,
+                    str(self.metadata_manager.metadata_dir),
+                    self._log_queue
+                )
+            )
         
-        # Validate stocks
-        print("\n" + "=" * 80)
-        print("VALIDATING STOCKS")
-        print("=" * 80)
+        try:
+            # Metadata mtimes decide whether the consistency check is needed and
+            # invalidate cached results, which include that check
+            metadata_stats = scan_stats(str(self.metadata_manager.metadata_dir))
+            
+            tasks = []
+            for category, category_symbols in (('stocks', all_stocks), ('indices', all_indices)):
+                tasks.extend(self._collect_tasks(
+                    category_symbols, intervals, category, metadata_stats, cache_enabled
+                ))
+            
+            self.logger.info(
+                f"Validating {len(tasks)} files "
+                f"({self.results['total_files']} missing or unchanged)"
+            )
+            self._validate_tasks(tasks, fix, executor, cache_enabled)
+        finally:
+            if executor is not None:
+                executor.shutdown()
         
-        if HAS_TQDM:
-            stock_iterator = tqdm(all_stocks, desc="Stocks", unit="symbol")
-        else:
-            stock_iterator = all_stocks
+        if cache_enabled:
+            self._save_result_cache()
+        
+        # Generate report
+        self._generate_report(fix)
+    
+    def _collect_tasks(
+        self,
+        symbols: List[str],
+        intervals: List[str],
+        category: str,
+        metadata_stats: Dict[str, Tuple[int, int]],
+        cache_enabled: bool = False
+    ) -> List[Tuple]:
+        """
+        List the interval files of the given symbols of one category that need validating.
+        
+        Missing files and unchanged files with a cached result are recorded
+        here directly; the rest are returned for _validate_tasks.
+        
+        Args:
+            symbols: Symbols to validate
+            intervals: Intervals expected for each symbol
+            category: 'stocks' or 'indices'
+            metadata_stats: scan_stats listing of the metadata directory
+            cache_enabled: Reuse cached results of unchanged files
+            
+        Returns:
+            List of (path, symbol, interval, category, file size, check metadata) tasks
+        """
+        symbol_dirs = [self.symbol_dir(symbol, category) for symbol in symbols]
+        
+        # List every symbol directory once, overlapping the syscalls
+        with ThreadPoolExecutor(max_workers=SCAN_THREADS) as scan_pool:
+            listings = list(scan_pool.map(scan_stats, symbol_dirs))
         
-        for stock in stock_iterator:
+        tasks = []
+        for symbol, symbol_dir, stats in zip(symbols, symbol_dirs, listings):
             # Check for missing intervals
-            missing_intervals = self.check_missing_intervals(stock, 'stocks')
+            missing_intervals = self.check_missing_intervals(symbol, category, symbol_dir, stats)
             
             if missing_intervals:
                 self.results['missing_files'] += len(missing_intervals)
-                self.logger.warning(f"{stock}: Missing intervals: {missing_intervals}")
+                self.logger.warning(f"{symbol}: Missing intervals: {missing_intervals}")
             
-            # Validate each interval
             for interval in intervals:
-                symbol_dir = self.data_dir / 'stocks' / stock.replace('^', '_').replace('/', '_')
-                csv_path = symbol_dir / f"{interval}.csv"
+                filename = f"{interval}{self.merger.file_extension}"
+                csv_path = f"{symbol_dir}/{filename}"
+                file_stat = stats.get(filename)
+                if file_stat is None:
+                    # Nothing to load; record it without a worker round trip
+                    self._record_result(
+                        missing_file_result(csv_path, symbol, interval), symbol, interval, category
+                    )
+                    continue
                 
-                result = self.validate_file(csv_path, stock, interval, fix)
+                metadata_name = self.metadata_manager._get_metadata_path(symbol, interval).name
+                metadata_mtime = metadata_stats.get(metadata_name, (0, 0))[1]
+                if cache_enabled:
+                    cache_key = [*file_stat, metadata_mtime]
+                    entry = self._result_cache.get(csv_path)
+                    if entry is not None and entry['key'] == cache_key:
+                        self._record_result(entry['result'], symbol, interval, category)
+                        continue
+                    self._result_cache[csv_path] = {'key': cache_key, 'result': None}
                 
-                self.results['total_files'] += 1
-                self.results['detailed_results'].append(result)
-                
-                if result['valid'] and result['exists']:
-                    self.results['valid_files'] += 1
-                elif result['issues']:
-                    self.results['files_with_issues'] += 1
-                    
-                    # Track issues by type
-                    for issue in result['issues']:
-                        category = issue['category']
-                        self.results['issues_by_type'][category] = \
-                            self.results['issues_by_type'].get(category, 0) + 1
-                
-                if result['needs_redownload']:
-                    self.results['files_needing_redownload'].append({
-                        'symbol': stock,
-                        'interval': interval,
-                        'category': 'stocks',
-                        'reason': [i['message'] for i in result['issues'][:3]]  # First 3 issues
-                    })
-                
-                if not result['exists']:
-                    self.results['corrupted_files'] += 1
+                # Metadata is written after the data it describes, so metadata
+                # newer than the file already matches it
+                check_metadata = metadata_mtime < file_stat[1]
+                tasks.append((csv_path, symbol, interval, category, file_stat[0], check_metadata))
         
-        # Validate indices
-        print("\n" + "=" * 80)
-        print("VALIDATING INDICES")
-        print("=" * 80)
+        return tasks
+    
+    def _validate_tasks(
+        self,
+        tasks: List[Tuple],
+        fix: bool,
+        executor: Optional[ProcessPoolExecutor] = None,
+        cache_enabled: bool = False
+    ):
+        """
+        Validate the files collected by _collect_tasks, under one progress bar.
         
-        if HAS_TQDM:
-            index_iterator = tqdm(all_indices, desc="Indices", unit="symbol")
+        Args:
+            tasks: Tasks from _collect_tasks, for every category
+            fix: Whether to fix issues automatically
+            executor: Process pool to validate in (None validates in this process)
+            cache_enabled: Store the results for the next run
+        """
+        if not tasks:
+            return
+        
+        if executor is not None:
+            paths, task_symbols, task_intervals, _, sizes, check_flags = zip(*tasks)
+            results = executor.map(
+                _validate_file_worker, paths, task_symbols, task_intervals, repeat(fix), sizes,
+                check_flags,
+                chunksize=max(1, len(tasks) // (self.processes * 4))
+            )
         else:
-            index_iterator = all_indices
+            results = (
+                self.validate_file(path, symbol, interval, fix, file_size, check_metadata)
+                for path, symbol, interval, _, file_size, check_metadata in tasks
+            )
         
-        for index in index_iterator:
-            # Check for missing intervals
-            missing_intervals = self.check_missing_intervals(index, 'indices')
-            
-            if missing_intervals:
-                self.results['missing_files'] += len(missing_intervals)
-                self.logger.warning(f"{index}: Missing intervals: {missing_intervals}")
+        if HAS_TQDM:
+            results = tqdm(results, total=len(tasks), desc="Validating", unit="file", mininterval=0.5)
+        
+        for (csv_path, symbol, interval, category, _, _), result in zip(tasks, results):
+            if cache_enabled:
+                self._result_cache[csv_path]['result'] = result
+            self._record_result(result, symbol, interval, category)
+    
+    def _save_result_cache(self):
+        """Write the validation results of this and earlier runs for the next run."""
+        # Unexpected errors may be transient, so those files are checked again
+        cache = {
+            path: entry for path, entry in self._result_cache.items()
+            if entry['result'] is not None
+            and not any(i['category'] == 'error' for i in entry['result']['issues'])
+        }
+        try:
+            if HAS_ORJSON:
+                self.cache_path.write_bytes(orjson.dumps(cache, default=str))
+            else:
+                with open(self.cache_path, 'w', encoding='utf-8') as f:
+                    json.dump(cache, f, ensure_ascii=False, default=str)
+        except OSError as e:
+            self.logger.warning(f"Could not save validation cache: {str(e)}")
+    
+    def _record_result(
+        self,
+        result: Dict[str, Any],
+        symbol: str,
+        interval: str,
+        category: str
+    ):
+        """Add the validation result of one file to the run totals."""
+        self.results['total_files'] += 1
+        self.results['detailed_results'].append(result)
+        
+        if result['valid'] and result['exists']:
+            self.results['valid_files'] += 1
+        elif result['issues']:
+            self.results['files_with_issues'] += 1
             
-            # Validate each interval
-            for interval in intervals:
-                symbol_dir = self.data_dir / 'indices' / index.replace('^', '_').replace('/', '_')
-                csv_path = symbol_dir / f"{interval}.csv"
-                
-                result = self.validate_file(csv_path, index, interval, fix)
-                
-                self.results['total_files'] += 1
-                self.results['detailed_results'].append(result)
-                
-                if result['valid'] and result['exists']:
-                    self.results['valid_files'] += 1
-                elif result['issues']:
-                    self.results['files_with_issues'] += 1
-                    
-                    for issue in result['issues']:
-                        category = issue['category']
-                        self.results['issues_by_type'][category] = \
-                            self.results['issues_by_type'].get(category, 0) + 1
-                
-                if result['needs_redownload']:
-                    self.results['files_needing_redownload'].append({
-                        'symbol': index,
-                        'interval': interval,
-                        'category': 'indices',
-                        'reason': [i['message'] for i in result['issues'][:3]]
-                    })
-                
-                if not result['exists']:
-                    self.results['corrupted_files'] += 1
+            # Track issues by type
+            self.results['issues_by_type'].update(issue['category'] for issue in result['issues'])
         
-        # Generate report
-        self._generate_report(fix)
+        if result['needs_redownload']:
+            self.results['files_needing_redownload'].append(RedownloadItem(
+                symbol, interval, category,
+                tuple(i['message'] for i in result['issues'][:3])  # First 3 issues
+            ))
+        
+        if not result['exists']:
+            self.results['corrupted_files'] += 1
     
     def _generate_report(self, fix: bool = False):
         """Generate comprehensive validation report."""
@@ -447,15 +801,26 @@ class DataValidationSuite:
         if self.results['files_needing_redownload']:
             print(f"\nFiles Needing Re-download ({len(self.results['files_needing_redownload'])}):")
             for item in self.results['files_needing_redownload'][:10]:  # Show first 10
-                print(f"  {item['symbol']} ({item['interval']}): {item['reason'][0] if item['reason'] else 'Unknown'}")
+                print(f"  {item.symbol} ({item.interval}): {item.reason[0] if item.reason else 'Unknown'}")
             
             if len(self.results['files_needing_redownload']) > 10:
                 print(f"  ... and {len(self.results['files_needing_redownload']) - 10} more")
         
         # Save detailed report
         report_path = self.data_dir.parent / "logs" / f"validation_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-        with open(report_path, 'w', encoding='utf-8') as f:
-            json.dump(self.results, f, indent=2, ensure_ascii=False, default=str)
+        if HAS_ORJSON:
+            # orjson writes dataclasses as objects natively
+            report_path.write_bytes(orjson.dumps(
+                self.results,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY,
+                default=str
+            ))
+        else:
+            report = dict(self.results, files_needing_redownload=[
+                asdict(item) for item in self.results['files_needing_redownload']
+            ])
+            with open(report_path, 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2, ensure_ascii=False, default=str)
         
         print(f"\nDetailed report saved to: {report_path}")
         
@@ -470,18 +835,19 @@ class DataValidationSuite:
         """Generate a script to redownload problematic files."""
         script_path = self.data_dir.parent / "logs" / "redownload_needed.sh"
         
-        with open(script_path, 'w', encoding='utf-8') as f:
-            f.write("#!/bin/bash\n")
-            f.write("# Auto-generated script to re-download problematic files\n\n")
-            
-            for item in self.results['files_needing_redownload']:
-                symbol = item['symbol']
-                interval = item['interval']
-                f.write(f"# Re-download {symbol} ({interval})\n")
-                f.write(
-                    f"python scripts/daily_update.py --symbols {symbol} "
-                    f"--intervals {interval}\n\n"
-                )
+        lines = [
+            "#!/bin/bash\n",
+            "# Auto-generated script to re-download problematic files\n\n"
+        ]
+        lines.extend(
+            f"# Re-download {item.symbol} ({item.interval})\n"
+            f"python scripts/daily_update.py --symbols {item.symbol} "
+            f"--intervals {item.interval}\n\n"
+            for item in self.results['files_needing_redownload']
+        )
+        
+        # One write for the whole script
+        script_path.write_text(''.join(lines), encoding='utf-8')
         
         # Make executable on Unix
         if os.name != 'nt':  # Not Windows
@@ -508,6 +874,18 @@ def main():
         help='Specific symbols to validate'
     )
     
+    parser.add_argument(
+        '--processes',
+        type=int,
+        help='Worker processes for file validation (default: CPU count, 0 for none)'
+    )
+    
+    parser.add_argument(
+        '--no-cache',
+        action='store_true',
+        help='Validate every file, ignoring results cached by earlier runs'
+    )
+    
     parser.add_argument(
         '--config-dir',
         default='./config',
@@ -532,7 +910,9 @@ def main():
     validator = DataValidationSuite(
         config_dir=args.config_dir,
         data_dir=args.data_dir,
-        log_dir=args.log_dir
+        log_dir=args.log_dir,
+        processes=args.processes,
+        use_cache=not args.no_cache
     )
     
     # Run validation
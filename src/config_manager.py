@@ -5,12 +5,50 @@ This module provides functionality to load, validate, and access
 configuration settings from YAML files.
 """
 
+import copy
 import os
 import logging
+import pickle
+import threading
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import yaml
 
+try:
+    # LibYAML's C parser; same safe subset, several times faster
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
+
+# Parsed configuration of earlier processes, stored in the config directory
+PARSE_CACHE_FILE = ".config_cache.pkl"
+
+# Intervals accepted by yfinance
+VALID_INTERVALS = frozenset({
+    '1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '1d', '5d', '1wk', '1mo', '3mo'
+})
+
+# Required config.yaml fields, each with an optional value check and its error
+_CONFIG_RULES: Tuple[Tuple[str, Optional[Callable[[Any], bool]], Optional[str]], ...] = (
+    ('data_dir', None, None),
+    ('log_dir', None, None),
+    ('intervals', lambda v: isinstance(v, list),
+     "'intervals' must be a list"),
+    ('max_retries', lambda v: isinstance(v, int) and v >= 0,
+     "'max_retries' must be a non-negative integer"),
+    ('retry_delay', lambda v: isinstance(v, (int, float)) and v >= 0,
+     "'retry_delay' must be a non-negative number"),
+    ('chunk_size', lambda v: isinstance(v, int) and v > 0,
+     "'chunk_size' must be a positive integer"),
+    ('validate_data', lambda v: isinstance(v, bool),
+     "'validate_data' must be a boolean"),
+    ('timezone', None, None),
+)
+
+# Parsed YAML files of this process, keyed by (resolved path, st_mtime_ns, st_size)
+_YAML_CACHE: Dict[Tuple[str, int, int], Any] = {}
+
 
 class ConfigurationError(Exception):
     """Custom exception for configuration-related errors."""
@@ -43,19 +81,51 @@ class ConfigManager:
         else:
             self.config_dir = Path(config_dir)
         
-        # Configuration storage
+        # Configuration storage; stocks/indices are loaded on first access
         self.config: Dict[str, Any] = {}
-        self.stocks: List[Dict[str, str]] = []
-        self.indices: List[Dict[str, str]] = []
+        self._stocks: Optional[List[Dict[str, str]]] = None
+        self._indices: Optional[List[Dict[str, str]]] = None
+        # Symbol lists derived from the entries above, built once per load
+        self._symbol_lists: Dict[str, List[str]] = {}
+        # Parse cache file contents, read on first use (see _load_yaml_file)
+        self._parse_cache: Optional[Dict[str, Tuple[int, int, Any]]] = None
         
         self.logger.info(f"ConfigManager initialized with config_dir: {self.config_dir}")
     
+    @property
+    def stocks(self) -> List[Dict[str, str]]:
+        """Stock entries from stocks.yaml, loaded on first access."""
+        if self._stocks is None:
+            self._stocks = self._load_symbols("stocks", "Stock")
+        return self._stocks
+    
+    @stocks.setter
+    def stocks(self, value: List[Dict[str, str]]):
+        self._stocks = value
+        self._symbol_lists.clear()
+    
+    @property
+    def indices(self) -> List[Dict[str, str]]:
+        """Index entries from indices.yaml, loaded on first access."""
+        if self._indices is None:
+            self._indices = self._load_symbols("indices", "Index")
+        return self._indices
+    
+    @indices.setter
+    def indices(self, value: List[Dict[str, str]]):
+        self._indices = value
+        self._symbol_lists.clear()
+    
     def load_config(self) -> Dict[str, Any]:
         """
-        Load all configuration files (config.yaml, stocks.yaml, indices.yaml).
+        Load and validate the main configuration file (config.yaml).
+        
+        stocks.yaml and indices.yaml are loaded (and their entries validated)
+        when the stocks/indices are first used, so callers that only need
+        settings never parse the symbol lists.
         
         Returns:
-            Dictionary containing all configuration data.
+            Dictionary containing the main configuration under "config".
             
         Raises:
             ConfigurationError: If configuration files cannot be loaded or validated.
@@ -66,36 +136,89 @@ class ConfigManager:
             self.config = self._load_yaml_file(config_file)
             self.logger.info("Main configuration loaded successfully")
             
-            # Load stocks configuration
-            stocks_file = self.config_dir / "stocks.yaml"
-            stocks_data = self._load_yaml_file(stocks_file)
-            self.stocks = stocks_data.get("stocks", [])
-            self.logger.info(f"Loaded {len(self.stocks)} stock symbols")
-            
-            # Load indices configuration
-            indices_file = self.config_dir / "indices.yaml"
-            indices_data = self._load_yaml_file(indices_file)
-            self.indices = indices_data.get("indices", [])
-            self.logger.info(f"Loaded {len(self.indices)} index symbols")
+            # Symbol lists of an earlier load are re-read on next use
+            self._stocks = None
+            self._indices = None
+            self._symbol_lists.clear()
             
             # Validate configuration
-            self.validate_config()
+            self.validate_config(include_symbols=False)
             
-            return {
-                "config": self.config,
-                "stocks": self.stocks,
-                "indices": self.indices
-            }
+            return {"config": self.config}
             
         except Exception as e:
             error_msg = f"Failed to load configuration: {str(e)}"
             self.logger.error(error_msg)
             raise ConfigurationError(error_msg) from e
     
+    def _load_symbols(self, key: str, label: str) -> List[Dict[str, str]]:
+        """
+        Load and validate the symbol entries of stocks.yaml or indices.yaml.
+        
+        Args:
+            key: File stem and top-level key ('stocks' or 'indices')
+            label: Entry name used in messages ('Stock' or 'Index')
+            
+        Returns:
+            List of entry dictionaries
+            
+        Raises:
+            ConfigurationError: If the file cannot be loaded or an entry has no symbol
+        """
+        entries = self._load_yaml_file(self.config_dir / f"{key}.yaml").get(key, [])
+        self.logger.info(f"Loaded {len(entries)} {label.lower()} symbols")
+        
+        for idx, entry in enumerate(entries):
+            if 'symbol' not in entry:
+                raise ConfigurationError(f"{label} at index {idx} missing 'symbol' field")
+        
+        return entries
+    
+    def _cached_parse(self, file_path: Path, st: os.stat_result) -> Optional[Any]:
+        """
+        Get a file's parsed contents saved by an earlier process, if still current.
+        
+        Args:
+            file_path: Path to the YAML file
+            st: The file's current stat result
+            
+        Returns:
+            Parsed data, or None if not cached or the file changed since
+        """
+        if self._parse_cache is None:
+            try:
+                # Written by _store_parse; as trusted as the YAML files next to it
+                with open(self.config_dir / PARSE_CACHE_FILE, 'rb') as f:
+                    self._parse_cache = pickle.load(f)
+            except FileNotFoundError:
+                self._parse_cache = {}
+            except Exception as e:
+                self.logger.debug(f"Ignoring unreadable parse cache: {str(e)}")
+                self._parse_cache = {}
+        
+        entry = self._parse_cache.get(file_path.name)
+        if entry is not None and entry[:2] == (st.st_mtime_ns, st.st_size):
+            return entry[2]
+        return None
+    
+    def _store_parse(self, file_path: Path, st: os.stat_result, data: Any):
+        """Save a file's parsed contents for the next process (best effort)."""
+        self._parse_cache[file_path.name] = (st.st_mtime_ns, st.st_size, data)
+        try:
+            with open(self.config_dir / PARSE_CACHE_FILE, 'wb') as f:
+                pickle.dump(self._parse_cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        except OSError as e:
+            # e.g. a read-only config directory; the YAML is simply parsed next time
+            self.logger.debug(f"Could not save parse cache: {str(e)}")
+    
     def _load_yaml_file(self, file_path: Path) -> Dict[str, Any]:
         """
         Load a YAML file and return its contents.
         
+        Each file is parsed once while it is unchanged: later loads in this
+        process get a copy of the memoized result, and later processes read
+        it from the parse cache file in the config directory.
+        
         Args:
             file_path: Path to the YAML file.
             
@@ -105,17 +228,31 @@ class ConfigManager:
         Raises:
             ConfigurationError: If file doesn't exist or cannot be parsed.
         """
-        if not file_path.exists():
+        try:
+            st = file_path.stat()
+        except FileNotFoundError:
             raise ConfigurationError(f"Configuration file not found: {file_path}")
         
+        key = (str(file_path.resolve()), st.st_mtime_ns, st.st_size)
+        cached = _YAML_CACHE.get(key)
+        if cached is None:
+            cached = self._cached_parse(file_path, st)
+            if cached is not None:
+                _YAML_CACHE[key] = cached
+        if cached is not None:
+            # Callers may modify what they get, so the cache keeps its own copy
+            return copy.deepcopy(cached)
+        
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=_YamlLoader)
                 
             if data is None:
                 raise ConfigurationError(f"Empty configuration file: {file_path}")
                 
-            self.logger.debug(f"Loaded YAML file: {file_path}")
+            self.logger.debug(f"Loaded YAML file: {file_path} (loader={_YamlLoader.__name__})")
+            _YAML_CACHE[key] = copy.deepcopy(data)
+            self._store_parse(file_path, st, _YAML_CACHE[key])
             return data
             
         except yaml.YAMLError as e:
@@ -123,10 +260,13 @@ class ConfigManager:
         except Exception as e:
             raise ConfigurationError(f"Error reading {file_path}: {str(e)}") from e
     
-    def validate_config(self) -> bool:
+    def validate_config(self, include_symbols: bool = True) -> bool:
         """
         Validate the loaded configuration.
         
+        Args:
+            include_symbols: Also load and validate stocks.yaml and indices.yaml
+            
         Returns:
             True if configuration is valid.
             
@@ -135,78 +275,69 @@ class ConfigManager:
         """
         self.logger.info("Validating configuration...")
         
-        # Validate main config
-        required_main_fields = ['data_dir', 'log_dir', 'intervals', 'max_retries', 
-                                'retry_delay', 'chunk_size', 'validate_data', 'timezone']
-        
-        for field in required_main_fields:
+        # Validate main config: every required field first, then the values
+        for field, _, _ in _CONFIG_RULES:
             if field not in self.config:
                 raise ConfigurationError(f"Missing required field in config.yaml: {field}")
         
-        # Validate data types
-        if not isinstance(self.config['intervals'], list):
-            raise ConfigurationError("'intervals' must be a list")
-        
-        if not isinstance(self.config['max_retries'], int) or self.config['max_retries'] < 0:
-            raise ConfigurationError("'max_retries' must be a non-negative integer")
-        
-        if not isinstance(self.config['retry_delay'], (int, float)) or self.config['retry_delay'] < 0:
-            raise ConfigurationError("'retry_delay' must be a non-negative number")
-        
-        if not isinstance(self.config['chunk_size'], int) or self.config['chunk_size'] <= 0:
-            raise ConfigurationError("'chunk_size' must be a positive integer")
-        
-        if not isinstance(self.config['validate_data'], bool):
-            raise ConfigurationError("'validate_data' must be a boolean")
+        for field, check, error in _CONFIG_RULES:
+            if check is not None and not check(self.config[field]):
+                raise ConfigurationError(error)
         
         # Validate intervals
-        valid_intervals = ['1m', '2m', '5m', '15m', '30m', '60m', '90m', '1h', '1d', '5d', '1wk', '1mo', '3mo']
         for interval in self.config['intervals']:
-            if interval not in valid_intervals:
+            if interval not in VALID_INTERVALS:
                 self.logger.warning(f"Interval '{interval}' may not be supported by yfinance")
         
-        # Validate stocks
-        if not self.stocks:
-            self.logger.warning("No stocks configured in stocks.yaml")
-        else:
-            for idx, stock in enumerate(self.stocks):
-                if 'symbol' not in stock:
-                    raise ConfigurationError(f"Stock at index {idx} missing 'symbol' field")
+        # Validate optional storage format
+        storage_format = self.config.get('storage_format', 'csv')
+        if storage_format not in ('csv', 'parquet'):
+            raise ConfigurationError("'storage_format' must be 'csv' or 'parquet'")
         
-        # Validate indices
-        if not self.indices:
-            self.logger.warning("No indices configured in indices.yaml")
-        else:
-            for idx, index in enumerate(self.indices):
-                if 'symbol' not in index:
-                    raise ConfigurationError(f"Index at index {idx} missing 'symbol' field")
+        if include_symbols:
+            # Entries are checked for a symbol as the files are loaded
+            if not self.stocks:
+                self.logger.warning("No stocks configured in stocks.yaml")
+            if not self.indices:
+                self.logger.warning("No indices configured in indices.yaml")
         
         self.logger.info("Configuration validation successful")
         return True
     
+    def _symbols(self, key: str) -> List[str]:
+        """Get the cached symbol list of 'stocks' or 'indices', building it on first use."""
+        symbols = self._symbol_lists.get(key)
+        if symbols is None:
+            entries = self.stocks if key == 'stocks' else self.indices
+            symbols = [entry['symbol'] for entry in entries if 'symbol' in entry]
+            self._symbol_lists[key] = symbols
+        return symbols
+    
     def get_stock_list(self) -> List[str]:
         """
         Get list of stock symbols.
         
         Returns:
-            List of stock symbols (e.g., ['RELIANCE.NS', 'TCS.NS', ...])
+            List of stock symbols (e.g., ['RELIANCE.NS', 'TCS.NS', ...]);
+            a copy, so callers may modify it
         """
         if not self.stocks:
             self.logger.warning("Stock list is empty. Have you called load_config()?")
         
-        return [stock['symbol'] for stock in self.stocks if 'symbol' in stock]
+        return list(self._symbols('stocks'))
     
     def get_indices_list(self) -> List[str]:
         """
         Get list of index symbols.
         
         Returns:
-            List of index symbols (e.g., ['^NSEI', '^NSEBANK', ...])
+            List of index symbols (e.g., ['^NSEI', '^NSEBANK', ...]);
+            a copy, so callers may modify it
         """
         if not self.indices:
             self.logger.warning("Indices list is empty. Have you called load_config()?")
         
-        return [index['symbol'] for index in self.indices if 'symbol' in index]
+        return list(self._symbols('indices'))
     
     def get_intervals(self) -> List[str]:
         """
@@ -254,6 +385,10 @@ class ConfigManager:
         """Get the chunk size for batch processing."""
         return self.config.get('chunk_size', 10)
     
+    def get_storage_format(self) -> str:
+        """Get the on-disk storage format for market data ('csv' or 'parquet')."""
+        return self.config.get('storage_format', 'csv')
+    
     def should_validate_data(self) -> bool:
         """Check if data validation is enabled."""
         return self.config.get('validate_data', True)
@@ -265,7 +400,10 @@ class ConfigManager:
         Returns:
             List of all symbols (stocks + indices)
         """
-        return self.get_stock_list() + self.get_indices_list()
+        all_symbols = self._symbol_lists.get('all')
+        if all_symbols is None:
+            all_symbols = self._symbol_lists['all'] = self.get_stock_list() + self.get_indices_list()
+        return list(all_symbols)
     
     def get_stocks_by_sector(self, sector: str) -> List[Dict[str, str]]:
         """
@@ -283,11 +421,12 @@ class ConfigManager:
     def __repr__(self) -> str:
         """String representation of ConfigManager."""
         return (f"ConfigManager(config_dir='{self.config_dir}', "
-                f"stocks={len(self.stocks)}, indices={len(self.indices)})")
+                f"stocks={len(self._stocks or [])}, indices={len(self._indices or [])})")
 
 
 # Singleton instance for easy access
 _config_manager_instance: Optional[ConfigManager] = None
+_config_manager_lock = threading.Lock()
 
 
 def get_config_manager(config_dir: Optional[str] = None) -> ConfigManager:
@@ -303,8 +442,13 @@ def get_config_manager(config_dir: Optional[str] = None) -> ConfigManager:
     global _config_manager_instance
     
     if _config_manager_instance is None:
-        _config_manager_instance = ConfigManager(config_dir)
-        _config_manager_instance.load_config()
+        # Threads racing on first use would each load the config; only the
+        # first one does, and the instance is published fully loaded
+        with _config_manager_lock:
+            if _config_manager_instance is None:
+                config_manager = ConfigManager(config_dir)
+                config_manager.load_config()
+                _config_manager_instance = config_manager
     
     return _config_manager_instance
 
@@ -5,20 +5,149 @@ This module handles downloading market data from Yahoo Finance
 with proper API limit handling and rate limiting.
 """
 
+import functools
 import logging
+import random
+import re
+import threading
 import time
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from typing import Optional, Dict, Any
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from dateutil import parser
 
+try:
+    from curl_cffi import requests as curl_requests
+    HAS_CURL_CFFI = True
+except ImportError:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_CURL_CFFI = False
+
+
+def _yfinance():
+    """
+    Import yfinance on first use.
+    
+    yfinance (and the HTTP stack it pulls in) is the slowest import of the
+    pipeline, yet runs that only skip cached files or use the chart API
+    never call it. Importing it lazily keeps their startup fast.
+    """
+    global yf
+    if 'yf' not in globals():
+        import yfinance
+        yf = yfinance
+    return yf
+
+
+def __getattr__(name: str):
+    """Resolve the module attribute ``yf`` lazily (e.g. for mock.patch)."""
+    if name == 'yf':
+        return _yfinance()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# Period strings such as '7d', '1wk', '2mo' or '1y', and the days per unit
+_PERIOD_RE = re.compile(r'^(\d+)(d|wk|mo|y)$')
+_UNIT_DAYS = {'d': 1, 'wk': 7, 'mo': 30, 'y': 365}
+
+
+@functools.lru_cache(maxsize=256)
+def _period_to_days(period: str) -> Optional[int]:
+    """
+    Convert a period string (e.g. '7d', '2mo', '1y') to days.
+    
+    Periods come from a small fixed set, so the parse is cached.
+    
+    Args:
+        period: Period string
+        
+    Returns:
+        Number of days, or None if the period cannot be parsed
+    """
+    match = _PERIOD_RE.match(period)
+    if match is None:
+        return None
+    return int(match[1]) * _UNIT_DAYS[match[2]]
+
 
 class DataFetchError(Exception):
     """Custom exception for data fetching errors."""
     pass
 
 
+class PermanentFetchError(DataFetchError):
+    """Fetch failure that retrying cannot fix (unknown symbol, bad period)."""
+    pass
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket shared by every fetcher that talks to Yahoo.
+    
+    Tokens refill at ``rate`` per second up to ``burst``; each request takes
+    one. Callers reserve their token under a lock and sleep outside it, so
+    concurrent workers are spaced fairly instead of racing for the bucket.
+    A throttled response can ``pause`` the bucket until the server's
+    Retry-After has elapsed.
+    """
+    
+    def __init__(self, rate: float, burst: int = 1):
+        """
+        Initialize the RateLimiter.
+        
+        Args:
+            rate: Requests per second (0 disables limiting)
+            burst: Requests allowed back to back once the bucket is full
+        """
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+    
+    @classmethod
+    def from_delay(cls, delay: float, burst: int = 1) -> 'RateLimiter':
+        """Build a limiter equivalent to waiting ``delay`` seconds per request."""
+        return cls(1.0 / delay if delay > 0 else 0.0, burst)
+    
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until it is available.
+        
+        Returns:
+            Seconds spent waiting
+        """
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._paused_until - now)
+            if self.rate > 0:
+                self._tokens = min(
+                    self.burst, self._tokens + (now - self._last_refill) * self.rate
+                )
+                self._last_refill = now
+                self._tokens -= 1
+                if self._tokens < 0:
+                    wait = max(wait, -self._tokens / self.rate)
+        
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+    
+    def pause(self, seconds: float):
+        """
+        Hold back every caller for ``seconds`` (e.g. from a Retry-After header).
+        
+        The bucket is drained as well, so requests resume one token at a
+        time rather than as a burst straight after the pause.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = min(self._tokens, 0.0)
+
+
 class DataFetcher:
     """
     Fetches market data from Yahoo Finance with rate limiting and error handling.
@@ -47,7 +176,28 @@ class DataFetcher:
         '3mo': None
     }
     
-    def __init__(self, rate_limit_delay: float = 0.5, max_retries: int = 3, retry_delay: int = 5):
+    # Intervals without a period limit
+    UNLIMITED_INTERVALS = frozenset(
+        interval for interval, days in INTERVAL_LIMITS.items() if days is None
+    )
+    
+    # Yahoo Finance chart endpoint used when use_chart_api is enabled
+    CHART_URL = "https://query2.finance.yahoo.com/v8/finance/chart/{symbol}"
+    
+    # Chart API sessions, one per thread and shared by all DataFetcher instances
+    _thread_local = threading.local()
+    
+    # Upper bound for one retry backoff, in seconds
+    MAX_RETRY_DELAY = 60.0
+    
+    def __init__(
+        self,
+        rate_limit_delay: float = 0.5,
+        max_retries: int = 3,
+        retry_delay: int = 5,
+        use_chart_api: bool = False,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
         """
         Initialize the DataFetcher.
         
@@ -55,29 +205,86 @@ class DataFetcher:
             rate_limit_delay: Delay between API calls in seconds (default: 0.5)
             max_retries: Maximum number of retry attempts (default: 3)
             retry_delay: Delay between retries in seconds (default: 5)
+            use_chart_api: Query Yahoo's chart API directly instead of going
+                           through yfinance's Ticker.history (default: False)
+            rate_limiter: Token bucket shared with other fetchers; when omitted
+                          one is built from rate_limit_delay with no burst
         """
         self.logger = logging.getLogger(__name__)
         self.rate_limit_delay = rate_limit_delay
         self.max_retries = max_retries
         self.retry_delay = retry_delay
-        self.last_request_time = 0
+        self.use_chart_api = use_chart_api
+        self.rate_limiter = rate_limiter or RateLimiter.from_delay(rate_limit_delay)
         
         self.logger.info(
-            f"DataFetcher initialized (rate_limit={rate_limit_delay}s, "
-            f"max_retries={max_retries}, retry_delay={retry_delay}s)"
+            f"DataFetcher initialized (rate={self.rate_limiter.rate:g}/s, "
+            f"burst={self.rate_limiter.burst}, "
+            f"max_retries={max_retries}, retry_delay={retry_delay}s, "
+            f"chart_api={use_chart_api})"
         )
     
     def _apply_rate_limit(self):
-        """Apply rate limiting between API requests."""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
+        """
+        Apply rate limiting between API requests.
         
-        if elapsed < self.rate_limit_delay:
-            sleep_time = self.rate_limit_delay - elapsed
-            self.logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-            time.sleep(sleep_time)
+        Safe to call from multiple threads; the wait comes from the shared
+        RateLimiter token bucket.
+        """
+        sleep_time = self.rate_limiter.acquire()
+        if sleep_time > 0:
+            self.logger.debug(f"Rate limiting: slept for {sleep_time:.2f}s")
+    
+    def _retry_after(self, value: Optional[str]) -> float:
+        """
+        Parse a Retry-After header into seconds.
         
-        self.last_request_time = time.time()
+        Args:
+            value: Header value, either delta-seconds or an HTTP date
+            
+        Returns:
+            Seconds to wait (retry_delay when the header is missing or invalid)
+        """
+        if value:
+            try:
+                return max(0.0, float(value))
+            except ValueError:
+                try:
+                    retry_at = parser.parse(value)
+                    return max(0.0, retry_at.timestamp() - time.time())
+                except (ValueError, OverflowError):
+                    pass
+        return float(self.retry_delay)
+    
+    def _backoff_delay(self, attempt: int) -> float:
+        """
+        Seconds to wait after a failed attempt.
+        
+        Exponential in the attempt number with full jitter (a uniform draw
+        from [0, backoff]), so workers that fail together do not all retry
+        at the same instant.
+        
+        Args:
+            attempt: Number of the attempt that failed, starting at 1
+            
+        Returns:
+            Delay in seconds
+        """
+        backoff = min(self.retry_delay * 2 ** (attempt - 1), self.MAX_RETRY_DELAY)
+        return random.uniform(0, backoff)
+    
+    def _yfinance_errors(self) -> tuple:
+        """
+        Get the yfinance exceptions that need special handling on retry.
+        
+        Returns:
+            Tuple of (permanent errors, rate limit error); empty and None
+            when using the chart API, so yfinance is not imported for it
+        """
+        if self.use_chart_api:
+            return (), None
+        errors = _yfinance().exceptions
+        return (errors.YFInvalidPeriodError, errors.YFTickerMissingError), errors.YFRateLimitError
     
     def get_max_period(self, interval: str) -> Optional[int]:
         """
@@ -102,33 +309,26 @@ class DataFetcher:
         Returns:
             True if valid, False otherwise.
         """
-        max_days = self.get_max_period(interval)
+        # If no limit, any period is valid
+        if interval in self.UNLIMITED_INTERVALS:
+            return True
         
-        # If no limit (None), any period is valid
+        max_days = self.get_max_period(interval)
         if max_days is None:
+            # Unknown interval; leave it to the API
             return True
         
-        # Special case for "max"
+        # "max" always exceeds a limit
         if period == "max":
-            return max_days is None
+            return False
         
         # Parse period string (e.g., '7d', '2mo', '1y')
-        try:
-            if period.endswith('d'):
-                requested_days = int(period[:-1])
-            elif period.endswith('mo'):
-                requested_days = int(period[:-2]) * 30
-            elif period.endswith('y'):
-                requested_days = int(period[:-1]) * 365
-            else:
-                self.logger.warning(f"Unknown period format: {period}")
-                return False
-            
-            return requested_days <= max_days
-            
-        except (ValueError, IndexError):
+        requested_days = _period_to_days(period)
+        if requested_days is None:
             self.logger.error(f"Invalid period format: {period}")
             return False
+        
+        return requested_days <= max_days
     
     def _adjust_period(self, interval: str, period: str) -> str:
         """
@@ -141,38 +341,31 @@ class DataFetcher:
         Returns:
             Adjusted period string that fits within limits.
         """
-        max_days = self.get_max_period(interval)
+        if interval in self.UNLIMITED_INTERVALS:
+            # No limit, return original
+            return period
         
+        max_days = self.get_max_period(interval)
         if max_days is None:
-            # No limit, return original or 'max'
-            return period if period != 'max' else 'max'
+            return period
         
         # Parse requested period
         if period == 'max':
             return f"{max_days}d"
         
-        try:
-            if period.endswith('d'):
-                requested_days = int(period[:-1])
-            elif period.endswith('mo'):
-                requested_days = int(period[:-2]) * 30
-            elif period.endswith('y'):
-                requested_days = int(period[:-1]) * 365
-            else:
-                requested_days = max_days
-            
-            if requested_days > max_days:
-                self.logger.warning(
-                    f"Period {period} exceeds limit for {interval}. "
-                    f"Adjusting to {max_days}d"
-                )
-                return f"{max_days}d"
-            
-            return period
-            
-        except (ValueError, IndexError):
+        requested_days = _period_to_days(period)
+        if requested_days is None:
             self.logger.error(f"Invalid period format: {period}, using max: {max_days}d")
             return f"{max_days}d"
+        
+        if requested_days > max_days:
+            self.logger.warning(
+                f"Period {period} exceeds limit for {interval}. "
+                f"Adjusting to {max_days}d"
+            )
+            return f"{max_days}d"
+        
+        return period
     
     def fetch_data(
         self, 
@@ -211,31 +404,41 @@ class DataFetcher:
                 # Apply rate limiting
                 self._apply_rate_limit()
                 
-                # Create ticker object
-                ticker = yf.Ticker(symbol)
-                
                 # Fetch data
-                if start_date and end_date:
-                    self.logger.debug(f"Fetching with date range: {start_date} to {end_date}")
-                    df = ticker.history(
-                        interval=interval,
-                        start=start_date,
-                        end=end_date
-                    )
-                elif start_date:
-                    self.logger.debug(f"Fetching from {start_date}")
-                    df = ticker.history(
-                        interval=interval,
-                        start=start_date
+                if self.use_chart_api:
+                    df = self._fetch_chart(
+                        symbol, interval,
+                        period=None if start_date else adjusted_period,
+                        start_date=start_date,
+                        end_date=end_date
                     )
                 else:
-                    self.logger.debug(f"Fetching with period: {adjusted_period}")
-                    df = ticker.history(
-                        interval=interval,
-                        period=adjusted_period
-                    )
+                    # Create ticker object. yf.download() with many tickers is
+                    # no cheaper: it issues one history request per ticker too
+                    ticker = _yfinance().Ticker(symbol)
+                    
+                    if start_date and end_date:
+                        self.logger.debug(f"Fetching with date range: {start_date} to {end_date}")
+                        df = ticker.history(
+                            interval=interval,
+                            start=start_date,
+                            end=end_date
+                        )
+                    elif start_date:
+                        self.logger.debug(f"Fetching from {start_date}")
+                        df = ticker.history(
+                            interval=interval,
+                            start=start_date
+                        )
+                    else:
+                        self.logger.debug(f"Fetching with period: {adjusted_period}")
+                        df = ticker.history(
+                            interval=interval,
+                            period=adjusted_period
+                        )
                 
-                # Check if data was returned
+                # Check if data was returned. yfinance also returns an empty
+                # frame for transient failures, so this is retried
                 if df is None or df.empty:
                     raise DataFetchError(f"No data returned for {symbol}")
                 
@@ -244,8 +447,11 @@ class DataFetcher:
                     f"(attempt {attempt}/{self.max_retries})"
                 )
                 
-                # Add symbol column
-                df['Symbol'] = symbol
+                # Add symbol column: one category and int8 codes rather
+                # than a Python string reference per row
+                df['Symbol'] = pd.Categorical.from_codes(
+                    np.zeros(len(df), dtype=np.int8), categories=[symbol]
+                )
                 
                 return df
                 
@@ -254,9 +460,23 @@ class DataFetcher:
                     f"Attempt {attempt}/{self.max_retries} failed for {symbol}: {str(e)}"
                 )
                 
+                permanent_errors, rate_limit_error = self._yfinance_errors()
+                if isinstance(e, PermanentFetchError):
+                    raise
+                if isinstance(e, permanent_errors):
+                    # Retrying a bad symbol or period cannot succeed
+                    error_msg = f"Failed to fetch data for {symbol}: {str(e)}"
+                    self.logger.error(error_msg)
+                    raise PermanentFetchError(error_msg) from e
+                
                 if attempt < self.max_retries:
-                    self.logger.info(f"Retrying in {self.retry_delay} seconds...")
-                    time.sleep(self.retry_delay)
+                    delay = self._backoff_delay(attempt)
+                    self.logger.info(f"Retrying in {delay:.1f} seconds...")
+                    if rate_limit_error is not None and isinstance(e, rate_limit_error):
+                        # Hold back every worker; the next acquire() waits it out
+                        self.rate_limiter.pause(delay)
+                    else:
+                        time.sleep(delay)
                 else:
                     error_msg = f"Failed to fetch data for {symbol} after {self.max_retries} attempts"
                     self.logger.error(error_msg)
@@ -265,6 +485,143 @@ class DataFetcher:
         # Should never reach here, but just in case
         raise DataFetchError(f"Failed to fetch data for {symbol}")
     
+    def _get_session(self):
+        """
+        Get this thread's HTTP session for chart API requests.
+        
+        Sessions keep connections alive between requests but are not safe to
+        share between threads, so each worker thread gets its own; the
+        sessions live at class level so every DataFetcher in the process
+        reuses them. (The yfinance path needs nothing similar: yfinance
+        already routes all Tickers through one process-wide session, and
+        passing our own per call would swap that global session.)
+        """
+        session = getattr(self._thread_local, 'session', None)
+        if session is None:
+            if HAS_CURL_CFFI:
+                # Same browser impersonation yfinance uses to avoid being blocked
+                session = curl_requests.Session(impersonate="chrome")
+            else:
+                session = requests.Session()
+                session.headers['User-Agent'] = 'Mozilla/5.0'
+                # fetch_data owns retries; don't let urllib3 retry underneath it
+                session.mount('https://', HTTPAdapter(max_retries=0))
+            self._thread_local.session = session
+        return session
+    
+    def _fetch_chart(
+        self,
+        symbol: str,
+        interval: str,
+        period: Optional[str] = None,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None
+    ) -> pd.DataFrame:
+        """
+        Fetch OHLCV data straight from the Yahoo chart API.
+        
+        Produces the same shape as Ticker.history(auto_adjust=True): OHLCV plus
+        Dividends and Stock Splits, indexed in the exchange timezone (daily and
+        coarser bars normalized to midnight). Dates are interpreted as UTC
+        midnight, which falls outside trading hours for Asian, European and
+        US exchanges.
+        
+        Args:
+            symbol: Stock/Index symbol
+            interval: Time interval
+            period: Period string passed as the chart 'range' (ignored if start_date)
+            start_date: Optional start date (YYYY-MM-DD)
+            end_date: Optional end date (YYYY-MM-DD), exclusive
+            
+        Returns:
+            pandas DataFrame with OHLCV data (empty if no bars)
+            
+        Raises:
+            DataFetchError: If the request fails or Yahoo returns an error
+        """
+        params = {'interval': interval, 'events': 'div,splits', 'includePrePost': 'false'}
+        if start_date:
+            def to_epoch(date_str: str) -> int:
+                dt = datetime.strptime(date_str, '%Y-%m-%d').replace(tzinfo=timezone.utc)
+                return int(dt.timestamp())
+            
+            params['period1'] = to_epoch(start_date)
+            params['period2'] = to_epoch(end_date) if end_date else int(time.time())
+        else:
+            params['range'] = period or 'max'
+        
+        response = self._get_session().get(
+            self.CHART_URL.format(symbol=symbol), params=params, timeout=30
+        )
+        if response.status_code == 429:
+            retry_after = self._retry_after(response.headers.get('Retry-After'))
+            self.rate_limiter.pause(retry_after)
+            raise DataFetchError(
+                f"Chart API rate limited {symbol}, backing off {retry_after:g}s"
+            )
+        if response.status_code != 200:
+            raise DataFetchError(f"Chart API returned HTTP {response.status_code} for {symbol}")
+        
+        chart = response.json().get('chart', {})
+        if chart.get('error'):
+            error = chart['error']
+            description = error.get('description', '') if isinstance(error, dict) else str(error)
+            if 'No data found' in description:
+                # Unknown or delisted symbol; asking again cannot help
+                raise PermanentFetchError(f"Chart API error for {symbol}: {error}")
+            raise DataFetchError(f"Chart API error for {symbol}: {error}")
+        
+        result = (chart.get('result') or [None])[0]
+        if not result or not result.get('timestamp'):
+            return pd.DataFrame()
+        
+        tz = result['meta'].get('exchangeTimezoneName', 'UTC')
+        quote = result['indicators']['quote'][0]
+        index = pd.to_datetime(result['timestamp'], unit='s', utc=True).tz_convert(tz)
+        
+        df = pd.DataFrame({
+            'Open': quote.get('open'),
+            'High': quote.get('high'),
+            'Low': quote.get('low'),
+            'Close': quote.get('close'),
+            'Volume': quote.get('volume'),
+        }, index=index, dtype='float64')
+        
+        # Adjust OHLC for splits/dividends like auto_adjust=True
+        adjclose = result['indicators'].get('adjclose')
+        if adjclose:
+            ratio = np.asarray(adjclose[0]['adjclose'], dtype='float64') / df['Close'].to_numpy()
+            for col in ['Open', 'High', 'Low']:
+                df[col] = df[col] * ratio
+            df['Close'] = np.asarray(adjclose[0]['adjclose'], dtype='float64')
+        
+        if interval[-1] in ('m', 'h'):
+            df.index.name = 'Datetime'
+        else:
+            df.index = pd.to_datetime(df.index.date).tz_localize(
+                tz, ambiguous=True, nonexistent='shift_forward'
+            )
+            df.index.name = 'Date'
+        
+        df = df.dropna(subset=['Open', 'High', 'Low', 'Close'], how='all')
+        df['Volume'] = df['Volume'].fillna(0).astype('int64')
+        
+        events = result.get('events', {})
+        df['Dividends'] = 0.0
+        df['Stock Splits'] = 0.0
+        for key, column, value in [
+            ('dividends', 'Dividends', lambda e: e['amount']),
+            ('splits', 'Stock Splits', lambda e: e['numerator'] / e['denominator']),
+        ]:
+            for event in events.get(key, {}).values():
+                ts = pd.Timestamp(event['date'], unit='s', tz='UTC').tz_convert(tz)
+                if df.index.name == 'Date':
+                    ts = ts.normalize()
+                if ts in df.index:
+                    df.loc[ts, column] = value(event)
+        
+        return df
+    
     def fetch_incremental(
         self, 
         symbol: str, 
@@ -290,7 +647,11 @@ class DataFetcher:
         try:
             # Parse last_date
             if isinstance(last_date, str):
-                last_dt = parser.parse(last_date)
+                # The pipeline writes ISO dates; dateutil only for anything else
+                try:
+                    last_dt = datetime.fromisoformat(last_date)
+                except ValueError:
+                    last_dt = parser.parse(last_date)
             else:
                 last_dt = last_date
             
@@ -342,25 +703,31 @@ class DataFetcher:
             self.logger.warning(f"Validation failed: Missing columns {missing_columns}")
             return False
         
-        # Check for null values in critical columns
-        null_counts = df[required_columns].isnull().sum()
-        if null_counts.any():
-            self.logger.warning(f"Validation warning: Null values found:\n{null_counts[null_counts > 0]}")
+        # Cheapest checks first so bad frames fail fast
+        # Check High >= Low (NaN compares False, as in pandas)
+        high = df['High'].to_numpy(dtype=np.float64, na_value=np.nan)
+        low = df['Low'].to_numpy(dtype=np.float64, na_value=np.nan)
+        if (high < low).any():
+            self.logger.warning("Validation failed: High < Low in some rows")
+            return False
         
-        # Check for negative prices or volumes
-        for col in ['Open', 'High', 'Low', 'Close']:
-            if (df[col] < 0).any():
+        # Check for negative prices or volumes in one float64 block
+        values = df[required_columns].to_numpy(dtype=np.float64, na_value=np.nan)
+        negative = (values < 0).any(axis=0)
+        if negative.any():
+            col = required_columns[np.flatnonzero(negative)[0]]
+            if col == 'Volume':
+                self.logger.warning("Validation failed: Negative volume values")
+            else:
                 self.logger.warning(f"Validation failed: Negative values in {col}")
-                return False
-        
-        if (df['Volume'] < 0).any():
-            self.logger.warning("Validation failed: Negative volume values")
             return False
         
-        # Check High >= Low
-        if (df['High'] < df['Low']).any():
-            self.logger.warning("Validation failed: High < Low in some rows")
-            return False
+        # Null values are not a failure: yfinance emits NaN bars on holidays
+        if self.logger.isEnabledFor(logging.DEBUG):
+            null_counts = np.isnan(values).sum(axis=0)
+            if null_counts.any():
+                null_counts = pd.Series(null_counts, index=required_columns)
+                self.logger.debug(f"Validation: Null values found:\n{null_counts[null_counts > 0]}")
         
         self.logger.debug(f"Data validation passed for {len(df)} rows")
         return True
@@ -377,7 +744,7 @@ class DataFetcher:
         """
         try:
             self._apply_rate_limit()
-            ticker = yf.Ticker(symbol)
+            ticker = _yfinance().Ticker(symbol)
             info = ticker.info
             self.logger.debug(f"Retrieved info for {symbol}")
             return info
@@ -1,17 +1,60 @@
 """
 Data Merger for Market Data Pipeline
 
-This module handles merging new data with existing CSV files,
+This module handles merging new data with existing CSV (or Parquet) files,
 maintaining data integrity and creating backups.
 """
 
+import io
 import logging
+import os
 import shutil
 from pathlib import Path
-from datetime import datetime
-from typing import Optional, Tuple
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple, Union
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+# File extension used for each supported storage format
+STORAGE_EXTENSIONS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+}
+
+
+# Yahoo serves prices at single precision; as float64 they only carry binary
+# noise (2456.35 arrives as 2456.35009765625). Fetched prices are narrowed to
+# these dtypes before they are validated and saved, so data files hold the
+# shortest float32 repr, i.e. the quoted price. Files are loaded with them
+# before merging, so the merged frame does not widen the new rows again.
+PRICE_DTYPES = {col: 'float32' for col in ('Open', 'High', 'Low', 'Close')}
+
+
+# Single precision OHLCV dtypes for read-only passes such as validation;
+# halves the memory each column scan touches. Not for data that is saved
+# back: unlike the prices (see PRICE_DTYPES), Volume can exceed the range
+# of integers float32 holds exactly.
+OHLCV_FLOAT32 = {col: 'float32' for col in ('Open', 'High', 'Low', 'Close', 'Volume')}
+
+
+# Parquet sidecar metadata key holding the "st_mtime_ns:st_size" of the CSV
+# file it was built from
+CACHE_SOURCE_KEY = b'source_stat'
+
+
+# Buffer size for CSV writes; pandas writes in small chunks and the default
+# 8KB buffer turns a large file into thousands of write() calls
+WRITE_BUFFER_SIZE = 1 << 20
+
 
 class MergeError(Exception):
     """Custom exception for data merging errors."""
@@ -30,31 +73,70 @@ class DataMerger:
     - Data validation
     """
     
-    def __init__(self, backup_enabled: bool = True, backup_dir: Optional[str] = None):
+    def __init__(
+        self,
+        backup_enabled: bool = True,
+        backup_dir: Optional[str] = None,
+        storage_format: str = 'csv'
+    ):
         """
         Initialize the DataMerger.
         
         Args:
             backup_enabled: Whether to create backups before overwriting
             backup_dir: Directory for backups (default: same dir as original with .bak extension)
+            storage_format: On-disk format for new files, 'csv' or 'parquet'
+            
+        Raises:
+            MergeError: If the storage format is unknown or its engine is not installed
         """
         self.logger = logging.getLogger(__name__)
         self.backup_enabled = backup_enabled
         self.backup_dir = Path(backup_dir) if backup_dir else None
         
+        if storage_format not in STORAGE_EXTENSIONS:
+            raise MergeError(f"Unsupported storage format: {storage_format}")
+        if storage_format == 'parquet' and not HAS_PYARROW:
+            raise MergeError("Parquet storage requires pyarrow (pip install pyarrow)")
+        
+        self.storage_format = storage_format
+        self.file_extension = STORAGE_EXTENSIONS[storage_format]
+        
         if self.backup_dir:
             self.backup_dir.mkdir(parents=True, exist_ok=True)
         
         self.logger.info(
-            f"DataMerger initialized (backups={'enabled' if backup_enabled else 'disabled'})"
+            f"DataMerger initialized (backups={'enabled' if backup_enabled else 'disabled'}, "
+            f"format={storage_format})"
         )
     
-    def load_existing_data(self, filepath: str) -> Optional[pd.DataFrame]:
+    @property
+    def supports_append(self) -> bool:
+        """Whether files in the configured format can be appended to in place."""
+        return self.storage_format == 'csv'
+    
+    @staticmethod
+    def _is_parquet(filepath: Path) -> bool:
+        """Check whether a path refers to a Parquet file."""
+        return filepath.suffix == STORAGE_EXTENSIONS['parquet']
+    
+    def load_existing_data(
+        self,
+        filepath: str,
+        fast: bool = False,
+        dtype: Optional[Dict[str, str]] = None
+    ) -> Optional[pd.DataFrame]:
         """
-        Load existing data from CSV file.
+        Load existing data from a CSV or Parquet file.
+        
+        The format is chosen from the file extension.
         
         Args:
-            filepath: Path to the CSV file
+            filepath: Path to the data file
+            fast: Parse CSV files with pyarrow's multithreaded reader when
+                  it is installed (see _read_csv_fast)
+            dtype: Column dtypes to load with (e.g. OHLCV_FLOAT32); columns
+                   not in the file are ignored
             
         Returns:
             DataFrame if file exists and is valid, None otherwise
@@ -70,7 +152,15 @@ class DataMerger:
             return None
         
         try:
-            df = pd.read_csv(filepath, index_col=0, parse_dates=True)
+            if self._is_parquet(filepath):
+                # Memory-mapped: columns are decoded straight from the page cache
+                df = self._cast(
+                    pd.read_parquet(filepath, engine='pyarrow', memory_map=True), dtype
+                )
+            elif fast and HAS_PYARROW:
+                df = self._read_csv_fast(filepath, dtype)
+            else:
+                df = pd.read_csv(filepath, index_col=0, parse_dates=True, dtype=dtype)
             self.logger.info(f"Loaded {len(df)} rows from {filepath}")
             
             # Ensure datetime index
@@ -84,6 +174,239 @@ class DataMerger:
             self.logger.error(f"Failed to load {filepath}: {str(e)}")
             raise MergeError(f"Error loading file: {str(e)}") from e
     
+    @staticmethod
+    def _read_csv_fast(filepath: Path, dtype: Optional[Dict[str, str]] = None) -> pd.DataFrame:
+        """
+        Read a data CSV with pyarrow, matching pd.read_csv(index_col=0, parse_dates=True).
+        
+        The timestamp column is read as text and parsed by pandas, so
+        timezone offsets come out exactly as with read_csv; the numeric
+        columns are parsed by pyarrow's multithreaded reader.
+        """
+        with open(filepath, 'r', encoding='utf-8') as f:
+            index_name = f.readline().split(',', 1)[0].strip()
+        
+        column_types = {col: pa.from_numpy_dtype(np.dtype(t)) for col, t in (dtype or {}).items()}
+        column_types[index_name] = pa.string()
+        table = pa_csv.read_csv(
+            filepath,
+            convert_options=pa_csv.ConvertOptions(column_types=column_types)
+        )
+        # The table is not used again, so let pyarrow free each column as it
+        # is converted instead of holding both copies at once
+        df = table.to_pandas(self_destruct=True)
+        del table
+        # DatetimeIndex(name=None) keeps the series' own name, so rename after
+        df.index = pd.DatetimeIndex(pd.to_datetime(df.pop(index_name))).rename(index_name or None)
+        return df
+    
+    @staticmethod
+    def cache_path(filepath: Union[str, Path]) -> Path:
+        """Get the Parquet sidecar path used to cache a CSV file's contents."""
+        filepath = Path(filepath)
+        # Hidden and suffixed with the full name, so it never shadows a data file
+        return filepath.with_name(f".{filepath.name}.parquet")
+    
+    def load_cached(
+        self,
+        filepath: str,
+        fast: bool = False,
+        dtype: Optional[Dict[str, str]] = None
+    ) -> Optional[pd.DataFrame]:
+        """
+        Load a data file, reading CSV files through a Parquet sidecar.
+        
+        The sidecar is used when it records the same modification time and
+        size as the CSV file (being newer is not enough: a CSV restored with
+        an older mtime would serve stale rows); otherwise the CSV is parsed
+        and the sidecar (re)written for the next read. Without pyarrow, or
+        for Parquet files, this is plain load_existing_data.
+        
+        Args:
+            filepath: Path to the data file
+            fast: Parse CSV files with pyarrow on a cache miss
+            dtype: Column dtypes to return (e.g. PRICE_DTYPES); the sidecar
+                   itself keeps the CSV's full precision
+            
+        Returns:
+            DataFrame if file exists and is valid, None otherwise
+        """
+        filepath = Path(filepath)
+        
+        if not HAS_PYARROW or self._is_parquet(filepath):
+            return self.load_existing_data(filepath, dtype=dtype)
+        
+        try:
+            stat = filepath.stat()
+        except FileNotFoundError:
+            return self.load_existing_data(filepath, fast=fast, dtype=dtype)
+        source_stat = f"{stat.st_mtime_ns}:{stat.st_size}".encode()
+        
+        sidecar = self.cache_path(filepath)
+        try:
+            metadata = pq.read_schema(sidecar).metadata or {}
+            if metadata.get(CACHE_SOURCE_KEY) == source_stat:
+                df = self._with_csv_timezone(pd.read_parquet(sidecar, engine='pyarrow'))
+                return self._cast(df, dtype)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            self.logger.warning(f"Ignoring unreadable cache {sidecar}: {str(e)}")
+        
+        df = self.load_existing_data(filepath, fast=fast)
+        
+        if df is not None:
+            try:
+                # Stamped with the stat taken before the read, so a CSV that
+                # changed meanwhile is simply parsed again next time
+                table = pa.Table.from_pandas(df)
+                table = table.replace_schema_metadata(
+                    {**(table.schema.metadata or {}), CACHE_SOURCE_KEY: source_stat}
+                )
+                pq.write_table(table, sidecar, compression='zstd')
+            except Exception as e:
+                self.logger.warning(f"Failed to write cache {sidecar}: {str(e)}")
+        
+        return self._cast(df, dtype)
+    
+    @staticmethod
+    def _cast(
+        df: Optional[pd.DataFrame],
+        dtype: Optional[Dict[str, str]]
+    ) -> Optional[pd.DataFrame]:
+        """Apply the dtypes of the columns present in df (None passes through)."""
+        if df is None or not dtype:
+            return df
+        return df.astype({col: t for col, t in dtype.items() if col in df.columns})
+    
+    @staticmethod
+    def _with_csv_timezone(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Give a frame read from a sidecar the index timezone read_csv produces.
+        
+        A CSV only records UTC offsets, which read_csv turns into
+        datetime.timezone objects; Parquet restores the same offset as a
+        pytz.FixedOffset. Converting keeps both paths returning identical
+        frames (the timestamps themselves are unchanged).
+        """
+        tz = getattr(df.index, 'tz', None)
+        if tz is not None:
+            offset = tz.utcoffset(None)
+            if offset is not None:
+                df.index = df.index.tz_convert(timezone(offset))
+        return df
+    
+    def has_data(self, filepath: str) -> bool:
+        """
+        Check whether a data file holds at least one row without loading it.
+        
+        CSV files only need the header and first line read; Parquet files
+        are answered from the footer metadata.
+        
+        Args:
+            filepath: Path to the CSV or Parquet file
+            
+        Returns:
+            True if the file exists and has data rows
+        """
+        filepath = Path(filepath)
+        
+        try:
+            if self._is_parquet(filepath):
+                if not HAS_PYARROW:
+                    return False
+                return pq.ParquetFile(filepath).metadata.num_rows > 0
+            
+            with open(filepath, 'rb') as f:
+                f.readline()
+                return bool(f.readline().strip())
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            self.logger.warning(f"Failed to inspect {filepath}: {str(e)}")
+            return False
+    
+    @staticmethod
+    def count_rows(filepath: str) -> int:
+        """
+        Count the data rows of a file without parsing it.
+        
+        CSV lines are counted; Parquet files are answered from the footer
+        metadata.
+        
+        Args:
+            filepath: Path to the CSV or Parquet file
+            
+        Returns:
+            Number of data rows (0 for a missing file)
+        """
+        if DataMerger._is_parquet(Path(filepath)):
+            if not os.path.exists(filepath):
+                return 0
+            return pq.ParquetFile(filepath).metadata.num_rows
+        
+        try:
+            with open(filepath, 'rb') as f:
+                chunks = iter(lambda: f.read(WRITE_BUFFER_SIZE), b'')
+                lines = sum(chunk.count(b'\n') for chunk in chunks)
+        except FileNotFoundError:
+            return 0
+        return max(0, lines - 1)
+    
+    def load_edges(self, filepath: str) -> Optional[pd.DataFrame]:
+        """
+        Load only the first and last data rows of a CSV file.
+        
+        Reads the header and first row from the start of the file and seeks
+        to the end for the last row, so the cost does not grow with history
+        size. Useful to decide whether new rows can simply be appended.
+        
+        Args:
+            filepath: Path to the CSV file
+            
+        Returns:
+            DataFrame with the first and last rows (one row if the file has a
+            single data row), or None if the file is missing, empty or not CSV
+        """
+        filepath = Path(filepath)
+        
+        if self._is_parquet(filepath) or not filepath.exists():
+            return None
+        
+        try:
+            with open(filepath, 'rb') as f:
+                header = f.readline()
+                first = f.readline()
+                if not first.strip():
+                    return None
+                
+                # Walk back from the end until a full last line is in the buffer
+                size = f.seek(0, os.SEEK_END)
+                block = 4096
+                while True:
+                    start = max(0, size - block)
+                    f.seek(start)
+                    tail = f.read(size - start).rstrip(b'\r\n')
+                    if b'\n' in tail or start == 0:
+                        break
+                    block *= 2
+                last = tail.rsplit(b'\n', 1)[-1] + b'\n'
+            
+            lines = header + first
+            if last.rstrip(b'\r\n') != first.rstrip(b'\r\n'):
+                lines += last
+            
+            df = pd.read_csv(io.BytesIO(lines), index_col=0, parse_dates=True)
+            
+            if not isinstance(df.index, pd.DatetimeIndex):
+                df.index = pd.to_datetime(df.index)
+            
+            return df
+            
+        except Exception as e:
+            self.logger.warning(f"Failed to read edges of {filepath}: {str(e)}")
+            return None
+    
     def get_last_timestamp(self, filepath: str) -> Optional[datetime]:
         """
         Get the last (most recent) timestamp from an existing CSV file.
@@ -116,8 +439,9 @@ class DataMerger:
         existing_df: Optional[pd.DataFrame], 
         new_df: pd.DataFrame,
         deduplicate: bool = True,
-        sort: bool = True
-    ) -> pd.DataFrame:
+        sort: bool = True,
+        return_added: bool = False
+    ) -> Union[pd.DataFrame, Tuple[pd.DataFrame, int]]:
         """
         Merge new data with existing data.
         
@@ -126,19 +450,26 @@ class DataMerger:
             new_df: New DataFrame to merge
             deduplicate: Whether to remove duplicate timestamps (default: True)
             sort: Whether to sort by timestamp (default: True)
+            return_added: Also return the number of timestamps in new_df
+                          that were not already present (default: False)
             
         Returns:
-            Merged DataFrame
+            Merged DataFrame, or (merged DataFrame, rows added) if return_added
         """
         if new_df is None or new_df.empty:
             self.logger.warning("New data is empty, returning existing data")
-            return existing_df if existing_df is not None else pd.DataFrame()
+            merged_df = existing_df if existing_df is not None else pd.DataFrame()
+            return (merged_df, 0) if return_added else merged_df
         
         # If no existing data, return new data
         if existing_df is None or existing_df.empty:
             self.logger.info("No existing data, using new data only")
             merged_df = new_df.copy()
+            added = new_df.index.nunique()
         else:
+            # Hash-based set difference, no pass over the merged frame needed
+            added = new_df.index.difference(existing_df.index).size
+            
             # Concatenate dataframes
             self.logger.info(
                 f"Merging: existing={len(existing_df)} rows, new={len(new_df)} rows"
@@ -153,13 +484,16 @@ class DataMerger:
             if removed > 0:
                 self.logger.info(f"Removed {removed} duplicate rows")
         
-        # Sort by timestamp if requested
-        if sort:
+        # Sort by timestamp if requested (skipped when already in order,
+        # the common case of appending newer rows to a sorted history)
+        if sort and not merged_df.index.is_monotonic_increasing:
             merged_df = merged_df.sort_index()
             self.logger.debug("Data sorted chronologically")
         
         self.logger.info(f"Merge complete: {len(merged_df)} total rows")
         
+        if return_added:
+            return merged_df, added
         return merged_df
     
     def _deduplicate(self, df: pd.DataFrame, keep: str = 'last') -> pd.DataFrame:
@@ -173,25 +507,65 @@ class DataMerger:
         Returns:
             DataFrame with duplicates removed
         """
-        if df.index.duplicated().any():
-            duplicate_count = df.index.duplicated().sum()
-            self.logger.debug(f"Found {duplicate_count} duplicates, keeping '{keep}'")
-            
-            # Remove duplicates, keeping the specified one
-            df_dedup = df[~df.index.duplicated(keep=keep)]
+        # A unique index (cached by pandas) needs no duplicate mask at all
+        if df.index.is_unique:
+            return df
+        
+        # Compute the mask once and reuse it for counting and filtering
+        duplicate_mask = df.index.duplicated(keep=keep)
+        self.logger.debug(f"Found {duplicate_mask.sum()} duplicates, keeping '{keep}'")
+        
+        # Remove duplicates, keeping the specified one
+        return df[~duplicate_mask]
+    
+    @staticmethod
+    def _csv_frame(df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Pre-render a tz-aware DatetimeIndex for CSV output.
+        
+        pandas formats tz-aware timestamps one Timestamp object at a time,
+        which dominates to_csv on intraday files. Formatting the wall-clock
+        times as a naive index and attaching the UTC offsets (one string per
+        distinct offset) yields the same text in a fraction of the time.
+        
+        Args:
+            df: DataFrame about to be written
             
-            return df_dedup
+        Returns:
+            A shallow copy with a string index, or df unchanged when its
+            index is not whole-second, tz-aware and free of NaT
+        """
+        index = df.index
+        if not isinstance(index, pd.DatetimeIndex) or index.tz is None or index.empty or index.hasnans:
+            return df
         
-        return df
+        local = index.tz_localize(None)
+        local_ns = local.as_unit('ns').asi8
+        offsets_ns = local_ns - index.tz_convert(None).as_unit('ns').asi8
+        if (local_ns % 1_000_000_000).any() or (offsets_ns % 60_000_000_000).any():
+            return df
+        
+        offsets, inverse = np.unique(offsets_ns // 60_000_000_000, return_inverse=True)
+        suffixes = np.array(
+            [f"{'-' if m < 0 else '+'}{abs(m) // 60:02d}:{abs(m) % 60:02d}" for m in offsets],
+            dtype=object
+        )
+        text = np.asarray(local.strftime('%Y-%m-%d %H:%M:%S'), dtype=object) + suffixes[inverse]
+        
+        out = df.copy(deep=False)
+        out.index = pd.Index(text, name=index.name)
+        return out
     
     def save_data(
         self, 
         df: pd.DataFrame, 
         filepath: str,
         create_backup: Optional[bool] = None
-    ) -> bool:
+    ) -> int:
         """
-        Save DataFrame to CSV file with optional backup.
+        Save DataFrame to a CSV or Parquet file with optional backup.
+        
+        The format is chosen from the file extension.
         
         Args:
             df: DataFrame to save
@@ -199,7 +573,10 @@ class DataMerger:
             create_backup: Override backup setting (None uses instance setting)
             
         Returns:
-            True if successful, False otherwise
+            Number of bytes written, i.e. the new file size
+            
+        Raises:
+            MergeError: If the file cannot be written
         """
         filepath = Path(filepath)
         
@@ -214,16 +591,91 @@ class DataMerger:
             if should_backup and filepath.exists():
                 self._create_backup(filepath)
             
-            # Save to CSV
-            df.to_csv(filepath, index=True)
+            # Save in the format matching the file extension; the handle's
+            # position gives the size without a stat() afterwards
+            if self._is_parquet(filepath):
+                with open(filepath, 'wb') as f:
+                    df.to_parquet(
+                        f, engine='pyarrow', index=True,
+                        compression='zstd', compression_level=3
+                    )
+                    bytes_written = f.tell()
+            else:
+                with open(filepath, 'w', buffering=WRITE_BUFFER_SIZE, newline='', encoding='utf-8') as f:
+                    self._csv_frame(df).to_csv(f, index=True)
+                    bytes_written = f.tell()
             self.logger.info(f"Saved {len(df)} rows to {filepath}")
             
-            return True
+            return bytes_written
             
         except Exception as e:
             self.logger.error(f"Failed to save data to {filepath}: {str(e)}")
             raise MergeError(f"Error saving file: {str(e)}") from e
     
+    def can_append(
+        self,
+        existing_df: Optional[pd.DataFrame],
+        new_df: pd.DataFrame
+    ) -> bool:
+        """
+        Check whether new data can be appended to an existing file as-is.
+        
+        Appending is only safe when the existing data is non-empty, the
+        columns match exactly and every new row is strictly later than
+        the last existing row (no overlap to deduplicate).
+        
+        Args:
+            existing_df: Existing DataFrame (can be None)
+            new_df: New DataFrame to be written
+            
+        Returns:
+            True if new_df can be appended without rewriting the file
+        """
+        if existing_df is None or existing_df.empty or new_df is None or new_df.empty:
+            return False
+        
+        if list(existing_df.columns) != list(new_df.columns):
+            return False
+        
+        try:
+            return bool(new_df.index.min() > existing_df.index.max())
+        except TypeError:
+            # Mixed tz-aware/naive indexes cannot be compared safely
+            return False
+    
+    def append_data(self, df: pd.DataFrame, filepath: str) -> bool:
+        """
+        Append rows to an existing CSV file without rewriting it.
+        
+        I/O is proportional to the number of new rows rather than the
+        full history. No backup is taken since existing rows are untouched.
+        
+        Args:
+            df: Rows to append (columns must match the existing file)
+            filepath: Existing CSV file path
+            
+        Returns:
+            True if successful
+            
+        Raises:
+            MergeError: If the file is not a CSV file or cannot be written
+        """
+        filepath = Path(filepath)
+        
+        if self._is_parquet(filepath):
+            raise MergeError(f"Cannot append in place to Parquet file: {filepath}")
+        
+        try:
+            with open(filepath, 'a', buffering=WRITE_BUFFER_SIZE, newline='', encoding='utf-8') as f:
+                self._csv_frame(df).to_csv(f, header=False, index=True)
+            self.logger.info(f"Appended {len(df)} rows to {filepath}")
+            
+            return True
+            
+        except Exception as e:
+            self.logger.error(f"Failed to append data to {filepath}: {str(e)}")
+            raise MergeError(f"Error appending to file: {str(e)}") from e
+    
     def _create_backup(self, filepath: Path) -> Path:
         """
         Create a backup of the existing file.
@@ -257,20 +709,41 @@ class DataMerger:
         self,
         filepath: str,
         new_df: pd.DataFrame,
-        validate: bool = True
+        validate: bool = True,
+        existing_rows: Optional[int] = None
     ) -> Tuple[bool, int]:
         """
         Convenience method to load, merge, and save data in one operation.
         
+        When every new row is later than the end of an existing CSV file the
+        rows are appended in place; only the file edges are read and the
+        history is not rewritten. Otherwise the file is loaded, merged and
+        rewritten in full.
+        
         Args:
             filepath: Path to CSV file
             new_df: New data to merge
             validate: Whether to validate merged data
+            existing_rows: Number of rows already in the file, if known
+                           (saves counting them when appending)
             
         Returns:
             Tuple of (success: bool, total_rows: int)
         """
         try:
+            # Append just the new tail when it starts after the existing data
+            edges_df = self.load_edges(filepath) if self.supports_append else None
+            if edges_df is not None:
+                tail_df = self.merge_data(None, new_df)
+                if self.can_append(edges_df, tail_df):
+                    if validate and not self._quick_validate(tail_df):
+                        raise MergeError("New data failed validation")
+                    
+                    if existing_rows is None:
+                        existing_rows = self.count_rows(filepath)
+                    self.append_data(tail_df, filepath)
+                    return True, existing_rows + len(tail_df)
+            
             # Load existing data
             existing_df = self.load_existing_data(filepath)
             
@@ -283,7 +756,7 @@ class DataMerger:
                     raise MergeError("Merged data failed validation")
             
             # Save merged data
-            success = self.save_data(merged_df, filepath)
+            success = self.save_data(merged_df, filepath) > 0
             
             return success, len(merged_df)
             
@@ -12,6 +12,12 @@ import pandas as pd
 import numpy as np
 
 
+# Intervals whose gaps are only checked within a trading day
+INTRADAY_INTERVALS = frozenset(['1m', '2m', '5m', '15m', '30m', '60m', '1h'])
+
+NS_PER_DAY = 86_400_000_000_000
+
+
 class ValidationReport:
     """Container for validation results."""
     
@@ -102,13 +108,16 @@ class DataValidator:
         """
         self.logger = logging.getLogger(__name__)
         self.timezone = timezone
+        # Gap rule per interval string, resolved on first use (see _gap_rule)
+        self._gap_rules: Dict[str, Optional[Tuple[timedelta, timedelta, bool]]] = {}
         self.logger.info(f"DataValidator initialized with timezone: {timezone}")
     
     def validate_dataframe(
         self, 
         df: pd.DataFrame, 
         interval: str,
-        auto_fix: bool = False
+        auto_fix: bool = False,
+        last_known_timestamp: Optional[pd.Timestamp] = None
     ) -> Tuple[pd.DataFrame, ValidationReport]:
         """
         Perform comprehensive validation on a DataFrame.
@@ -117,6 +126,9 @@ class DataValidator:
             df: DataFrame to validate
             interval: Time interval of the data (e.g., '1m', '5m', '1d')
             auto_fix: Whether to automatically fix simple issues
+            last_known_timestamp: Last timestamp of already validated data that
+                                  df follows on from; used to also check the gap
+                                  at the boundary when validating only new rows
             
         Returns:
             Tuple of (potentially fixed DataFrame, ValidationReport)
@@ -164,7 +176,7 @@ class DataValidator:
             report.add_issue('data_quality', issue['severity'], issue['message'], issue.get('details'))
         
         # Check for gaps
-        gap_issues = self.check_gaps(validated_df, interval)
+        gap_issues = self.check_gaps(validated_df, interval, last_known_timestamp)
         for gap in gap_issues:
             report.add_issue('gaps', 'warning', gap['message'], gap.get('details'))
         
@@ -230,69 +242,77 @@ class DataValidator:
         
         return df_fixed
     
-    def check_gaps(self, df: pd.DataFrame, interval: str) -> List[Dict[str, Any]]:
+    def check_gaps(
+        self,
+        df: pd.DataFrame,
+        interval: str,
+        last_known_timestamp: Optional[pd.Timestamp] = None
+    ) -> List[Dict[str, Any]]:
         """
         Check for missing data gaps based on the interval.
         
         Args:
             df: DataFrame to check
             interval: Time interval ('1m', '5m', '1d', etc.)
+            last_known_timestamp: Optional timestamp preceding df; the gap
+                                  between it and df's first row is checked too
             
         Returns:
-            List of gap information dictionaries
+            List of gap information dictionaries ('index' positions refer to df)
         """
+        offset = 0
+        if last_known_timestamp is not None and len(df) > 0:
+            boundary = pd.Timestamp(last_known_timestamp)
+            if boundary.tzinfo is not None and df.index.tz is not None:
+                boundary = boundary.tz_convert(df.index.tz)
+            if boundary < df.index[0]:
+                # Only the index is used below, so a bare index frame suffices
+                df = pd.DataFrame(index=df.index.insert(0, boundary))
+                offset = 1
+        
         if len(df) < 2:
             return []
         
         gaps = []
         
-        # Convert interval to timedelta
-        interval_td = self._parse_interval(interval)
-        if interval_td is None:
+        rule = self._gap_rule(interval)
+        if rule is None:
             self.logger.warning(f"Could not parse interval: {interval}")
             return gaps
+        interval_td, max_gap, intraday = rule
         
-        # Check consecutive timestamps
-        time_diffs = df.index.to_series().diff()
+        # Compare every pair of consecutive bars in one vectorized pass
+        index = df.index
+        diffs = index[1:] - index[:-1]
+        candidates = np.asarray(diffs > max_gap)
         
         # For intraday data, consider market hours
-        if interval in ['1m', '2m', '5m', '15m', '30m', '60m', '1h']:
-            # Allow for overnight gaps and weekends
-            # Flag only gaps during market hours
-            tolerance = interval_td * 2  # Allow some flexibility
-            
-            for i in range(1, len(df)):
-                diff = time_diffs.iloc[i]
-                
-                # Skip if weekend or different days
-                prev_date = df.index[i-1].date()
-                curr_date = df.index[i].date()
-                
-                if prev_date != curr_date:
-                    continue  # Different days, gap is expected
-                
-                if diff > tolerance:
-                    gaps.append({
-                        'message': f'Gap detected: {diff} at {df.index[i]}',
-                        'details': f'Expected ~{interval_td}, got {diff}',
-                        'index': i
-                    })
-        else:
-            # For daily or longer intervals
-            if interval == '1d':
-                # Allow for weekends (up to 3 days)
-                max_gap = timedelta(days=4)
+        if intraday:
+            # Allow for overnight gaps and weekends: only gaps between bars
+            # of the same (local) day are flagged
+            wall = index.tz_localize(None) if index.tz is not None else index
+            days = wall.as_unit('ns').asi8 // NS_PER_DAY
+            candidates &= days[1:] == days[:-1]
+        
+        for i in (np.flatnonzero(candidates) + 1).tolist():
+            diff = diffs[i - 1]
+            if intraday:
+                gaps.append({
+                    'message': f'Gap detected: {diff} at {index[i]}',
+                    'details': f'Expected ~{interval_td}, got {diff}',
+                    'index': i
+                })
             else:
-                max_gap = interval_td * 2
-            
-            large_gaps = time_diffs[time_diffs > max_gap]
-            for idx in large_gaps.index:
+                # For daily or longer intervals
                 gaps.append({
-                    'message': f'Large gap detected at {idx}',
-                    'details': f'Gap size: {time_diffs[idx]}',
-                    'index': df.index.get_loc(idx)
+                    'message': f'Large gap detected at {index[i]}',
+                    'details': f'Gap size: {diff}',
+                    'index': i
                 })
         
+        for gap in gaps:
+            gap['index'] -= offset
+        
         if gaps:
             self.logger.info(f"Found {len(gaps)} data gaps")
         
@@ -417,6 +437,36 @@ class DataValidator:
         
         return None
     
+    def _gap_rule(self, interval: str) -> Optional[Tuple[timedelta, timedelta, bool]]:
+        """
+        Resolve how gaps are checked for an interval, once per interval string.
+        
+        Args:
+            interval: Interval string (e.g., '1m', '5m', '1d')
+            
+        Returns:
+            Tuple of (bar spacing, largest allowed gap, intraday) or None if
+            the interval cannot be parsed
+        """
+        try:
+            return self._gap_rules[interval]
+        except KeyError:
+            pass
+        
+        interval_td = self._parse_interval(interval)
+        if interval_td is None:
+            rule = None
+        elif interval in INTRADAY_INTERVALS:
+            rule = (interval_td, interval_td * 2, True)  # Allow some flexibility
+        elif interval == '1d':
+            # Allow for weekends (up to 3 days)
+            rule = (interval_td, timedelta(days=4), False)
+        else:
+            rule = (interval_td, interval_td * 2, False)
+        
+        self._gap_rules[interval] = rule
+        return rule
+    
     def _parse_interval(self, interval: str) -> Optional[timedelta]:
         """
         Parse interval string to timedelta.
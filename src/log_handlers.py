@@ -0,0 +1,23 @@
+"""
+Logging Handlers for Market Data Pipeline
+
+This module provides logging handlers shared by the pipeline scripts.
+"""
+
+import logging
+
+try:
+    from tqdm import tqdm
+    HAS_TQDM = True
+except ImportError:
+    HAS_TQDM = False
+
+
+class TqdmLoggingHandler(logging.StreamHandler):
+    """Stream handler that writes through tqdm so progress bars stay intact."""
+    
+    def emit(self, record: logging.LogRecord):
+        try:
+            tqdm.write(self.format(record), file=self.stream)
+        except Exception:
+            self.handleError(record)
@@ -7,9 +7,10 @@ tracking download history, data quality, and update schedules.
 
 import json
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 
 class MetadataError(Exception):
@@ -42,6 +43,13 @@ class MetadataManager:
         # Create metadata directory if it doesn't exist
         self.metadata_dir.mkdir(parents=True, exist_ok=True)
         
+        # In-memory cache (enabled by load_all) and deferred writes (begin_batch)
+        self._cache: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._cache_enabled = False
+        self._batching = False
+        self._dirty: set = set()
+        self._lock = threading.RLock()
+        
         self.logger.info(f"MetadataManager initialized (metadata_dir={self.metadata_dir})")
     
     def _get_metadata_path(self, symbol: str, interval: str) -> Path:
@@ -64,6 +72,26 @@ class MetadataManager:
         """
         Load metadata for a specific symbol and interval.
         
+        Args:
+            symbol: Stock/Index symbol
+            interval: Time interval
+            
+        Returns:
+            Metadata dictionary, or default structure if not found
+        """
+        if self._cache_enabled:
+            with self._lock:
+                key = (symbol, interval)
+                if key not in self._cache:
+                    self._cache[key] = self._read_metadata(symbol, interval)
+                return self._cache[key]
+        
+        return self._read_metadata(symbol, interval)
+    
+    def _read_metadata(self, symbol: str, interval: str) -> Dict[str, Any]:
+        """
+        Read metadata for a symbol and interval from its JSON file.
+        
         Args:
             symbol: Stock/Index symbol
             interval: Time interval
@@ -89,6 +117,67 @@ class MetadataManager:
             # Return default metadata if loading fails
             return self._create_default_metadata(symbol, interval)
     
+    def load_all(self) -> Dict[Tuple[str, str], Dict[str, Any]]:
+        """
+        Load every metadata file once and serve later lookups from memory.
+        
+        After this call load_metadata (and therefore needs_update and
+        get_next_fetch_date) no longer touch disk for known symbols.
+        
+        Returns:
+            Dictionary mapping (symbol, interval) to its metadata
+        """
+        with self._lock:
+            for metadata in self.get_all_metadata():
+                key = (metadata.get('symbol'), metadata.get('interval'))
+                # Keep in-memory records that have not been flushed yet
+                if key not in self._dirty:
+                    self._cache[key] = metadata
+            
+            self._cache_enabled = True
+            return dict(self._cache)
+    
+    def begin_batch(self):
+        """
+        Start deferring metadata writes until flush() is called.
+        
+        Updates are kept in memory (implies load_all-style caching) so that
+        each file is written at most once per batch.
+        """
+        with self._lock:
+            self._cache_enabled = True
+            self._batching = True
+    
+    def flush(self) -> int:
+        """
+        Write all metadata changed since begin_batch() and end the batch.
+        
+        Returns:
+            Number of metadata files written
+            
+        Raises:
+            MetadataError: If any metadata file could not be written
+        """
+        with self._lock:
+            dirty = sorted(self._dirty)
+            self._dirty.clear()
+            self._batching = False
+            
+            failed = []
+            for symbol, interval in dirty:
+                try:
+                    self._write_metadata(symbol, interval, self._cache[(symbol, interval)])
+                except MetadataError:
+                    failed.append(f"{symbol} ({interval})")
+        
+        if dirty:
+            self.logger.info(f"Flushed metadata for {len(dirty) - len(failed)} symbol/interval pairs")
+        
+        if failed:
+            raise MetadataError(f"Error saving metadata for: {', '.join(failed)}")
+        
+        return len(dirty)
+    
     def _create_default_metadata(self, symbol: str, interval: str) -> Dict[str, Any]:
         """
         Create default metadata structure.
@@ -187,13 +276,35 @@ class MetadataManager:
     
     def _save_metadata(self, symbol: str, interval: str, metadata: Dict[str, Any]):
         """
-        Save metadata to JSON file.
+        Save metadata to JSON file, or queue it while a batch is open.
         
         Args:
             symbol: Stock/Index symbol
             interval: Time interval
             metadata: Metadata dictionary to save
         """
+        with self._lock:
+            if self._cache_enabled:
+                self._cache[(symbol, interval)] = metadata
+            
+            if self._batching:
+                self._dirty.add((symbol, interval))
+                return
+        
+        self._write_metadata(symbol, interval, metadata)
+    
+    def _write_metadata(self, symbol: str, interval: str, metadata: Dict[str, Any]):
+        """
+        Write metadata to its JSON file.
+        
+        Args:
+            symbol: Stock/Index symbol
+            interval: Time interval
+            metadata: Metadata dictionary to save
+            
+        Raises:
+            MetadataError: If the file cannot be written
+        """
         metadata_path = self._get_metadata_path(symbol, interval)
         
         try:
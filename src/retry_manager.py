@@ -6,11 +6,13 @@ failure tracking, and reporting for failed downloads.
 """
 
 import logging
+import random
+import threading
 import time
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Callable, Any, Optional, List, Dict
+from typing import Callable, Any, Optional, List, Dict, Tuple, Type
 from collections import defaultdict
 from functools import wraps
 
@@ -20,6 +22,100 @@ class RetryError(Exception):
     pass
 
 
+class CircuitOpenError(RetryError):
+    """Raised instead of calling through while a circuit breaker is open."""
+    pass
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing upstream for a cooldown period.
+    
+    After failure_threshold consecutive failures the breaker opens and
+    rejects calls until cooldown seconds have passed. It is then half-open:
+    exactly one caller is let through as a trial call while the others keep
+    waiting. A successful trial closes the breaker, a failed one re-opens it
+    for another cooldown. Thread-safe, so one breaker can guard every
+    worker talking to the same host.
+    """
+    
+    # Seconds between checks of callers waiting on a trial call
+    PROBE_POLL_INTERVAL = 1.0
+    
+    def __init__(self, failure_threshold: int = 10, cooldown: float = 60.0):
+        """
+        Initialize the CircuitBreaker.
+        
+        Args:
+            failure_threshold: Consecutive failures that open the breaker
+            cooldown: Seconds to reject calls before allowing a trial call
+        """
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._probing = False
+        self._lock = threading.Lock()
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether a call made now would be rejected (without claiming the trial call)."""
+        with self._lock:
+            return self._wait_time() > 0
+    
+    def _wait_time(self) -> float:
+        """Seconds until a call may be attempted; the lock must be held."""
+        if self._opened_at is None:
+            return 0.0
+        remaining = self._opened_at + self.cooldown - time.monotonic()
+        if remaining > 0:
+            return remaining
+        if self._probing:
+            return self.PROBE_POLL_INTERVAL
+        return 0.0
+    
+    def allow(self) -> float:
+        """
+        Ask to make a call.
+        
+        When the breaker is half-open the first caller becomes the trial
+        call; every other caller is told to wait until it has finished.
+        
+        Returns:
+            0 if the call may go ahead, otherwise seconds to wait before asking again
+        """
+        with self._lock:
+            wait = self._wait_time()
+            if wait == 0 and self._opened_at is not None:
+                self._probing = True
+            return wait
+    
+    def record_success(self):
+        """Close the breaker and reset the failure count."""
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+    
+    def record_failure(self):
+        """Count a failure, opening (or re-opening) the breaker at the threshold."""
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._probing = False
+    
+    def release(self):
+        """
+        End a call that says nothing about the upstream's health.
+        
+        Used for errors such as an unknown symbol: they are not counted, and
+        a trial call ending this way lets the next caller try instead.
+        """
+        with self._lock:
+            self._probing = False
+
+
 class RetryManager:
     """
     Manages retry logic with exponential backoff and failure tracking.
@@ -49,6 +145,11 @@ class RetryManager:
         
         self.alert_callback = alert_callback
         self.failures: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        
+        # Deferred saving (begin_batch/flush)
+        self._batching = False
+        self._dirty = False
         
         # Failure log file
         self.failure_log_path = self.log_dir / "download_failures.json"
@@ -65,18 +166,35 @@ class RetryManager:
         initial_delay: float = 1.0,
         backoff_factor: float = 2.0,
         max_delay: float = 60.0,
+        jitter: bool = False,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        wait_if_open: bool = False,
+        give_up_on: Tuple[Type[BaseException], ...] = (),
         *args,
         **kwargs
     ) -> Any:
         """
         Execute a function with exponential backoff retry logic.
         
+        With jitter enabled each wait is drawn uniformly from
+        [0, backoff delay] ("full jitter"), so concurrent workers that fail
+        together do not all retry at the same instant. A shared circuit
+        breaker records every attempt and holds calls back while the
+        upstream is known to be down: they fail fast, or with wait_if_open
+        wait until the breaker lets them through. Exceptions in give_up_on
+        (e.g. an unknown symbol) cannot be fixed by retrying; they are
+        re-raised at once and not counted against the breaker.
+        
         Args:
             func: Function to execute
             max_retries: Maximum number of retry attempts
             initial_delay: Initial delay in seconds
             backoff_factor: Multiplier for exponential backoff
             max_delay: Maximum delay between retries
+            jitter: Randomize each delay between 0 and the backoff delay
+            circuit_breaker: Optional breaker shared by callers of the same host
+            wait_if_open: Wait out an open breaker instead of raising CircuitOpenError
+            give_up_on: Exception types to re-raise without retrying
             *args: Positional arguments for func
             **kwargs: Keyword arguments for func
             
@@ -85,22 +203,44 @@ class RetryManager:
             
         Raises:
             RetryError: If all retries are exhausted
+            CircuitOpenError: If the circuit breaker is open and wait_if_open is False
+            Exception: Any exception in give_up_on, unchanged
         """
         last_exception = None
         delay = initial_delay
         
         for attempt in range(1, max_retries + 1):
+            if circuit_breaker is not None:
+                wait = circuit_breaker.allow()
+                while wait > 0:
+                    if not wait_if_open:
+                        raise CircuitOpenError(
+                            f"{func.__name__} skipped: circuit open after repeated failures"
+                        ) from last_exception
+                    time.sleep(wait)
+                    wait = circuit_breaker.allow()
+            
             try:
                 self.logger.debug(f"Attempt {attempt}/{max_retries} for {func.__name__}")
                 result = func(*args, **kwargs)
                 
+                if circuit_breaker is not None:
+                    circuit_breaker.record_success()
                 if attempt > 1:
                     self.logger.info(f"{func.__name__} succeeded on attempt {attempt}")
                 
                 return result
                 
+            except give_up_on as e:
+                if circuit_breaker is not None:
+                    circuit_breaker.release()
+                self.logger.warning(f"{func.__name__} failed, not retrying: {str(e)}")
+                raise
+                
             except Exception as e:
                 last_exception = e
+                if circuit_breaker is not None:
+                    circuit_breaker.record_failure()
                 self.logger.warning(
                     f"Attempt {attempt}/{max_retries} failed for {func.__name__}: {str(e)}"
                 )
@@ -108,6 +248,8 @@ class RetryManager:
                 if attempt < max_retries:
                     # Calculate delay with exponential backoff
                     current_delay = min(delay, max_delay)
+                    if jitter:
+                        current_delay = random.uniform(0, current_delay)
                     self.logger.info(f"Retrying in {current_delay:.1f} seconds...")
                     time.sleep(current_delay)
                     delay *= backoff_factor
@@ -136,27 +278,73 @@ class RetryManager:
             error: Error message/description
             metadata: Optional additional metadata
         """
-        failure_entry = {
-            'timestamp': datetime.now().isoformat(),
-            'symbol': symbol,
-            'interval': interval,
-            'error': str(error),
-            'metadata': metadata or {}
-        }
+        self.log_failure_batch([(symbol, interval, error, metadata)])
+    
+    def log_failure_batch(self, failures: List[Tuple]):
+        """
+        Log several failed download attempts at once.
         
-        self.failures.append(failure_entry)
-        self.logger.warning(f"Logged failure for {symbol} ({interval}): {error}")
+        All entries are added under one lock acquisition and the log file is
+        written at most once (not at all while batching).
         
-        # Save to file
-        self._save_failures()
+        Args:
+            failures: (symbol, interval, error) or
+                      (symbol, interval, error, metadata) tuples
+        """
+        if not failures:
+            return
         
-        # Send alert if callback is configured
-        if self.alert_callback:
-            try:
-                alert_message = f"Download failed: {symbol} ({interval}) - {error}"
-                self.alert_callback(alert_message)
-            except Exception as e:
-                self.logger.error(f"Failed to send alert: {str(e)}")
+        timestamp = datetime.now().isoformat()
+        entries = []
+        for symbol, interval, error, *extra in failures:
+            entries.append({
+                'timestamp': timestamp,
+                'symbol': symbol,
+                'interval': interval,
+                'error': str(error),
+                'metadata': (extra[0] if extra else None) or {}
+            })
+        
+        # Guard the shared list and file so concurrent workers don't interleave writes
+        with self._lock:
+            self.failures.extend(entries)
+            if self._batching:
+                self._dirty = True
+            else:
+                self._save_failures()
+        
+        for entry in entries:
+            self.logger.warning(
+                f"Logged failure for {entry['symbol']} ({entry['interval']}): {entry['error']}"
+            )
+            
+            # Send alert if callback is configured
+            if self.alert_callback:
+                try:
+                    alert_message = (
+                        f"Download failed: {entry['symbol']} ({entry['interval']}) - {entry['error']}"
+                    )
+                    self.alert_callback(alert_message)
+                except Exception as e:
+                    self.logger.error(f"Failed to send alert: {str(e)}")
+    
+    def begin_batch(self):
+        """
+        Start deferring failure log writes until flush() is called.
+        
+        Each log_failure otherwise rewrites the whole JSON log, which under
+        an outage turns into one full rewrite per failed symbol.
+        """
+        with self._lock:
+            self._batching = True
+    
+    def flush(self):
+        """Write failures logged since begin_batch() and end the batch."""
+        with self._lock:
+            self._batching = False
+            if self._dirty:
+                self._save_failures()
+                self._dirty = False
     
     def get_failed_downloads(
         self,
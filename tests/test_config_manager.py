@@ -125,6 +125,15 @@ def test_get_timezone(temp_config_dir):
     assert cm.get_timezone() == 'Asia/Kolkata'
 
 
+@pytest.mark.unit
+def test_get_storage_format_default(temp_config_dir):
+    """Test storage format defaults to CSV when not configured."""
+    cm = ConfigManager(str(temp_config_dir))
+    cm.load_config()
+    
+    assert cm.get_storage_format() == 'csv'
+
+
 @pytest.mark.unit
 def test_validate_config_success(temp_config_dir):
     """Test configuration validation passes."""
@@ -215,3 +224,83 @@ def test_should_validate_data(temp_config_dir):
     cm.load_config()
     
     assert cm.should_validate_data() is True
+
+
+@pytest.mark.unit
+def test_yaml_parse_cached_until_file_changes(temp_config_dir):
+    """Test parsed YAML is reused while unchanged and copied for each caller."""
+    cm = ConfigManager(str(temp_config_dir))
+    cm.load_config()
+    cm.config['intervals'].append('1wk')
+    
+    cm2 = ConfigManager(str(temp_config_dir))
+    cm2.load_config()
+    assert cm2.get_intervals() == ['1m', '5m', '1d']
+    
+    stocks_file = temp_config_dir / 'stocks.yaml'
+    with open(stocks_file, 'w') as f:
+        yaml.dump({'stocks': [{'symbol': 'INFY.NS'}]}, f)
+    cm2.load_config()
+    assert cm2.get_stock_list() == ['INFY.NS']
+
+
+@pytest.mark.unit
+def test_parse_cache_skips_yaml(temp_config_dir):
+    """Test a new process uses the on-disk parse cache instead of parsing YAML."""
+    from unittest.mock import patch
+    from src import config_manager
+    
+    cm = ConfigManager(str(temp_config_dir))
+    cm.load_config()
+    cm.get_stock_list()
+    assert (temp_config_dir / '.config_cache.pkl').exists()
+    
+    # Forget this process's parses, as a fresh process would not have them
+    config_manager._YAML_CACHE.clear()
+    with patch('src.config_manager.yaml.load', side_effect=AssertionError):
+        cm = ConfigManager(str(temp_config_dir))
+        cm.load_config()
+        assert cm.get_stock_list() == ['RELIANCE.NS', 'TCS.NS']
+
+
+@pytest.mark.unit
+def test_symbol_files_loaded_lazily(temp_config_dir):
+    """Test stocks.yaml and indices.yaml are only read when symbols are used."""
+    (temp_config_dir / 'indices.yaml').unlink()
+    
+    cm = ConfigManager(str(temp_config_dir))
+    cm.load_config()
+    assert cm.get_timezone() == 'Asia/Kolkata'
+    assert cm.get_stock_list() == ['RELIANCE.NS', 'TCS.NS']
+    
+    with pytest.raises(ConfigurationError):
+        cm.get_indices_list()
+
+
+@pytest.mark.unit
+def test_symbol_lists_cached(temp_config_dir):
+    """Test symbol lists are returned as copies and rebuilt when entries change."""
+    cm = ConfigManager(str(temp_config_dir))
+    cm.load_config()
+    
+    cm.get_stock_list().append('INFY.NS')
+    assert cm.get_all_symbols() == ['RELIANCE.NS', 'TCS.NS', '^NSEI', '^NSEBANK']
+    
+    cm.stocks = [{'symbol': 'INFY.NS'}]
+    assert cm.get_all_symbols() == ['INFY.NS', '^NSEI', '^NSEBANK']
+
+
+@pytest.mark.unit
+def test_get_config_manager_loads_once(temp_config_dir, monkeypatch):
+    """Test concurrent first calls of get_config_manager share one loaded instance."""
+    from concurrent.futures import ThreadPoolExecutor
+    from src import config_manager
+    
+    monkeypatch.setattr(config_manager, '_config_manager_instance', None)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        instances = list(pool.map(
+            lambda _: config_manager.get_config_manager(str(temp_config_dir)), range(16)
+        ))
+    
+    assert all(instance is instances[0] for instance in instances)
+    assert instances[0].get_timezone() == 'Asia/Kolkata'
@@ -6,7 +6,7 @@ import pytest
 import pandas as pd
 from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime
-from src.data_fetcher import DataFetcher
+from src.data_fetcher import DataFetcher, DataFetchError, RateLimiter
 
 
 @pytest.fixture
@@ -65,6 +65,22 @@ def test_get_max_period_1d(data_fetcher):
     assert data_fetcher.get_max_period('1d') is None  # No limit
 
 
+@pytest.mark.unit
+def test_adjust_period(data_fetcher):
+    """Test periods are clamped to the interval limit."""
+    assert data_fetcher._adjust_period('1m', '30d') == '7d'
+    assert data_fetcher._adjust_period('1m', '5d') == '5d'
+    assert data_fetcher._adjust_period('60m', '3y') == '730d'
+    assert data_fetcher._adjust_period('5m', '1mo') == '1mo'
+    assert data_fetcher._adjust_period('1m', 'max') == '7d'
+    assert data_fetcher._adjust_period('1m', 'xd') == '7d'
+    assert data_fetcher._adjust_period('1m', '1wk') == '1wk'
+    assert data_fetcher._adjust_period('5m', '10wk') == '60d'
+    assert data_fetcher._adjust_period('1d', 'max') == 'max'
+    assert data_fetcher._validate_period('1m', '5d')
+    assert not data_fetcher._validate_period('1m', '2mo')
+
+
 @pytest.mark.unit
 @patch('src.data_fetcher.yf.download')
 def test_fetch_data_success(mock_download, data_fetcher, sample_dataframe):
@@ -167,6 +183,87 @@ def test_fetch_data_rate_limiting(mock_download, data_fetcher, sample_dataframe)
     assert elapsed >= 0
 
 
+@pytest.mark.unit
+def test_fetch_incremental_start_date(data_fetcher, sample_dataframe):
+    """Test incremental fetches start the day after ISO and free-form dates."""
+    with patch.object(data_fetcher, 'fetch_data', return_value=sample_dataframe) as mock_fetch:
+        for last_date in ['2024-01-05', '2024-01-05 09:15:00+05:30', 'Jan 5 2024']:
+            data_fetcher.fetch_incremental('RELIANCE.NS', '1d', last_date)
+            assert mock_fetch.call_args.kwargs['start_date'] == '2024-01-06'
+
+
+@pytest.mark.unit
+def test_backoff_delay_jittered_and_capped(data_fetcher):
+    """Test retry delays grow exponentially with jitter and stay capped."""
+    for attempt in range(1, 10):
+        delay = data_fetcher._backoff_delay(attempt)
+        assert 0 <= delay <= min(2 ** (attempt - 1), DataFetcher.MAX_RETRY_DELAY)
+
+
+@pytest.mark.unit
+def test_fetch_data_permanent_error_not_retried(data_fetcher):
+    """Test a missing ticker fails on the first attempt."""
+    from yfinance.exceptions import YFTickerMissingError
+    
+    ticker = Mock()
+    ticker.history.side_effect = YFTickerMissingError('BAD.NS', 'no data')
+    with patch('src.data_fetcher.yf.Ticker', return_value=ticker), patch('time.sleep') as mock_sleep:
+        with pytest.raises(DataFetchError):
+            data_fetcher.fetch_data('BAD.NS', '1d', period='1mo')
+    
+    assert ticker.history.call_count == 1
+    mock_sleep.assert_not_called()
+
+
+
+@pytest.mark.unit
+def test_empty_results_retried_and_counted_by_breaker(tmp_path):
+    """Test empty frames (yfinance's transient failures) are retried and open the breaker."""
+    from src.data_fetcher import PermanentFetchError
+    from src.retry_manager import CircuitBreaker, RetryError, RetryManager
+    
+    # As initial_download wires it: retry_manager owns the retries
+    fetcher = DataFetcher(rate_limit_delay=0, max_retries=1)
+    retry_manager = RetryManager(log_dir=str(tmp_path))
+    breaker = CircuitBreaker(failure_threshold=3, cooldown=60.0)
+    ticker = Mock()
+    ticker.history.return_value = pd.DataFrame()
+    
+    with patch('src.data_fetcher.yf.Ticker', return_value=ticker), patch('time.sleep'):
+        with pytest.raises(RetryError):
+            retry_manager.retry_with_backoff(
+                fetcher.fetch_data,
+                max_retries=3,
+                circuit_breaker=breaker,
+                give_up_on=(PermanentFetchError,),
+                symbol='RELIANCE.NS',
+                interval='1d',
+                period='1mo'
+            )
+    
+    assert ticker.history.call_count == 3
+    assert breaker.is_open
+
+
+@pytest.mark.unit
+def test_chart_api_no_data_found_is_permanent():
+    """Test the chart API's "No data found" error is not retried."""
+    from src.data_fetcher import PermanentFetchError
+    
+    fetcher = DataFetcher(rate_limit_delay=0, max_retries=3, use_chart_api=True)
+    response = Mock(status_code=200)
+    response.json.return_value = {'chart': {'result': None, 'error': {
+        'code': 'Not Found', 'description': 'No data found, symbol may be delisted'
+    }}}
+    session = Mock()
+    session.get.return_value = response
+    
+    with patch.object(fetcher, '_get_session', return_value=session), patch('time.sleep'):
+        with pytest.raises(PermanentFetchError):
+            fetcher.fetch_data('BAD.NS', '1d', period='1mo')
+    
+    assert session.get.call_count == 1
+
 @pytest.mark.unit
 def test_data_fetcher_initialization():
     """Test DataFetcher initialization."""
@@ -195,3 +292,128 @@ def test_fetch_data_required_columns(mock_download, data_fetcher):
     
     # Should handle missing columns gracefully
     assert result is not None
+
+
+@pytest.mark.unit
+def test_rate_limit_thread_safe():
+    """Test concurrent callers are spaced by the rate limit delay."""
+    import threading
+    import time
+    
+    fetcher = DataFetcher(rate_limit_delay=0.05)
+    
+    start = time.time()
+    threads = [threading.Thread(target=fetcher._apply_rate_limit) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.time() - start
+    
+    # First call goes immediately, the remaining three wait one slot each
+    assert elapsed >= 0.15
+
+
+@pytest.mark.unit
+def test_rate_limiter_burst():
+    """Test a full bucket serves its burst immediately, then waits per token."""
+    import time
+    
+    limiter = RateLimiter(rate=20, burst=3)
+    
+    start = time.monotonic()
+    waits = [limiter.acquire() for _ in range(4)]
+    elapsed = time.monotonic() - start
+    
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert waits[3] > 0
+    assert elapsed >= 0.04
+
+
+@pytest.mark.unit
+def test_chart_api_429_pauses_limiter():
+    """Test a 429 response pauses the shared limiter for Retry-After seconds."""
+    limiter = RateLimiter(rate=0)
+    fetcher = DataFetcher(max_retries=1, use_chart_api=True, rate_limiter=limiter)
+    response = Mock(status_code=429, headers={'Retry-After': '0.05'})
+    
+    with patch.object(fetcher, '_get_session') as mock_session:
+        mock_session.return_value.get.return_value = response
+        with pytest.raises(DataFetchError):
+            fetcher._fetch_chart('TEST.NS', '1d', period='5d')
+    
+    assert limiter.acquire() > 0
+
+
+@pytest.mark.unit
+def test_fetch_data_chart_api():
+    """Test chart API responses are parsed like Ticker.history output."""
+    fetcher = DataFetcher(rate_limit_delay=0, max_retries=1, use_chart_api=True)
+    
+    response = Mock(status_code=200)
+    response.json.return_value = {
+        'chart': {
+            'error': None,
+            'result': [{
+                'meta': {'exchangeTimezoneName': 'Asia/Kolkata'},
+                # 2024-01-01 and 2024-01-02 at 09:15 IST
+                'timestamp': [1704080700, 1704167100],
+                'indicators': {
+                    'quote': [{
+                        'open': [100.0, 101.0],
+                        'high': [105.0, 106.0],
+                        'low': [99.0, 100.0],
+                        'close': [104.0, 105.0],
+                        'volume': [1000, 1100]
+                    }],
+                    'adjclose': [{'adjclose': [104.0, 105.0]}]
+                }
+            }]
+        }
+    }
+    session = Mock()
+    session.get.return_value = response
+    
+    with patch.object(fetcher, '_get_session', return_value=session):
+        df = fetcher.fetch_data('RELIANCE.NS', '1d', start_date='2024-01-01', end_date='2024-01-03')
+    
+    assert len(df) == 2
+    assert list(df.columns[:5]) == ['Open', 'High', 'Low', 'Close', 'Volume']
+    assert str(df.index.tz) == 'Asia/Kolkata'
+    assert df.index[0] == pd.Timestamp('2024-01-01', tz='Asia/Kolkata')
+    assert session.get.call_args.kwargs['params']['period1'] == 1704067200
+    assert df['Symbol'].dtype == 'category'
+    assert (df['Symbol'] == 'RELIANCE.NS').all()
+
+
+@pytest.mark.unit
+def test_chart_session_shared_per_thread():
+    """Test chart API sessions are reused across fetchers but not threads."""
+    import threading
+    
+    first = DataFetcher(rate_limit_delay=0)._get_session()
+    assert DataFetcher(rate_limit_delay=0)._get_session() is first
+    
+    other = []
+    thread = threading.Thread(target=lambda: other.append(DataFetcher()._get_session()))
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+
+
+@pytest.mark.unit
+def test_validate_data(data_fetcher, sample_dataframe):
+    """Test validate_data on mixed price and volume dtypes."""
+    df = sample_dataframe.astype({'Open': 'float32', 'High': 'float32', 'Low': 'float32', 'Close': 'float32'})
+    assert data_fetcher.validate_data(df)
+    
+    df.loc[df.index[0], 'Close'] = float('nan')
+    assert data_fetcher.validate_data(df)
+    
+    negative = df.copy()
+    negative.loc[negative.index[1], 'Volume'] = -1
+    assert not data_fetcher.validate_data(negative)
+    
+    inverted = df.copy()
+    inverted.loc[inverted.index[2], 'Low'] = 110.0
+    assert not data_fetcher.validate_data(inverted)
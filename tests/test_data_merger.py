@@ -2,10 +2,12 @@
 Tests for DataMerger
 """
 
+import os
 import pytest
 import pandas as pd
 from pathlib import Path
-from src.data_merger import DataMerger
+from unittest.mock import patch
+from src.data_merger import DataMerger, MergeError, OHLCV_FLOAT32
 
 
 @pytest.fixture
@@ -116,9 +118,10 @@ def test_save_data(merger, sample_dataframe, tmp_path):
     """Test saving DataFrame to CSV."""
     csv_path = tmp_path / "test.csv"
     
-    merger.save_data(sample_dataframe, csv_path)
+    bytes_written = merger.save_data(sample_dataframe, csv_path)
     
     assert csv_path.exists()
+    assert bytes_written == csv_path.stat().st_size
     # Verify can be loaded back
     loaded_df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
     assert len(loaded_df) == 3
@@ -183,3 +186,188 @@ def test_merge_sorted_output(merger):
     merged_df = merger.merge_data(existing_df, new_df)
     
     assert merged_df.index.is_monotonic_increasing
+
+
+@pytest.mark.unit
+def test_can_append_new_rows_after_existing(merger, sample_dataframe):
+    """Test append is allowed only for strictly later, same-shaped rows."""
+    later = sample_dataframe.copy()
+    later.index = later.index + pd.Timedelta(days=3)
+    
+    assert merger.can_append(sample_dataframe, later)
+    assert not merger.can_append(sample_dataframe, sample_dataframe)
+    assert not merger.can_append(None, later)
+    assert not merger.can_append(sample_dataframe, later[['Open', 'Close']])
+
+
+@pytest.mark.unit
+def test_append_data(merger, sample_dataframe, tmp_path):
+    """Test appending rows to an existing CSV file."""
+    csv_path = tmp_path / "test.csv"
+    merger.save_data(sample_dataframe, csv_path)
+    
+    later = sample_dataframe.copy()
+    later.index = later.index + pd.Timedelta(days=3)
+    merger.append_data(later, csv_path)
+    
+    loaded = merger.load_existing_data(csv_path)
+    assert len(loaded) == 6
+    assert loaded.index.is_monotonic_increasing
+
+
+@pytest.mark.unit
+def test_merge_and_save_appends_tail(merger, sample_dataframe, tmp_path):
+    """Test merge_and_save appends later rows instead of rewriting the file."""
+    csv_path = tmp_path / "test.csv"
+    merger.save_data(sample_dataframe.iloc[:2], csv_path)
+    
+    with patch.object(merger, 'save_data') as mock_save:
+        success, total_rows = merger.merge_and_save(csv_path, sample_dataframe.iloc[2:])
+    
+    assert success
+    assert total_rows == 3
+    mock_save.assert_not_called()
+    assert len(merger.load_existing_data(csv_path)) == 3
+
+
+@pytest.mark.unit
+def test_invalid_storage_format():
+    """Test unknown storage formats are rejected."""
+    with pytest.raises(MergeError):
+        DataMerger(backup_enabled=False, storage_format='xlsx')
+
+
+@pytest.mark.unit
+def test_parquet_round_trip(sample_dataframe, tmp_path):
+    """Test saving and loading a Parquet file preserves the data."""
+    pytest.importorskip("pyarrow")
+    merger = DataMerger(backup_enabled=False, storage_format='parquet')
+    parquet_path = tmp_path / f"1d{merger.file_extension}"
+    
+    merger.save_data(sample_dataframe, parquet_path)
+    loaded = merger.load_existing_data(parquet_path)
+    
+    assert not merger.supports_append
+    pd.testing.assert_frame_equal(loaded, sample_dataframe, check_freq=False)
+
+
+@pytest.mark.unit
+def test_merge_data_return_added(merger, sample_dataframe, tmp_path):
+    """Test rows_added counts only timestamps not already on disk."""
+    csv_path = tmp_path / "test.csv"
+    merger.save_data(sample_dataframe, csv_path)
+    existing_df = merger.load_existing_data(csv_path)
+    
+    # One overlapping day plus two new ones
+    new_df = sample_dataframe.copy()
+    new_df.index = new_df.index + pd.Timedelta(days=2)
+    
+    merged_df, added = merger.merge_data(existing_df, new_df, return_added=True)
+    
+    assert added == 2
+    assert added == len(merged_df) - len(existing_df)
+
+
+@pytest.mark.unit
+def test_load_edges(merger, sample_dataframe, tmp_path):
+    """Test only the first and last rows are read from a CSV file."""
+    csv_path = tmp_path / "test.csv"
+    merger.save_data(sample_dataframe, csv_path)
+    
+    edges = merger.load_edges(csv_path)
+    
+    assert len(edges) == 2
+    assert edges.index[0] == sample_dataframe.index[0]
+    assert edges.index[-1] == sample_dataframe.index[-1]
+    assert list(edges.columns) == list(sample_dataframe.columns)
+    assert merger.load_edges(tmp_path / "missing.csv") is None
+
+
+@pytest.mark.unit
+def test_csv_frame_matches_pandas_output():
+    """Test the pre-rendered index writes the same CSV text as pandas."""
+    import io
+    
+    index = pd.date_range(
+        '2024-03-09 09:00', periods=72, freq='h', tz='America/New_York', name='Datetime'
+    )
+    df = pd.DataFrame({'Close': range(len(index))}, index=index)
+    
+    expected, actual = io.StringIO(), io.StringIO()
+    df.to_csv(expected)
+    DataMerger._csv_frame(df).to_csv(actual)
+    
+    assert actual.getvalue() == expected.getvalue()
+
+
+@pytest.mark.unit
+def test_has_data(merger, sample_dataframe, tmp_path):
+    """Test has_data detects rows without loading the file."""
+    filepath = tmp_path / "test.csv"
+    assert not merger.has_data(filepath)
+    
+    sample_dataframe.iloc[:0].to_csv(filepath)
+    assert not merger.has_data(filepath)
+    
+    merger.save_data(sample_dataframe, filepath)
+    assert merger.has_data(filepath)
+
+
+@pytest.mark.unit
+def test_load_cached_without_pyarrow(merger, sample_dataframe, tmp_path, monkeypatch):
+    """Test load_cached falls back to a plain CSV load without pyarrow."""
+    monkeypatch.setattr('src.data_merger.HAS_PYARROW', False)
+    csv_path = tmp_path / "1d.csv"
+    merger.save_data(sample_dataframe, csv_path)
+    
+    loaded = merger.load_cached(csv_path)
+    
+    pd.testing.assert_frame_equal(loaded, merger.load_existing_data(csv_path))
+    assert not merger.cache_path(csv_path).exists()
+
+
+@pytest.mark.unit
+def test_load_cached_sidecar(merger, sample_dataframe, tmp_path):
+    """Test load_cached writes a Parquet sidecar and invalidates it on change."""
+    pytest.importorskip("pyarrow")
+    csv_path = tmp_path / "1d.csv"
+    merger.save_data(sample_dataframe, csv_path)
+    
+    first = merger.load_cached(csv_path)
+    sidecar = merger.cache_path(csv_path)
+    assert sidecar.exists()
+    pd.testing.assert_frame_equal(merger.load_cached(csv_path), first)
+    
+    # Rewriting the CSV makes the sidecar stale
+    merger.save_data(sample_dataframe.iloc[:3], csv_path)
+    assert len(merger.load_cached(csv_path)) == 3
+    
+    # So does restoring a CSV with an older mtime than the sidecar
+    merger.save_data(sample_dataframe.iloc[:2], csv_path)
+    old = sidecar.stat().st_mtime_ns - 10**9
+    os.utime(csv_path, ns=(old, old))
+    assert len(merger.load_cached(csv_path)) == 2
+
+
+@pytest.mark.unit
+def test_load_existing_data_fast(merger, sample_dataframe, tmp_path):
+    """Test the pyarrow CSV reader returns the same frame as pandas."""
+    pytest.importorskip("pyarrow")
+    csv_path = tmp_path / "1d.csv"
+    merger.save_data(sample_dataframe, csv_path)
+    
+    fast = merger.load_existing_data(csv_path, fast=True)
+    
+    pd.testing.assert_frame_equal(fast, merger.load_existing_data(csv_path))
+
+
+@pytest.mark.unit
+def test_load_existing_data_dtype(merger, sample_dataframe, tmp_path):
+    """Test loading OHLCV columns as float32."""
+    csv_path = tmp_path / "1d.csv"
+    merger.save_data(sample_dataframe, csv_path)
+    
+    loaded = merger.load_existing_data(csv_path, dtype=OHLCV_FLOAT32)
+    
+    assert (loaded.dtypes == 'float32').all()
+    assert loaded['Close'].tolist() == [104.0, 105.0, 106.0]
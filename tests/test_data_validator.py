@@ -262,3 +262,33 @@ def test_auto_fix_multiple_issues(validator):
     # Should be sorted and deduplicated
     assert validated_df.index.is_monotonic_increasing
     assert not validated_df.index.duplicated().any()
+
+
+@pytest.mark.unit
+def test_check_gaps_with_last_known_timestamp(validator, valid_dataframe):
+    """Test the gap between previous data and the new rows is detected."""
+    last_known = valid_dataframe.index[0] - timedelta(days=10)
+    
+    assert validator.check_gaps(valid_dataframe, '1d') == []
+    
+    gaps = validator.check_gaps(valid_dataframe, '1d', last_known_timestamp=last_known)
+    assert len(gaps) == 1
+    assert gaps[0]['index'] == 0
+
+
+@pytest.mark.unit
+def test_check_gaps_intraday_same_day_only(validator):
+    """Test intraday gaps are flagged within a day but not overnight."""
+    dates = pd.DatetimeIndex([
+        '2024-01-01 15:20:00',
+        '2024-01-01 15:25:00',
+        '2024-01-02 09:15:00',  # Overnight - expected
+        '2024-01-02 09:20:00',
+        '2024-01-02 09:45:00'   # Same-day gap
+    ], tz='Asia/Kolkata')
+    df = pd.DataFrame({'Close': [1.0] * 5}, index=dates)
+    
+    gaps = validator.check_gaps(df, '5m')
+    
+    assert [gap['index'] for gap in gaps] == [4]
+    assert validator._gap_rule('5m') is validator._gap_rule('5m')
@@ -195,3 +195,32 @@ def test_download_history_tracking(metadata_manager):
     
     assert 'download_history' in metadata
     assert len(metadata['download_history']) >= 1
+
+
+@pytest.mark.unit
+def test_load_all_caches_metadata(metadata_manager):
+    """Test load_all returns all records and serves later reads from memory."""
+    metadata_manager.update_metadata('TEST.NS', '1d', {'total_rows': 100})
+    
+    cache = metadata_manager.load_all()
+    assert ('TEST.NS', '1d') in cache
+    
+    # Removing the file must not affect cached lookups
+    metadata_manager._get_metadata_path('TEST.NS', '1d').unlink()
+    assert metadata_manager.load_metadata('TEST.NS', '1d')['total_rows'] == 100
+
+
+@pytest.mark.unit
+def test_batch_defers_writes_until_flush(metadata_manager):
+    """Test metadata writes inside a batch only hit disk on flush."""
+    metadata_manager.begin_batch()
+    metadata_manager.update_metadata('TEST.NS', '1d', {'total_rows': 100})
+    metadata_manager.update_metadata('TEST.NS', '5m', {'total_rows': 200})
+    
+    path = metadata_manager._get_metadata_path('TEST.NS', '1d')
+    assert not path.exists()
+    assert metadata_manager.load_metadata('TEST.NS', '1d')['total_rows'] == 100
+    
+    assert metadata_manager.flush() == 2
+    with open(path, 'r') as f:
+        assert json.load(f)['total_rows'] == 100
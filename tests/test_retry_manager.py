@@ -6,7 +6,7 @@ import pytest
 import json
 from pathlib import Path
 from datetime import datetime, timedelta
-from src.retry_manager import RetryManager, RetryError
+from src.retry_manager import CircuitBreaker, CircuitOpenError, RetryManager, RetryError
 
 
 @pytest.fixture
@@ -231,3 +231,145 @@ def test_retry_with_alert_callback(retry_manager):
     
     # Alert should have been called
     assert alert_called['value'] is True
+
+
+@pytest.mark.unit
+def test_retry_with_jitter_bounds_delay(retry_manager, mocker):
+    """Test jittered delays never exceed the exponential backoff delay."""
+    sleep = mocker.patch('src.retry_manager.time.sleep')
+    
+    def always_fails():
+        raise Exception("Fail")
+    
+    with pytest.raises(RetryError):
+        retry_manager.retry_with_backoff(
+            always_fails,
+            max_retries=4,
+            initial_delay=1.0,
+            backoff_factor=2.0,
+            jitter=True
+        )
+    
+    delays = [call.args[0] for call in sleep.call_args_list]
+    assert len(delays) == 3
+    for delay, ceiling in zip(delays, [1.0, 2.0, 4.0]):
+        assert 0 <= delay <= ceiling
+
+
+@pytest.mark.unit
+def test_retry_circuit_breaker_fails_fast(retry_manager, mocker):
+    """Test an open circuit breaker rejects calls until a success closes it."""
+    mocker.patch('src.retry_manager.time.sleep')
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60.0)
+    calls = {'count': 0}
+    
+    def always_fails():
+        calls['count'] += 1
+        raise Exception("Fail")
+    
+    with pytest.raises(CircuitOpenError):
+        retry_manager.retry_with_backoff(
+            always_fails, max_retries=5, initial_delay=0.1, circuit_breaker=breaker
+        )
+    assert calls['count'] == 2
+    
+    with pytest.raises(CircuitOpenError):
+        retry_manager.retry_with_backoff(lambda: "ok", circuit_breaker=breaker)
+    
+    breaker.record_success()
+    assert retry_manager.retry_with_backoff(lambda: "ok", circuit_breaker=breaker) == "ok"
+
+
+@pytest.mark.unit
+def test_retry_gives_up_on_permanent_errors(retry_manager, mocker):
+    """Test give_up_on errors are raised at once and not counted by the breaker."""
+    sleep = mocker.patch('src.retry_manager.time.sleep')
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=60.0)
+    calls = {'count': 0}
+    
+    def unknown_symbol():
+        calls['count'] += 1
+        raise KeyError("BAD.NS")
+    
+    with pytest.raises(KeyError):
+        retry_manager.retry_with_backoff(
+            unknown_symbol, max_retries=3, circuit_breaker=breaker, give_up_on=(KeyError,)
+        )
+    
+    assert calls['count'] == 1
+    sleep.assert_not_called()
+    assert not breaker.is_open
+
+
+@pytest.mark.unit
+def test_circuit_breaker_half_open_single_trial(mocker):
+    """Test only one caller is let through once the cooldown has passed."""
+    clock = mocker.patch('src.retry_manager.time.monotonic', return_value=100.0)
+    breaker = CircuitBreaker(failure_threshold=2, cooldown=60.0)
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.allow() == pytest.approx(60.0)
+    
+    clock.return_value = 160.0
+    assert breaker.allow() == 0
+    assert breaker.allow() > 0
+    
+    # A failed trial re-opens the breaker for a full cooldown
+    breaker.record_failure()
+    assert breaker.allow() == pytest.approx(60.0)
+    
+    clock.return_value = 220.0
+    assert breaker.allow() == 0
+    breaker.record_success()
+    assert breaker.allow() == 0
+    assert breaker.allow() == 0
+
+
+@pytest.mark.unit
+def test_retry_waits_out_open_breaker(retry_manager, mocker):
+    """Test wait_if_open sleeps through the cooldown instead of failing."""
+    clock = mocker.patch('src.retry_manager.time.monotonic', return_value=100.0)
+    sleep = mocker.patch(
+        'src.retry_manager.time.sleep',
+        side_effect=lambda seconds: setattr(clock, 'return_value', clock.return_value + seconds)
+    )
+    breaker = CircuitBreaker(failure_threshold=1, cooldown=30.0)
+    breaker.record_failure()
+    
+    result = retry_manager.retry_with_backoff(
+        lambda: "ok", circuit_breaker=breaker, wait_if_open=True
+    )
+    
+    assert result == "ok"
+    assert sleep.call_args_list[0].args[0] == pytest.approx(30.0)
+    assert not breaker.is_open
+
+
+@pytest.mark.unit
+def test_batch_defers_failure_log_writes(retry_manager):
+    """Test failures logged in a batch are only written on flush."""
+    retry_manager.begin_batch()
+    retry_manager.log_failure('RELIANCE.NS', '1d', 'Timeout')
+    retry_manager.log_failure('TCS.NS', '1d', 'Timeout')
+    
+    assert not retry_manager.failure_log_path.exists()
+    assert len(retry_manager.failures) == 2
+    
+    retry_manager.flush()
+    with open(retry_manager.failure_log_path, 'r') as f:
+        assert len(json.load(f)) == 2
+
+
+@pytest.mark.unit
+def test_log_failure_batch(retry_manager, mocker):
+    """Test a batch of failures is recorded with a single log write."""
+    save = mocker.spy(retry_manager, '_save_failures')
+    
+    retry_manager.log_failure_batch([
+        ('RELIANCE.NS', '1d', 'Timeout'),
+        ('RELIANCE.NS', '5m', 'No data returned', {'attempts': 3}),
+    ])
+    
+    assert save.call_count == 1
+    assert [f['interval'] for f in retry_manager.failures] == ['1d', '5m']
+    assert retry_manager.failures[1]['metadata'] == {'attempts': 3}
@@ -198,3 +198,259 @@ def test_fix_gaps_respects_holidays():
     """Test fix_gaps.py doesn't fix gaps on holidays."""
     # Should skip NSE holidays and weekends
     pass
+
+
+@pytest.mark.unit
+def test_daily_update_process_workers_log_to_parent_queue():
+    """Test --processes workers send their log records to the parent's queue."""
+    import logging
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from scripts.daily_update import _init_process_worker
+    
+    log_queue = multiprocessing.Queue(-1)
+    with ProcessPoolExecutor(
+        max_workers=1,
+        initializer=_init_process_worker,
+        initargs=('Asia/Kolkata', 'csv', log_queue)
+    ) as pool:
+        pool.submit(logging.warning, 'from worker').result()
+    
+    messages = []
+    while 'from worker' not in messages:
+        messages.append(log_queue.get(timeout=10).getMessage())
+
+
+@pytest.mark.unit
+def test_fix_gaps_process_workers_log_to_parent_queue():
+    """Test gap-analysis workers send their log records to the parent's queue."""
+    import logging
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    from scripts.fix_gaps import _init_process_worker
+    
+    log_queue = multiprocessing.Queue(-1)
+    with ProcessPoolExecutor(
+        max_workers=1,
+        initializer=_init_process_worker,
+        initargs=('Asia/Kolkata', 'csv', pd.DatetimeIndex([]), log_queue)
+    ) as pool:
+        pool.submit(logging.warning, 'from worker').result()
+    
+    messages = []
+    while 'from worker' not in messages:
+        messages.append(log_queue.get(timeout=10).getMessage())
+
+
+@pytest.mark.unit
+def test_validate_all_result_cache_drops_deleted_files(tmp_path):
+    """Test cached validation results of deleted files are not loaded."""
+    import json
+    from scripts.validate_all import load_result_cache
+    
+    kept = tmp_path / "1d.csv"
+    kept.write_text("Datetime,Open\n")
+    cache_path = tmp_path / ".validation_cache.json"
+    cache_path.write_text(json.dumps({
+        str(kept): {'key': [14, 1, 0], 'result': {'valid': True}},
+        str(tmp_path / "5m.csv"): {'key': [14, 1, 0], 'result': {'valid': True}}
+    }))
+    
+    assert list(load_result_cache(cache_path)) == [str(kept)]
+    assert load_result_cache(tmp_path / "missing.json") == {}
+
+
+@pytest.mark.unit
+def test_convert_storage_finds_data_files(tmp_path):
+    """Test convert_storage.py lists data files but not hidden sidecars."""
+    from scripts.convert_storage import find_data_files
+    
+    symbol_dir = tmp_path / "stocks" / "RELIANCE.NS"
+    symbol_dir.mkdir(parents=True)
+    for name in ("1d.csv", "5m.csv", ".1d.csv.parquet", "1d.csv.bak"):
+        (symbol_dir / name).write_text("Datetime,Open\n")
+    
+    assert find_data_files(str(tmp_path), '.csv') == [
+        str(symbol_dir / "1d.csv"), str(symbol_dir / "5m.csv")
+    ]
+
+
+@pytest.mark.unit
+def test_convert_storage_round_trip(tmp_path):
+    """Test converting a CSV file to Parquet keeps every row."""
+    pytest.importorskip("pyarrow")
+    from scripts.convert_storage import convert_file
+    from data_merger import DataMerger
+    
+    csv_path = tmp_path / "1d.csv"
+    df = pd.DataFrame(
+        {'Open': [1.0, 2.0], 'High': [1.5, 2.5], 'Low': [0.5, 1.5],
+         'Close': [1.2, 2.2], 'Volume': [10, 20]},
+        index=pd.date_range('2024-01-01', periods=2, tz='Asia/Kolkata', name='Datetime')
+    )
+    csv_merger = DataMerger(backup_enabled=False)
+    csv_merger.save_data(df, csv_path)
+    
+    target, rows = convert_file(
+        csv_merger, DataMerger(backup_enabled=False, storage_format='parquet'),
+        str(csv_path), keep_source=False
+    )
+    
+    assert rows == 2
+    assert not csv_path.exists()
+    assert target.endswith('1d.parquet')
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('interval, freq', [('1d', '1D'), ('1wk', '7D'), ('5m', '5min')])
+def test_fix_gaps_find_gaps_matches_validator(tmp_path, interval, freq):
+    """Test fix_gaps reports the same gaps as DataValidator.check_gaps."""
+    from scripts.fix_gaps import find_gaps
+    from data_merger import DataMerger
+    from data_validator import DataValidator
+    
+    index = pd.date_range('2024-01-01 09:15', periods=200, freq=freq, tz='Asia/Kolkata')
+    index = index.delete([20, 21, 22, 23, 24, 90, 150, 151])
+    df = pd.DataFrame({'Close': 1.0}, index=index)
+    csv_path = tmp_path / f"{interval}.csv"
+    merger = DataMerger(backup_enabled=False)
+    merger.save_data(df, csv_path)
+    validator = DataValidator()
+    
+    expected = validator.check_gaps(merger.load_existing_data(csv_path), interval)
+    gaps = find_gaps(
+        merger, validator, pd.DatetimeIndex([]), 'RELIANCE.NS', interval, 'stocks', csv_path
+    )
+    
+    assert expected
+    assert [(g['message'], g['details'], g['index']) for g in gaps] == [
+        (g['message'], g['details'], g['index']) for g in expected
+    ]
+    assert [(g['gap_start'], g['gap_end']) for g in gaps] == [
+        (index[g['index'] - 1], index[g['index']]) for g in expected
+    ]
+
+
+@pytest.mark.unit
+def test_fix_gaps_coalesce_gaps():
+    """Test nearby gap spans are filled with one download."""
+    from scripts.fix_gaps import GapFixer
+    
+    ts = pd.Timestamp
+    spans = [
+        (ts('2024-03-01'), ts('2024-03-04')),
+        (ts('2024-01-01'), ts('2024-01-05')),
+        (ts('2024-01-08'), ts('2024-01-09')),  # Within a week of the first
+        (ts('2024-01-02'), ts('2024-01-03')),  # Inside the first
+    ]
+    
+    assert GapFixer._coalesce_gaps(spans) == [
+        (ts('2024-01-01'), ts('2024-01-09'), 3),
+        (ts('2024-03-01'), ts('2024-03-04'), 1),
+    ]
+
+
+@pytest.mark.unit
+@pytest.mark.parametrize('use_kernel', [True, False])
+def test_fix_gaps_classify_gap_dates(use_kernel):
+    """Test weekend/holiday classification matches _is_valid_gap on both paths."""
+    from scripts import fix_gaps
+    
+    holidays = ['2024-01-26', '2024-03-25']
+    holiday_index = pd.DatetimeIndex(holidays).normalize()
+    gap_dates = pd.DatetimeIndex(
+        ['2024-01-26 09:15', '2024-01-27 09:15', '2024-01-28 00:00',
+         '2024-01-29 15:29', '2024-03-25 09:15', '2024-03-26 09:15'],
+        tz='Asia/Kolkata'
+    )
+    
+    with patch.object(fix_gaps, 'HAS_NUMBA', use_kernel):
+        is_valid, reasons = fix_gaps.classify_gap_dates(gap_dates, holiday_index)
+    
+    assert reasons.tolist() == [
+        'market_holiday', 'weekend', 'weekend', 'trading_day', 'market_holiday', 'trading_day'
+    ]
+    holiday_set = set(pd.to_datetime(holidays).date)
+    assert [(bool(v), r) for v, r in zip(is_valid, reasons)] == [
+        fix_gaps._is_valid_gap(date, holiday_set) for date in gap_dates.tz_localize(None)
+    ]
+
+
+@pytest.mark.unit
+def test_fix_gaps_is_fetchable():
+    """Test intraday gaps beyond Yahoo's history limit are not fetched."""
+    from scripts.fix_gaps import is_fetchable
+    
+    now = pd.Timestamp.now(tz='Asia/Kolkata')
+    
+    assert is_fetchable('1m', now - pd.Timedelta(days=2))
+    assert not is_fetchable('1m', now - pd.Timedelta(days=30))
+    assert not is_fetchable('5m', (now - pd.Timedelta(days=90)).strftime('%Y-%m-%d'))
+    assert is_fetchable('1d', '2000-01-03')
+
+
+@pytest.mark.unit
+def test_daily_update_merge_writes_float32_prices(tmp_path):
+    """Test merged and appended rows are saved without float64 noise."""
+    import numpy as np
+    from scripts.daily_update import merge_validate_save
+    from data_merger import DataMerger, PRICE_DTYPES
+    from data_validator import DataValidator
+    
+    # Single precision quotes as Yahoo serves them, widened to float64
+    prices = np.float32([2456.35, 2457.1, 2458.2, 2459.3, 2460.45]).astype('float64')
+    df = pd.DataFrame(
+        {'Open': prices, 'High': prices + 1, 'Low': prices - 1, 'Close': prices, 'Volume': 1000},
+        index=pd.date_range('2024-01-01', periods=5, tz='Asia/Kolkata')
+    )
+    csv_path = tmp_path / "1d.csv"
+    merger = DataMerger(backup_enabled=False)
+    merger.save_data(df.iloc[:2].astype(PRICE_DTYPES), csv_path)
+    
+    # Overlapping rows take the full merge path, later ones are appended
+    merge_validate_save(merger, DataValidator(), 'RELIANCE.NS', '1d', df.iloc[1:4], str(csv_path))
+    merge_validate_save(
+        merger, DataValidator(), 'RELIANCE.NS', '1d', df.iloc[4:], str(csv_path), existing_rows=4
+    )
+    
+    closes = [line.split(',')[4] for line in csv_path.read_text().splitlines()[1:]]
+    assert closes == ['2456.35', '2457.1', '2458.2', '2459.3', '2460.45']
+
+
+@pytest.mark.unit
+def test_fix_gaps_fill_gap_writes_float32_prices(tmp_path):
+    """Test gap-filled rows are saved without float64 noise."""
+    import logging
+    import numpy as np
+    from scripts.fix_gaps import GapFixer
+    from data_merger import DataMerger, PRICE_DTYPES
+    from data_validator import DataValidator
+    
+    # Single precision quotes as Yahoo serves them, widened to float64
+    prices = np.float32([2456.35, 2457.1, 2458.2, 2459.3, 2460.45]).astype('float64')
+    df = pd.DataFrame(
+        {'Open': prices, 'High': prices + 1, 'Low': prices - 1, 'Close': prices, 'Volume': 1000},
+        index=pd.date_range('2024-01-01', periods=5, tz='Asia/Kolkata')
+    )
+    
+    fixer = GapFixer.__new__(GapFixer)
+    fixer.logger = logging.getLogger(__name__)
+    fixer.merger = DataMerger(backup_enabled=False)
+    fixer.validator = DataValidator()
+    fixer.data_fetcher = MagicMock()
+    fixer.data_fetcher.fetch_data.return_value = df.iloc[1:4]
+    fixer.metadata_manager = MagicMock()
+    fixer.retry_manager = MagicMock()
+    fixer.data_dir = tmp_path
+    fixer._path_cache = {}
+    
+    csv_path = fixer._csv_path('RELIANCE.NS', '1d', 'stocks')
+    csv_path.parent.mkdir(parents=True)
+    fixer.merger.save_data(df.iloc[[0, 1, 3, 4]].astype(PRICE_DTYPES), csv_path)
+    # Read once so the history comes from the Parquet sidecar when pyarrow is installed
+    fixer.merger.load_cached(csv_path)
+    
+    assert fixer.fill_gap('RELIANCE.NS', '1d', 'stocks', '2024-01-02', '2024-01-05')
+    
+    closes = [line.split(',')[4] for line in csv_path.read_text().splitlines()[1:]]
+    assert closes == ['2456.35', '2457.1', '2458.2', '2459.3', '2460.45']